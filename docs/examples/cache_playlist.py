@@ -49,30 +49,18 @@ def cache_playlist(ampache_url, ampache_api, ampache_user, api_format, smartlist
     def advanced_search(ampache_url, ampache_api, rules, operator = 'and',
                         type = 'song', offset = 0, limit = 0, random = 0):
     """
-    list_songs = list()
     search_rules = [['smartplaylist', 0, smartlist]]
-    search_song = ampacheConnection.advanced_search(search_rules, 'or', 'song', 0, limit, 1)
+    # random results can't be paged (each page is a new sample) so get one page of random songs
+    search_song = ampacheConnection.get_page(ampacheConnection.advanced_search(search_rules, 'or', 'song', 0, limit, 1),
+                                             'song')
 
-    if api_format == 'xml':
-        for child in search_song:
-            if child.tag == 'song':
-                list_songs.append([child.attrib['id'], os.path.basename(child.find('filename').text)])
-    else:
-         for child in search_song['song']:
-            print('list')
-            print(child)
-            list_songs.append([child['id'], os.path.basename(child['filename'])])
-
-    print(list_songs)
-    
-    """ download
-    def download(ampache_url, ampache_api, object_id, object_type, destination, file_format='raw'):
+    """ BulkDownloader
+    def download_songs(songs, destination, transcode='raw', bitrate=False):
     """
-    for object_id in list_songs:
-        if not os.path.isfile(os.path.join(destination, object_id[1])):
-            ampacheConnection.download(object_id[0], 'song', os.path.join(destination, object_id[1]), transcode)
-        else:
-            print('File exists')
+    downloader = ampache.BulkDownloader(ampacheConnection, workers=8, per_host=4)
+    summary = downloader.download_songs(search_song, destination, transcode)
+    print(str(summary['downloaded']) + ' downloaded, ' + str(summary['skipped']) + ' existing, ' +
+          str(len(summary['failed'])) + ' failed (' + str(int(summary['bytes_per_second'] / 1024)) + ' KiB/s)')
 
     """ goodbye
     def goodbye(ampache_url, ampache_api):
@@ -1123,6 +1123,13 @@ if not ampache_connection.get_config():
     ampache_connection.set_key('mysuperapikey')
     ampache_connection.set_user('myusername')
 
+# keep the slow external lookups (get_external_metadata) for a day, albums and songs are always fetched again
+# so new albums and tag changes are found on every run.
+# update_from_tags doesn't change external metadata so it doesn't need to empty the cache
+ampache_connection.set_cache(ampache.SQLiteCache(os.path.join(ampache_connection.CONFIG_PATH, 'ampache_cache.sqlite'),
+                                                 ttl=0, ttls={'get_external_metadata': 86400},
+                                                 clear_on_write=False))
+
 """ Get a session key using the handshake
 
     * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
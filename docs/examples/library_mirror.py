@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import ampache
+
+# user variables
+url = 'https://develop.ampache.dev'
+api = 'demodemo'
+user = 'demo'
+my_database = os.path.join(os.path.expanduser('~'), '.ampache', 'ampache_library.sqlite')
+my_full = '--full' in sys.argv
+
+
+def refresh_library(ampache_url, ampache_api, ampache_user, api_format, database, full):
+    ampacheConnection = ampache.API()
+    ampacheConnection.set_format(api_format)
+    """ encrypt_string
+    def encrypt_string(ampache_api, user):
+    """
+    encrypted_key = ampacheConnection.encrypt_string(ampache_api, ampache_user)
+
+    """ handshake
+    def handshake(ampache_url, ampache_api, user = False, timestamp = False, version = '6.0.0'):
+    # processed details
+    """
+    ampache_session = ampacheConnection.handshake(ampache_url, encrypted_key, '', 0, '6.0.0')
+    if not ampache_session:
+        print()
+        sys.exit('ERROR: Failed to connect to ' + ampache_url)
+
+    """ LibrarySync
+    def sync(full=False):
+    The first run downloads everything, later runs only download the changes
+    """
+    store = ampache.SQLiteStore(database)
+    library = ampache.LibrarySync(ampacheConnection, store, ('song', 'album', 'artist', 'genre', 'playlist'))
+    summary = library.sync(full)
+    if summary['failed']:
+        print('ERROR: Failed to sync ' + ', '.join(summary['failed']))
+    for object_type in summary['changed']:
+        print(object_type + ': ' + str(summary['changed'][object_type]) + ' changed, ' +
+              str(summary['deleted'][object_type]) + ' deleted, ' + str(store.count(object_type)) + ' total')
+    print('sync took ' + str(round(summary['seconds'], 2)) + ' seconds')
+
+    """ find
+    def find(object_type, rules=None, operator='and', sort='', limit=0):
+    Query the local copy without sending a request
+    """
+    for song in store.find('song', [['year', '>', 1999], ['genre', '=', 'Rock']], sort='year', limit=10):
+        print(song.id, song.artist_name, '-', song.title, '(' + str(song.year) + ')')
+    store.close()
+
+    """ goodbye
+    def goodbye(ampache_url, ampache_api):
+    Close your session when you're done
+    """
+    ampacheConnection.goodbye()
+
+
+refresh_library(url, api, user, 'json', my_database, my_full)
@@ -21,2377 +21,5593 @@ Ampache XML and JSON Api library for python3
  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import array
+import asyncio
+import codecs
+import collections
+import concurrent.futures
+import contextlib
+import datetime
 import hashlib
+import inspect
 import json
 import os
+import random
+import re
 import requests
+import sqlite3
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
 from xml.etree import ElementTree
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 CLIENT_NAME = 'python3-ampache'
 
+# object name in the response for functions that take offset and limit
+PAGE_TAGS = {
+    'album_songs': 'song',
+    'albums': 'album',
+    'artist_albums': 'album',
+    'artist_songs': 'song',
+    'artists': 'artist',
+    'browse': 'browse',
+    'catalogs': 'catalog',
+    'deleted_podcast_episodes': 'deleted_podcast_episode',
+    'deleted_songs': 'deleted_song',
+    'deleted_videos': 'deleted_video',
+    'genre_albums': 'album',
+    'genre_artists': 'artist',
+    'genre_songs': 'song',
+    'genres': 'genre',
+    'labels': 'label',
+    'licenses': 'license',
+    'list': 'list',
+    'live_streams': 'live_stream',
+    'playlist_songs': 'song',
+    'playlists': 'playlist',
+    'podcast_episodes': 'podcast_episode',
+    'podcasts': 'podcast',
+    'search_songs': 'song',
+    'shares': 'share',
+    'smartlist_songs': 'song',
+    'smartlists': 'playlist',
+    'songs': 'song',
+    'tag_albums': 'album',
+    'tag_artists': 'artist',
+    'tag_songs': 'song',
+    'tags': 'tag',
+    'user_playlists': 'playlist',
+    'user_smartlists': 'playlist',
+    'videos': 'video',
+}
+# functions where the object name is the object_type parameter
+PAGE_TYPED = ('advanced_search', 'get_indexes', 'get_similar', 'index', 'search', 'stats')
+# default columns for API.export_columns
+EXPORT_COLUMNS = ('time', 'bitrate', 'rate', 'playcount', 'year', 'size')
+# functions that change data on the server (never cached and they empty the response cache)
+CACHE_WRITE_ACTIONS = ('catalog_action', 'catalog_file', 'catalog_folder', 'democratic', 'flag', 'localplay',
+                       'lost_password', 'player', 'rate', 'record_play', 'register', 'scrobble', 'system_update',
+                       'toggle_follow', 'update_art', 'update_artist_info', 'update_from_tags', 'update_podcast',
+                       'user_update')
+CACHE_WRITE_SUFFIXES = ('_add', '_add_song', '_create', '_delete', '_edit', '_remove_song')
+# functions with live or random results that are never cached
+CACHE_SKIP_ACTIONS = ('goodbye', 'handshake', 'localplay_songs', 'now_playing', 'ping', 'playlist_generate',
+                      'playlist_hash')
+# execute() defaults that differ from the function signature (inspect.Parameter.empty is required)
+EXECUTE_DEFAULTS = {'advanced_search': {'rules': ()},
+                    'bookmark_delete': {'object_type': inspect.Parameter.empty},
+                    'bookmarks': {'client': inspect.Parameter.empty, 'include': inspect.Parameter.empty},
+                    'search': {'rules': ()},
+                    'search_group': {'rules': ()}}
+# execute() parameter names kept for older scripts
+EXECUTE_ALIASES = {'podcasts': {'filter_id': 'filter_str'},
+                   'search_group': {'filter_id': 'rules'}}
+# functions that don't use the session auth (see API.check_session)
+SESSION_SKIP_ACTIONS = ('goodbye', 'handshake', 'lost_password', 'ping', 'register')
+# API functions for execute() (see API.get_actions)
+ACTIONS = dict()
+# characters that urlencode would change
+QUERY_UNSAFE = re.compile('[^A-Za-z0-9_.~-]')
+
+# longest wait in seconds between two retries of a request (see get_retry_delay)
+RETRY_MAX_DELAY = 30
+# functions that send a file instead of xml or json (see RateLimiter)
+BINARY_ACTIONS = ('download', 'get_art', 'stream')
+# RateLimiter classes of functions
+LIMIT_CLASSES = ('read', 'write', 'binary')
+
+
+def encode_query(data):
+    """ encode_query
+
+        Return the same query string as urllib.parse.urlencode
+        only keys and values with reserved characters are quoted
 
-class API(object):
+        INPUTS
+        * data = (dict|list) url parameters or (key, value) pairs
+    """
+    query = list()
+    for key, value in (data.items() if isinstance(data, dict) else data):
+        if isinstance(value, bytes):
+            value = urllib.parse.quote_plus(value)
+        else:
+            value = str(value)
+            if QUERY_UNSAFE.search(value):
+                value = urllib.parse.quote_plus(value)
+        key = str(key)
+        if QUERY_UNSAFE.search(key):
+            key = urllib.parse.quote_plus(key)
+        query.append(key + '=' + value)
+    return '&'.join(query)
 
-    def __init__(self):
-        self.AMPACHE_API = 'xml'
-        self.AMPACHE_VERSION = '6.9.0'
-        self.AMPACHE_SERVER = ''
-        self.AMPACHE_DEBUG = False
-        self.DOCS_PATH = 'docs/'
-        self.CONFIG_FILE = 'ampache.json'
-        self.CONFIG_PATH = ''
-        self.AMPACHE_URL = ''
-        self.AMPACHE_SESSION = ''
-        self.AMPACHE_USER = ''
-        self.AMPACHE_KEY = ''
-        self.AMPACHE_BEARER_TOKEN = ''
-        # Test colors for printing
-        self.OKGREEN = '\033[92m'
-        self.WARNING = '\033[93m'
-        self.FAIL = '\033[91m'
-        self.ENDC = '\033[0m'
 
+class AmpacheError(Exception):
+    """ AmpacheError
+
+        Base class of the errors kept by API.get_last_error()
+
+        INPUTS
+        * message = (string) description of the error
+        * action  = (string) API function name //optional
     """
-    ----------------
-    HELPER FUNCTIONS
-    ----------------
+
+    def __init__(self, message: str, action: str = ''):
+        super().__init__(message)
+        self.message = message
+        self.action = action
+
+
+class TransportError(AmpacheError):
+    """ TransportError
+
+        The server could not be reached or answered with an HTTP error
+
+        INPUTS
+        * message = (string) description of the error
+        * action  = (string) API function name //optional
+        * status  = (integer) HTTP status code, None when there was no response //optional
     """
 
-    def set_format(self, myformat: str):
-        """ set_format
+    def __init__(self, message: str, action: str = '', status=None):
+        super().__init__(message, action)
+        self.status = status
 
-            Allow forcing a default API output format
+
+class RequestTimeout(TransportError):
+    """ RequestTimeout
+
+        The server didn't connect or send data within the transport timeout
+    """
+
+
+class CircuitOpenError(TransportError):
+    """ CircuitOpenError
+
+        The request wasn't sent because the CircuitBreaker is open after repeated failures
+    """
+
+
+class ResponseError(AmpacheError):
+    """ ResponseError
+
+        The server answered but the response couldn't be parsed as xml or json
+    """
+
+
+class ApiError(AmpacheError):
+    """ ApiError
+
+        The server answered with an Ampache error response
+
+        INPUTS
+        * message = (string) errorMessage from the response
+        * action  = (string) API function name //optional
+        * code    = (string) errorCode from the response //optional
+    """
+
+    def __init__(self, message: str, action: str = '', code: str = '0'):
+        super().__init__(message, action)
+        self.code = code
+
+
+class Transport(object):
+    """ Transport
+
+        Pooled HTTP transport used for every API request.
+        A requests.Session keeps keep-alive connections open per host so calls reuse the same socket.
+
+        Any object with a matching get() method can be used in its place with API.set_transport()
+
+        INPUTS
+        * pool_size  = (integer) maximum connections kept open for each host //optional
+        * pool_hosts = (integer) number of host pools to keep //optional
+        * timeout    = (float|tuple) seconds or (connect, read) seconds, None waits forever //optional
+        * retries    = (integer) retry connections that failed before the request was sent //optional
+        * backoff    = (float) backoff factor between retries in seconds //optional
+    """
+
+    def __init__(self, pool_size: int = 10, pool_hosts: int = 10, timeout=(10, 120),
+                 retries: int = 0, backoff: float = 0):
+        self.pool_size = pool_size
+        self.pool_hosts = pool_hosts
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_hosts,
+                              pool_maxsize=pool_size,
+                              # functions that change data are sent with GET too so a request that
+                              # reached the server is never sent again here (see API.set_retries)
+                              max_retries=Retry(total=retries,
+                                                connect=retries,
+                                                read=0,
+                                                status=0,
+                                                other=0,
+                                                backoff_factor=backoff,
+                                                raise_on_status=False))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def get(self, url: str, headers: dict = None, stream: bool = False):
+        """ get
+
+            Send a GET request using a pooled connection and return the requests.Response
+            Raises requests.exceptions.RequestException on connection and HTTP errors
+
+            INPUTS
+            * url     = (string) url to fetch
+            * headers = (dict) optional HTTP headers
+            * stream  = (boolean) don't read the body until it is requested //optional
+        """
+        response = self.session.get(url, headers=headers, timeout=self.timeout,
+                                    stream=stream, allow_redirects=True)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            response.close()
+            raise
+        return response
+
+    def save(self, url: str, headers: dict, destination: str, chunk_size: int = 65536,
+             resume: bool = False, progress=None):
+        """ save
+
+            Send a GET request and write the response body to a file in chunks.
+            With resume an existing file is continued from its current size using an HTTP Range request.
+            Returns False when the file size doesn't match the size reported by the server
 
             INPUTS
-            * myformat = (string) 'xml'|'json'
+            * url         = (string) url to fetch
+            * headers     = (dict) optional HTTP headers
+            * destination = (string) full file path
+            * chunk_size  = (integer) bytes read per chunk //optional
+            * resume      = (boolean) continue a partial file //optional
+            * progress    = (function) called with (bytes_written, total_bytes) after each chunk //optional
+        """
+        offset = os.path.getsize(destination) if resume and os.path.isfile(destination) else 0
+        range_headers = dict(headers or {})
+        if offset:
+            range_headers['Range'] = 'bytes=' + str(offset) + '-'
+        try:
+            response = self.get(url, range_headers, True)
+        except requests.exceptions.HTTPError as error:
+            if offset and error.response is not None and error.response.status_code == 416:
+                # the partial file is unusable so start again
+                return self.save(url, headers, destination, chunk_size, False, progress)
+            raise
+        with response:
+            if not response.status_code == 206:
+                offset = 0
+            total = self.get_total_size(response.headers, offset)
+            written = offset
+            with open(destination, 'ab' if offset else 'wb') as file:
+                for chunk in response.iter_content(chunk_size):
+                    file.write(chunk)
+                    written = written + len(chunk)
+                    if progress:
+                        progress(written, total)
+        return total is None or os.path.getsize(destination) == total
+
+    @staticmethod
+    def get_total_size(headers, offset: int = 0):
+        """ get_total_size
+
+            Return the full size of a response body from its headers or None when it isn't known
+
+            INPUTS
+            * headers = (dict) HTTP response headers
+            * offset  = (integer) start of a 206 Partial Content response //optional
         """
-        if myformat == 'xml' or myformat == 'json':
-            if self.AMPACHE_DEBUG:
-                print('AMPACHE_API set to ' + myformat)
-            self.AMPACHE_API = myformat
+        if headers.get('Content-Encoding', 'identity') != 'identity':
+            return None
+        if offset:
+            content_range = headers.get('Content-Range', '')
+            if '/' not in content_range or content_range.endswith('/*'):
+                return None
+            return int(content_range.split('/')[-1])
+        if headers.get('Content-Length'):
+            return int(headers['Content-Length'])
+        return None
 
-    def set_debug(self, mybool: bool):
-        """ set_debug
+    def set_timeout(self, timeout):
+        """ set_timeout
 
-            This function can be used to enable/disable debugging messages
+            Change the timeout of the next requests
 
             INPUTS
-            * bool = (boolean) Enable/disable debug messages
+            * timeout = (float|tuple) seconds or (connect, read) seconds, None waits forever
         """
-        if self.AMPACHE_DEBUG:
-            if mybool:
-                print('AMPACHE_DEBUG' + f": {self.OKGREEN}enabled{self.ENDC}")
-            else:
-                print('AMPACHE_DEBUG' + f": {self.WARNING}disabled{self.ENDC}")
-        self.AMPACHE_DEBUG = mybool
+        self.timeout = timeout
 
-    def set_debug_path(self, path_string: str):
-        """ set_debug_path
+    def close(self):
+        """ close
 
-        This function can be used to set the output folder for docs
+            Close all pooled connections
+        """
+        self.session.close()
+
+
+class AsyncTransport(object):
+    """ AsyncTransport
+
+        Pooled asyncio HTTP transport used by AsyncAPI.
+        Uses a shared aiohttp.ClientSession when aiohttp is installed,
+        otherwise requests run on the event loop's thread pool with a pooled Transport.
 
         INPUTS
-        * path_string = (string) folder path
-        """
-        self.DOCS_PATH = path_string
+        * pool_size = (integer) maximum connections kept open for each host //optional
+        * timeout   = (float|tuple) seconds or (connect, read) seconds, None waits forever //optional
+    """
 
-    def set_version(self, myversion: str):
-        """ set_version
+    def __init__(self, pool_size: int = 100, timeout=(10, 120)):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = None
+        self.session_loop = None
+        self.transport = None
+        if aiohttp:
+            self.errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        else:
+            self.transport = Transport(pool_size=pool_size, timeout=timeout)
+            self.errors = (requests.exceptions.RequestException,)
 
-            Allow forcing a default API version
+    def get_session(self):
+        """ get_session
 
-            api3 = '390001'
-            api4 = '443000'
-            api5 = '5.5.6'
-            api6 = '6.6.0'
+            Return the aiohttp.ClientSession, creating it inside the running event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            self.session_loop = loop
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0,
+                                                                                limit_per_host=self.pool_size),
+                                                 raise_for_status=True)
+        return self.session
 
-            INPUTS
-            * myversion = (string) '6.6.0'|'390001'
+    def get_timeout(self):
+        """ get_timeout
+
+            Return self.timeout as an aiohttp.ClientTimeout so a changed timeout applies to the next request
         """
-        if self.AMPACHE_DEBUG:
-            print('AMPACHE_VERSION set to ' + myversion)
-        self.AMPACHE_VERSION = myversion
+        if isinstance(self.timeout, tuple):
+            return aiohttp.ClientTimeout(sock_connect=self.timeout[0], sock_read=self.timeout[1])
+        return aiohttp.ClientTimeout(total=self.timeout)
 
-    def set_user(self, myuser: str):
-        """ set_user
+    async def fetch(self, url: str, headers: dict = None):
+        """ fetch
 
-            Set the user string for connection
+            Send a GET request and return the response body as bytes
+            Raises one of self.errors on connection and HTTP errors
 
             INPUTS
-            * myuser = (string) ''
+            * url     = (string) url to fetch
+            * headers = (dict) optional HTTP headers
         """
-        if self.AMPACHE_DEBUG:
-            print('AMPACHE_USER set to ' + myuser)
-        self.AMPACHE_USER = myuser
+        if self.transport:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, self.transport.get, url, headers)
+            return result.content
+        async with self.get_session().get(url, headers=headers, timeout=self.get_timeout()) as response:
+            return await response.read()
 
-    def set_key(self, mykey: str):
-        """ set_key
+    async def save(self, url: str, headers: dict, destination: str, chunk_size: int = 65536,
+                   resume: bool = False, progress=None):
+        """ save
 
-            set AMPACHE_KEY (api key or password)
+            Send a GET request and write the response body to a file in chunks.
+            With resume an existing file is continued from its current size using an HTTP Range request.
+            Returns False when the file size doesn't match the size reported by the server
 
             INPUTS
-            * mykey = (string) ''
-        """
-        if self.AMPACHE_DEBUG:
-            print('AMPACHE_KEY set to ' + mykey)
-        self.AMPACHE_KEY = mykey
+            * url         = (string) url to fetch
+            * headers     = (dict) optional HTTP headers
+            * destination = (string) full file path
+            * chunk_size  = (integer) bytes read per chunk //optional
+            * resume      = (boolean) continue a partial file //optional
+            * progress    = (function) called with (bytes_written, total_bytes) after each chunk //optional
+        """
+        if self.transport:
+            return await asyncio.get_running_loop().run_in_executor(None, self.transport.save, url, headers,
+                                                                    destination, chunk_size, resume, progress)
+        offset = os.path.getsize(destination) if resume and os.path.isfile(destination) else 0
+        range_headers = dict(headers or {})
+        if offset:
+            range_headers['Range'] = 'bytes=' + str(offset) + '-'
+        try:
+            async with self.get_session().get(url, headers=range_headers, timeout=self.get_timeout()) as response:
+                if not response.status == 206:
+                    offset = 0
+                total = Transport.get_total_size(response.headers, offset)
+                written = offset
+                with open(destination, 'ab' if offset else 'wb') as file:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        file.write(chunk)
+                        written = written + len(chunk)
+                        if progress:
+                            progress(written, total)
+        except aiohttp.ClientResponseError as error:
+            if offset and error.status == 416:
+                # the partial file is unusable so start again
+                return await self.save(url, headers, destination, chunk_size, False, progress)
+            raise
+        return total is None or os.path.getsize(destination) == total
 
-    def set_bearer_token(self, bearer_token: str):
-        """ set_key
+    def set_timeout(self, timeout):
+        """ set_timeout
 
-            set AMPACHE_BEARER_TOKEN (used for header authentication)
+            Change the timeout of the next requests
 
             INPUTS
-            * bearer_token = (string) ''
+            * timeout = (float|tuple) seconds or (connect, read) seconds, None waits forever
         """
-        if self.AMPACHE_DEBUG:
-            print('AMPACHE_BEARER_TOKEN set to ' + bearer_token)
-        self.AMPACHE_BEARER_TOKEN = bearer_token
+        self.timeout = timeout
+        if self.transport:
+            self.transport.set_timeout(timeout)
 
-    def set_url(self, myurl: str):
-        """ set_url
-
-            set the ampache url
+    async def close(self):
+        """ close
 
-            INPUTS
-            * myurl = (string) ''
+            Close all pooled connections
         """
-        if self.AMPACHE_DEBUG:
-            print('AMPACHE_URL set to ' + myurl)
-        self.AMPACHE_URL = myurl
+        if self.session is not None:
+            await self.session.close()
+        if self.transport:
+            self.transport.close()
 
-    def set_config_path(self, path: str):
-        """ set_config_path
 
-            Set the folder which contains your config to a folder instead of the working directory
+class CircuitBreaker(object):
+    """ CircuitBreaker
 
-            INPUTS
-            * path = (string) ''
+        Stop sending requests to a server that keeps failing.
+        After `failures` connection errors, timeouts or 5xx responses in a row the circuit opens
+        and requests fail straight away with CircuitOpenError.
+        Once `reset` seconds have passed one request is sent to test the server,
+        the circuit closes when it succeeds and opens again when it fails.
+
+        INPUTS
+        * failures = (integer) failed requests in a row that open the circuit //optional
+        * reset    = (float) seconds to wait before testing the server again //optional
+    """
+
+    def __init__(self, failures: int = 5, reset: float = 30):
+        self.failures = failures
+        self.reset = reset
+        self.count = 0
+        self.opened = 0.0
+        self.testing = False
+        self.lock = threading.Lock()
+
+    def get_state(self):
+        """ get_state
+
+            Return 'closed', 'open' or 'half_open' (the next request tests the server)
         """
-        if not os.path.isdir(path):
-            os.makedirs(path)
-        self.CONFIG_PATH = path
+        with self.lock:
+            if self.count < self.failures:
+                return 'closed'
+            if self.testing or time.time() - self.opened < self.reset:
+                return 'open'
+            return 'half_open'
 
-    def get_config(self):
-        """ get_config
+    def allow(self):
+        """ allow
 
-            Read the config and set values from the json config file
+            Return True when a request can be sent
         """
-        output_file = os.path.join(self.CONFIG_PATH, self.CONFIG_FILE)
-        if os.path.isfile(output_file):
-            with open(output_file, 'r') as file:
-                config = json.load(file)
-            try:
-                self.AMPACHE_URL = config["ampache_url"]
-                self.AMPACHE_USER = config["ampache_user"]
-                self.AMPACHE_KEY = config["ampache_apikey"]
-                self.AMPACHE_BEARER_TOKEN = config["ampache_bearer_token"]
-                self.AMPACHE_SESSION = config["ampache_session"]
-                self.AMPACHE_API = config["api_format"]
-            except TypeError:
-                return False
-            except IndexError:
+        with self.lock:
+            if self.count < self.failures:
+                return True
+            if self.testing or time.time() - self.opened < self.reset:
                 return False
-
+            self.testing = True
             return True
-        return False
 
-    def save_config(self):
-        """ save_config
+    def success(self):
+        """ success
 
-            Save config to a json file for use later
+            Close the circuit after the server answered
         """
-        config = {
-            "ampache_url": self.AMPACHE_URL,
-            "ampache_user": self.AMPACHE_USER,
-            "ampache_apikey": self.AMPACHE_KEY,
-            "ampache_bearer_token": self.AMPACHE_BEARER_TOKEN,
-            "ampache_session": self.AMPACHE_SESSION,
-            "api_format": self.AMPACHE_API
-        }
+        with self.lock:
+            self.count = 0
+            self.testing = False
 
-        if self.CONFIG_PATH and not os.path.isdir(self.CONFIG_PATH):
-            os.makedirs(self.CONFIG_PATH)
-        output_file = os.path.join(self.CONFIG_PATH, self.CONFIG_FILE)
-        with open(output_file, 'w') as file:
-            json.dump(config, file)
+    def failure(self):
+        """ failure
 
-    def test_result(self, result, title):
-        """ test_result
+            Count a failed request and open the circuit when there are too many in a row
+        """
+        with self.lock:
+            self.count += 1
+            self.testing = False
+            if self.count >= self.failures:
+                self.opened = time.time()
 
-            This function can be used to enable/disable debugging messages
 
-            INPUTS
-            * result = The response from the request
-            * title = (string) generally the function name that was called
-        """
-        if not result:
-            print("ampache." + title + f": {self.FAIL}FAIL{self.ENDC}")
-            return False
-        if 'Require: ' in result:
-            print(f"ampache." + title + f": {self.WARNING}WARNING{self.ENDC} " + result)
-            return True
-        if result:
-            print("ampache." + title + f": {self.OKGREEN}PASS{self.ENDC}")
-            return True
-        print("ampache." + title + f": {self.FAIL}FAIL{self.ENDC}")
-        return False
+class RateLimiter(object):
+    """ RateLimiter
 
-    def return_data(self, data):
-        """ return_data
+        Limit the requests sent to a server with a token bucket (requests per second)
+        and a semaphore (requests running at the same time).
+        Functions are split into 'read', 'write' (see ResponseCache.is_write) and 'binary' (stream, download, get_art)
+        and each class has its own limits
 
-            return json or xml data based on api format
+        INPUTS
+        * rate          = (float) requests per second, 0 for no limit //optional
+        * burst         = (integer) requests that can be sent at once after the limiter was idle //optional
+        * max_in_flight = (integer) requests running at the same time, 0 for no limit //optional
+        * limits        = (dict) (rate, burst, max_in_flight) for a class e.g. {'write': (2, 1, 1)} //optional
+    """
+
+    def __init__(self, rate: float = 0, burst: int = 1, max_in_flight: int = 0, limits: dict = None):
+        self.limits = dict()
+        self.tokens = dict()
+        self.updated = dict()
+        self.semaphores = dict()
+        # (event loop, asyncio.Semaphore) for AsyncAPI
+        self.async_semaphores = dict()
+        for limit_class in LIMIT_CLASSES:
+            self.limits[limit_class] = (limits or {}).get(limit_class, (rate, burst, max_in_flight))
+            self.tokens[limit_class] = self.limits[limit_class][1]
+            self.updated[limit_class] = time.monotonic()
+            max_requests = self.limits[limit_class][2]
+            self.semaphores[limit_class] = threading.BoundedSemaphore(max_requests) if max_requests else None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_class(action: str):
+        """ get_class
+
+            Return the class of a function 'read'|'write'|'binary'
 
             INPUTS
-            * data = (string)
+            * action = (string) API function name
         """
-        # json format
-        if self.AMPACHE_API == 'json':
-            try:
-                json_data = data if isinstance(data, dict) else json.loads(data.decode('utf-8'))
-            except json.decoder.JSONDecodeError:
-                return False
-            return json_data
-        # xml format
-        else:
-            try:
-                tree = data if isinstance(data, ElementTree.Element) else ElementTree.fromstring(data.decode('utf-8') if isinstance(data, bytes) else data)
-            except ElementTree.ParseError:
-                return False
-            return tree
+        if action in BINARY_ACTIONS:
+            return 'binary'
+        if ResponseCache.is_write(action):
+            return 'write'
+        return 'read'
 
-    def get_id_list(self, data, attribute: str):
-        """ get_id_list
+    def reserve(self, limit_class: str):
+        """ reserve
 
-            return a list of id's from the data you've got from the api
+            Take a token from the bucket and return the seconds to wait before sending the request
 
             INPUTS
-            * data      = (mixed) XML or JSON from the API
-            * attribute = (string) attribute you are searching for
+            * limit_class = (string) 'read'|'write'|'binary'
         """
-        id_list = list()
-        if not data:
-            return id_list
-        if self.AMPACHE_API == 'xml':
-            try:
-                for child in data:
-                    if child.tag == attribute:
-                        id_list.append(child.attrib['id'])
-            except KeyError:
-                id_list.append(data['id'])
-        else:
-            try:
-                if data[attribute]:
-                    try:
-                        if data[attribute]['id']:
-                            id_list.append(data[attribute]['id'])
-                    except (KeyError, TypeError):
-                        for data_object in data[attribute]:
-                            try:
-                                id_list.append(data_object[0]['id'])
-                            except (KeyError, TypeError):
-                                id_list.append(data_object['id'])
-            except (KeyError, TypeError):
-                try:
-                    if data[0][attribute]:
-                        try:
-                            if data[0][attribute]['id']:
-                                id_list.append(data[0][attribute]['id'])
-                        except (KeyError, TypeError):
-                            for data_object in data[0][attribute]:
-                                try:
-                                    id_list.append(data_object[0]['id'])
-                                except (KeyError, TypeError):
-                                    id_list.append(data_object['id'])
-                except (KeyError, TypeError):
-                    try:
-                        if data[0][0][attribute]:
-                            try:
-                                if data[0][0][attribute]['id']:
-                                    id_list.append(data[0][0][attribute]['id'])
-                            except (KeyError, TypeError):
-                                for data_object in data[0][0][attribute]:
-                                    try:
-                                        id_list.append(data_object[0]['id'])
-                                    except (KeyError, TypeError):
-                                        id_list.append(data_object['id'])
-                                    try:
-                                        id_list.append(data[0]['id'])
-                                    except (KeyError, TypeError):
-                                        id_list.append(data['id'])
-                    except (KeyError, TypeError):
-                        try:
-                            if data[0]['id']:
-                                for data_object in data:
-                                    try:
-                                        id_list.append(data_object[0]['id'])
-                                    except (KeyError, TypeError):
-                                        id_list.append(data_object['id'])
-                                    try:
-                                        id_list.append(data[0]['id'])
-                                    except (KeyError, TypeError):
-                                        id_list.append(data['id'])
-                        except (KeyError, TypeError):
-                            pass
+        rate, burst, max_requests = self.limits[limit_class]
+        if not rate:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            tokens = min(burst, self.tokens[limit_class] + (now - self.updated[limit_class]) * rate) - 1
+            self.tokens[limit_class] = tokens
+            self.updated[limit_class] = now
+        return -tokens / rate if tokens < 0 else 0
 
-        return id_list
-
-    def get_object_list(self, data, field: str):
-        """ get_id_list
+    @contextlib.contextmanager
+    def limit(self, action: str):
+        """ limit
 
-            return a list of objects from the data matching your field stirng
+            Context manager that waits for a free slot and a token before the request is sent
 
             INPUTS
-            * data        = (mixed) XML or JSON from the API
-            * field       = (string) field you are searching for
-            * data_format = (string) 'xml','json'
+            * action = (string) API function name
         """
-        id_list = list()
-        if self.AMPACHE_API == 'xml':
-            return data.findall(field)
-        else:
-            if not data:
-                return id_list
-            try:
-                for data_object in data[0][0][field]:
-                    id_list.append(data_object)
-            except KeyError:
-                try:
-                    for data_object in data[0][field]:
-                        id_list.append(data_object)
-                except KeyError:
-                    try:
-                        for data_object in data[field]:
-                            id_list.append(data_object)
-                    except (KeyError, TypeError):
-                        id_list.append(data)
-
-        return id_list
+        limit_class = self.get_class(action)
+        semaphore = self.semaphores[limit_class]
+        with semaphore if semaphore else contextlib.nullcontext():
+            delay = self.reserve(limit_class)
+            if delay:
+                time.sleep(delay)
+            yield limit_class
 
-    @staticmethod
-    def write_xml(xmlstr, filename: str):
-        """ write_xml
+    @contextlib.asynccontextmanager
+    async def async_limit(self, action: str):
+        """ async_limit
 
-            This function can be used to write your xml responses to a file.
+            limit() for AsyncAPI, waiting without blocking the event loop
 
             INPUTS
-            * xmlstr   = (xml) xml to write to file
-            * filename = (string) path and filename (e.g. './ampache.xml')
+            * action = (string) API function name
         """
-        if xmlstr:
-            text_file = open(filename, "w")
-            text_file.write(ElementTree.tostring(xmlstr).decode())
-            text_file.close()
+        limit_class = self.get_class(action)
+        semaphore = self.get_async_semaphore(limit_class)
+        async with semaphore if semaphore else contextlib.nullcontext():
+            delay = self.reserve(limit_class)
+            if delay:
+                await asyncio.sleep(delay)
+            yield limit_class
 
-    @staticmethod
-    def get_message(data):
-        """ get_message
+    def get_async_semaphore(self, limit_class: str):
+        """ get_async_semaphore
 
-            Return the string message text from the api response
+            Return the asyncio.Semaphore of a class for the running event loop or None without a limit
 
             INPUTS
-            * data = (mixed) XML or JSON from the API
+            * limit_class = (string) 'read'|'write'|'binary'
         """
-        message = data
-        print(data)
-        if 'error' in data:
-            try:
-                message = data['error']['message']
-            except TypeError:
-                message = data['error']
-            except KeyError:
-                message = data['error']['errorMessage']
-        if 'success' in data:
-            try:
-                message = data['success']['message']
-            except TypeError:
-                message = data['success']
-        return message
+        max_requests = self.limits[limit_class][2]
+        if not max_requests:
+            return None
+        loop = asyncio.get_running_loop()
+        stored = self.async_semaphores.get(limit_class)
+        if stored is None or stored[0] is not loop:
+            stored = (loop, asyncio.Semaphore(max_requests))
+            self.async_semaphores[limit_class] = stored
+        return stored[1]
 
-    @staticmethod
-    def write_json(json_data: str, filename: str):
-        """ write_json
 
-            This function can be used to write your json responses to a file.
+class ResponseCache(object):
+    """ ResponseCache
 
-            INPUTS
-            * json_data = (json) json to write to file
-            * filename  = (string) path and filename (e.g. './ampache.json')
-        """
-        if json_data:
-            text_file = open(filename, "w")
-            text_file.write(json.dumps(json_data))
-            text_file.close()
+        In-memory cache of raw API responses for read-only functions.
+        Responses are keyed by user, server url and parameters (without auth) and the least recently used
+        response is dropped when max_entries is reached.
+        Functions that change data on the server are never cached and empty the cache.
+
+        Enable it with API.set_cache(ampache.ResponseCache())
+
+        INPUTS
+        * ttl         = (integer) seconds a response is kept //optional
+        * max_entries = (integer) maximum number of responses kept //optional
+        * ttls        = (dict) seconds per function e.g. {'song': 3600, 'catalogs': 60}, 0 disables caching //optional
+        * clear_on_write = (boolean) empty the cache after a function that changes data //optional
+    """
+
+    def __init__(self, ttl: int = 300, max_entries: int = 1000, ttls: dict = None, clear_on_write: bool = True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        self.clear_on_write = clear_on_write
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
 
     @staticmethod
-    def encrypt_password(password: str, current_time: int):
-        """ encrypt_password
+    def is_write(action: str):
+        """ is_write
 
-            This function can be used to encrypt your password into the accepted format.
+            Return True when the function changes data on the server
 
             INPUTS
-            * password = (string) unencrypted password string
-            * time     = (integer) linux time
+            * action = (string) API function name
         """
-        key = hashlib.sha256(password.encode()).hexdigest()
-        passphrase = str(current_time) + key
-        sha_signature = hashlib.sha256(passphrase.encode()).hexdigest()
-        return sha_signature
+        return action in CACHE_WRITE_ACTIONS or action.endswith(CACHE_WRITE_SUFFIXES)
 
-    @staticmethod
-    def encrypt_string(api_key: str, username: str):
-        """ encrypt_string
+    def get_ttl(self, action: str):
+        """ get_ttl
 
-            This function can be used to encrypt your apikey into the accepted format.
+            Return the number of seconds to keep a response for this function (0 when it is not cached)
 
             INPUTS
-            * api_key = (string) unencrypted apikey
-            * user    = (string) username
+            * action = (string) API function name
         """
-        key = hashlib.sha256(api_key.encode()).hexdigest()
-        passphrase = username + key
-        sha_signature = hashlib.sha256(passphrase.encode()).hexdigest()
-        return sha_signature
+        if action in CACHE_SKIP_ACTIONS or self.is_write(action):
+            return 0
+        return self.ttls.get(action, self.ttl)
 
-    def fetch_url(self, full_url: str, api_format: str, method: str, headers: dict = None):
-        """ fetch_url
+    def get_key(self, ampache_url: str, data: dict, user: str = ''):
+        """ get_key
 
-            This function is used to fetch the string results using urllib
+            Return the cache key for a request or False when the response can't be cached
+            Keys include a hash of the user (or of the auth parameter without a user)
+            so accounts sharing a cache never read each other's responses
 
             INPUTS
-            * full_url   = (string) url to fetch
-            * api_format = (string) 'xml'|'json'
-            * method     = (string)
-            * headers    = (dict) optional HTTP headers
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * user        = (string) user name or token of the account //optional
         """
-        try:
-            if not headers:
-                req = urllib.request.Request(full_url)
-            else:
-                req = urllib.request.Request(full_url, headers=headers)
-            result = urllib.request.urlopen(req)
-        except urllib.error.HTTPError:
-            return False
-        except urllib.error.URLError:
-            return False
-        except ValueError:
+        if not self.get_ttl(data.get('action', '')):
             return False
-        ampache_response = result.read()
-        result.close()
-        if self.AMPACHE_DEBUG:
-            if self.DOCS_PATH == "docs/":
-                self.DOCS_PATH = self.DOCS_PATH + api_format + "-responses/"
-            url_response = ampache_response.decode('utf-8')
-            print(url_response)
-            print(full_url)
-            try:
-                if not os.path.isdir(self.DOCS_PATH):
-                    os.makedirs(self.DOCS_PATH)
-                text_file = open(self.DOCS_PATH + method + "." + api_format, "w", encoding="utf-8")
-                text_file.write(url_response)
-                text_file.close()
-            except FileNotFoundError:
-                pass
-        return ampache_response
-
-    def get_request(self, ampache_url, data, api_method):
-        headers = {}
-        if hasattr(self, 'AMPACHE_BEARER_TOKEN') and self.AMPACHE_BEARER_TOKEN:
-            headers['Authorization'] = f'Bearer {self.AMPACHE_BEARER_TOKEN}'
-            data.pop('auth', None)
-        data = urllib.parse.urlencode(data)
-        full_url = ampache_url + '?' + data
-        request_response = self.fetch_url(full_url, self.AMPACHE_API, api_method, headers)
-        if isinstance(request_response, bool):
+        if data.get('random') or 'random' in data.values():
             return False
-        return self.return_data(request_response)
-
-    """
-    -------------
-    API FUNCTIONS
-    -------------
-    """
+        owner = hashlib.sha256(str(user or data.get('auth', '')).encode()).hexdigest()[:16]
+        params = sorted((key, str(value)) for key, value in data.items() if not key == 'auth')
+        return owner + ':' + ampache_url + '?' + encode_query(params)
 
-    def handshake(self, ampache_url: str, ampache_api: str, ampache_user=False,
-                  timestamp: int = 0, version: str = '6.6.0'):
-        """ handshake
-            MINIMUM_API_VERSION=380001
+    def get(self, key: str):
+        """ get
 
-            This is the function that handles verifying a new handshake
-            Takes a timestamp, auth key, and username.
+            Return the cached response or None when it is missing or expired
 
             INPUTS
-            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
-            * ampache_api = (string) encrypted apikey OR password if using password auth
-            * user        = (string) username //optional
-            * timestamp   = (integer) UNIXTIME() //optional
-            * version     = (string) //optional
+            * key = (string) key from get_key()
         """
-        self.AMPACHE_URL = ampache_url
-        if timestamp == 0:
-            timestamp = int(time.time())
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'handshake'
-        data = {'action': api_method,
-                'auth': ampache_api,
-                'user': ampache_user,
-                'timestamp': str(timestamp),
-                'version': version}
-        if not ampache_user:
-            data.pop('user')
-        if not timestamp or not ampache_user:
-            data.pop('timestamp')
-        if not version:
-            data.pop('version')
-        ampache_response = self.get_request(ampache_url, data, api_method)
-        if isinstance(ampache_response, bool):
-            return False
-        # json format
-        if self.AMPACHE_API == 'json':
-            json_data = ampache_response if isinstance(ampache_response, dict) else json.loads(ampache_response.decode('utf-8'))
-            if 'api' in json_data:
-                self.AMPACHE_SERVER = json_data['api']
-            if 'auth' in json_data:
-                self.AMPACHE_SESSION = json_data['auth']
-                return json_data['auth']
-            else:
-                self.AMPACHE_SESSION = False
-                return False
-        # xml format
-        else:
-            try:
-                tree = ampache_response if isinstance(ampache_response, ElementTree.Element) else ElementTree.fromstring(ampache_response.decode('utf-8') if isinstance(ampache_response, bytes) else ampache_response)
-            except ElementTree.ParseError:
-                return False
-            try:
-                self.AMPACHE_SERVER = tree.find('api').text
-            except AttributeError:
-                pass
-            try:
-                token = tree.find('auth').text
-            except AttributeError:
-                token = False
-            self.AMPACHE_SESSION = token
-            return token
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses = self.misses + 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits = self.hits + 1
+            return entry[1]
 
-    def ping(self, ampache_url: str, ampache_api=False, version: str = '6.6.0'):
-        """ ping
-            MINIMUM_API_VERSION=380001
+    def set(self, key: str, action: str, response: bytes):
+        """ set
 
-            This can be called without being authenticated, it is useful for determining if what the status
-            of the server is, and what version it is running/compatible with
+            Store a response and drop the least recently used ones over max_entries
 
             INPUTS
-            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
-            * ampache_api = (string) encrypted apikey //optional
+            * key      = (string) key from get_key()
+            * action   = (string) API function name
+            * response = (bytes) raw response body
         """
-        ampache_url = ampache_url + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'ping'
-        data = {'action': api_method,
-                'version': version,
-                'auth': ampache_api}
-        if not ampache_api:
-            data.pop('auth')
-        ampache_response = self.get_request(ampache_url, data, api_method)
-        if isinstance(ampache_response, bool):
-            self.AMPACHE_SESSION = False
-            return False
-        # json format
-        if self.AMPACHE_API == 'json':
-            json_data = ampache_response if isinstance(ampache_response, dict) else json.loads(ampache_response.decode('utf-8'))
-            if 'api' in json_data:
-                self.AMPACHE_SERVER = json_data['api']
-            if 'session_expire' in json_data:
-                if not self.AMPACHE_URL:
-                    self.AMPACHE_URL = ampache_url
-                self.AMPACHE_SESSION = ampache_api
-                return ampache_api
-            else:
-                self.AMPACHE_SESSION = False
-                return False
-        # xml format
-        else:
-            try:
-                tree = ampache_response if isinstance(ampache_response, ElementTree.Element) else ElementTree.fromstring(ampache_response.decode('utf-8') if isinstance(ampache_response, bytes) else ampache_response)
-            except ElementTree.ParseError:
-                return False
-            try:
-                self.AMPACHE_SERVER = tree.find('api').text
-            except AttributeError:
-                pass
-            try:
-                token = tree.find('session_expire').text
-                if token and not self.AMPACHE_URL:
-                    self.AMPACHE_URL = ampache_url
-                self.AMPACHE_SESSION = ampache_api
-            except AttributeError:
-                return False
-            return ampache_api
-
-    def register(self, username, fullname, password, email):
-        """ register
-            MINIMUM_API_VERSION=6.0.0
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.get_ttl(action), response)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
 
-            Register a new user.
-            Requires the username, password and email.
+    def clear(self):
+        """ clear
 
-            INPUTS
-            * username = (string) $username
-            * fullname = (string) $fullname //optional
-            * password = (string) hash('sha256', $password)
-            * email    = (string) $email
+            Remove every cached response
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'register'
-        data = {'action': api_method,
-                'username': username,
-                'fullname': fullname,
-                'password': password,
-                'email': email}
-        return self.get_request(ampache_url, data, api_method)
+        with self.lock:
+            self.entries.clear()
 
-    def lost_password(self, auth):
-        """ lost_password
-            MINIMUM_API_VERSION=6.1.0
+    def invalidate(self, action: str):
+        """ invalidate
 
-            Allows a non-admin user to reset their password without web access to the main site.
-            It requires a reset token hash using your username and email
+            Empty the cache after a function that changes data on the server
 
             INPUTS
-            * auth = (string) (
-                $username;
-                $key = hash('sha256', 'email');
-                auth = hash('sha256', $username . $key);
-              )
+            * action = (string) API function name
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'lost_password'
-        data = {'action': api_method,
-                'auth': auth}
-        return self.get_request(ampache_url, data, api_method)
+        if self.clear_on_write and self.is_write(action):
+            self.clear()
 
-    def goodbye(self):
-        """ goodbye
-            MINIMUM_API_VERSION=400001
 
-            Destroy session for ampache_api auth key.
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'goodbye'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION}
-        return self.get_request(ampache_url, data, api_method)
+class SQLiteCache(ResponseCache):
+    """ SQLiteCache
 
-    def url_to_song(self, url):
-        """ url_to_song
-            MINIMUM_API_VERSION=380001
+        ResponseCache stored in a SQLite file so responses are kept between runs.
+        Set AMPACHE_USER (or a bearer token) to reuse them, keys are per session without it.
+        Every thread uses its own connection and the database runs in WAL mode so
+        several threads and processes can read and write at the same time.
+        set() drops the oldest responses over max_entries and a background thread deletes expired responses
+        and returns the free space to the disk every compact_interval seconds.
 
-            This takes a url and returns the song object in question
+        ampache_connection.set_cache(ampache.SQLiteCache(os.path.join(ampache_connection.CONFIG_PATH, 'ampache_cache.sqlite')))
 
-            INPUTS
-            * url = (string) Full Ampache URL from server, translates back into a song XML
+        INPUTS
+        * path             = (string) database file //optional
+        * ttl              = (integer) seconds a response is kept //optional
+        * max_entries      = (integer) maximum number of responses kept, the least recently written are removed first //optional
+        * ttls             = (dict) seconds per function e.g. {'song': 3600, 'catalogs': 60} //optional
+        * clear_on_write   = (boolean) empty the cache after a function that changes data //optional
+        * compact_interval = (integer) seconds between clean ups, 0 disables the background thread //optional
+    """
+
+    def __init__(self, path: str = 'ampache_cache.sqlite', ttl: int = 3600, max_entries: int = 100000,
+                 ttls: dict = None, clear_on_write: bool = True, compact_interval: int = 300):
+        super().__init__(ttl, max_entries, ttls, clear_on_write)
+        self.path = path
+        self.local = threading.local()
+        self.connections = []
+        self.stopped = threading.Event()
+        if os.path.dirname(path) and not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        connection = self.get_connection()
+        with connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS `response` (`key` TEXT PRIMARY KEY, '
+                               '`action` TEXT NOT NULL, `updated` REAL NOT NULL, `expires` REAL NOT NULL, '
+                               '`response` BLOB NOT NULL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS `response_expires` ON `response` (`expires`)')
+            connection.execute('CREATE INDEX IF NOT EXISTS `response_updated` ON `response` (`updated`)')
+        self.compactor = None
+        if compact_interval:
+            self.compactor = threading.Thread(target=self.run_compact, args=(compact_interval,), daemon=True)
+            self.compactor.start()
+
+    def get_connection(self):
+        """ get_connection
+
+            Return the SQLite connection for the current thread
+        """
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('PRAGMA busy_timeout=30000')
+            self.local.connection = connection
+            with self.lock:
+                self.connections.append(connection)
+        return connection
+
+    def get(self, key: str):
+        """ get
+
+            Return the stored response or None when it is missing or expired
+
+            INPUTS
+            * key = (string) key from get_key()
+        """
+        row = self.get_connection().execute('SELECT `response` FROM `response` WHERE `key` = ? AND `expires` >= ?',
+                                            (key, time.time())).fetchone()
+        with self.lock:
+            if row is None:
+                self.misses = self.misses + 1
+                return None
+            self.hits = self.hits + 1
+        return bytes(row[0])
+
+    def set(self, key: str, action: str, response: bytes):
+        """ set
+
+            Store a response and drop the least recently written ones over max_entries
+
+            INPUTS
+            * key      = (string) key from get_key()
+            * action   = (string) API function name
+            * response = (bytes) raw response body
+        """
+        now = time.time()
+        connection = self.get_connection()
+        with connection:
+            connection.execute('INSERT OR REPLACE INTO `response` (`key`, `action`, `updated`, `expires`, '
+                               '`response`) VALUES (?, ?, ?, ?, ?)',
+                               (key, action, now, now + self.get_ttl(action), sqlite3.Binary(response)))
+            # a replaced row gets a new rowid so the lowest rowids are the least recently written
+            connection.execute('DELETE FROM `response` WHERE `rowid` IN (SELECT `rowid` FROM `response` '
+                               'ORDER BY `rowid` LIMIT max((SELECT count(*) FROM `response`) - ?, 0))',
+                               (self.max_entries,))
+
+    def clear(self):
+        """ clear
+
+            Delete every stored response
+        """
+        connection = self.get_connection()
+        with connection:
+            connection.execute('DELETE FROM `response`')
+
+    def compact(self):
+        """ compact
+
+            Delete expired responses, keep the newest max_entries and shrink the file
+        """
+        connection = self.get_connection()
+        with connection:
+            connection.execute('DELETE FROM `response` WHERE `expires` < ?', (time.time(),))
+            connection.execute('DELETE FROM `response` WHERE `key` IN (SELECT `key` FROM `response` '
+                               'ORDER BY `updated` DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+        connection.execute('PRAGMA incremental_vacuum')
+        connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def run_compact(self, interval: int):
+        """ run_compact
+
+            Background thread that runs compact() every interval seconds until close()
+
+            INPUTS
+            * interval = (integer) seconds between clean ups
+        """
+        while not self.stopped.wait(interval):
+            try:
+                self.compact()
+            except sqlite3.Error:
+                # the database is busy, try again next time
+                pass
+
+    def close(self):
+        """ close
+
+            Stop the background thread and close every connection
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'url_to_song'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'url': url}
-        return self.get_request(ampache_url, data, api_method)
+        self.stopped.set()
+        if self.compactor is not None:
+            self.compactor.join()
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections = []
+        self.local = threading.local()
+
+
+def model_slots(fields):
+    """ model_slots
+
+        Return the __slots__ for a model from its FIELDS
+        object references are stored flat as '<name>_id' and '<name>_name'
+
+        INPUTS
+        * fields = (tuple) ((name, kind), ...)
+    """
+    slots = list()
+    for name, kind in fields:
+        if kind == 'ref':
+            slots.append(name + '_id')
+            slots.append(name + '_name')
+        else:
+            slots.append(name)
+    return tuple(slots)
+
+
+def model_value(value, kind):
+    """ model_value
+
+        Convert a JSON value or XML text to the python type for a model field
+
+        INPUTS
+        * value = (mixed) value from the response
+        * kind  = (type) str|int|float|bool
+    """
+    if value is None or value == '':
+        return None
+    try:
+        if kind is bool:
+            return bool(int(value))
+        if kind is str:
+            return str(value)
+        return kind(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class AmpacheObject(object):
+    """ AmpacheObject
+
+        Base class for the typed objects returned by API.get_models()
+        Values are read once from an XML element or JSON dict into __slots__ so both formats
+        give the same attributes and the response can be released.
+
+        FIELDS kinds
+        * str, int, float, bool = converted value, missing or empty values are None
+        * 'ref'    = child object stored as <name>_id and <name>_name (e.g. artist_id, artist_name)
+        * 'genres' = tuple of (id, name) pairs
+    """
+    __slots__ = ('id',)
+    FIELDS = ()
+
+    def __repr__(self):
+        return type(self).__name__ + '(id=' + repr(self.id) + ')'
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        return hash((type(self), self.id))
+
+    def to_dict(self):
+        """ to_dict
+
+            Return the object as a plain dict
+        """
+        return {name: getattr(self, name) for name in ('id',) + self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ from_dict
+
+            Create the object from a dict made by to_dict()
+
+            INPUTS
+            * data = (dict)
+        """
+        model = cls.__new__(cls)
+        for name in ('id',) + cls.__slots__:
+            value = data.get(name)
+            if isinstance(value, list):
+                value = tuple(tuple(item) for item in value)
+            setattr(model, name, value)
+        return model
+
+    @classmethod
+    def from_xml(cls, element):
+        """ from_xml
+
+            Create the object from an XML element
+
+            INPUTS
+            * element = (ElementTree.Element) object element e.g. <song id="1">
+        """
+        model = cls.__new__(cls)
+        model.id = element.get('id')
+        for name, kind in cls.FIELDS:
+            if kind == 'ref':
+                child = element.find(name)
+                setattr(model, name + '_id', None if child is None else child.get('id'))
+                setattr(model, name + '_name', None if child is None else child.findtext('name') or None)
+            elif kind == 'genres':
+                setattr(model, name, tuple((child.get('id'), child.findtext('name'))
+                                           for child in element.findall(name)))
+            else:
+                setattr(model, name, model_value(element.findtext(name), kind))
+        return model
+
+    @classmethod
+    def from_json(cls, data: dict):
+        """ from_json
+
+            Create the object from a JSON dict
+
+            INPUTS
+            * data = (dict) object from a JSON response
+        """
+        model = cls.__new__(cls)
+        model.id = model_value(data.get('id'), str)
+        for name, kind in cls.FIELDS:
+            value = data.get(name)
+            if kind == 'ref':
+                if not isinstance(value, dict):
+                    value = {}
+                setattr(model, name + '_id', model_value(value.get('id'), str))
+                setattr(model, name + '_name', model_value(value.get('name'), str))
+            elif kind == 'genres':
+                setattr(model, name, tuple((model_value(child.get('id'), str), child.get('name'))
+                                           for child in value or ()))
+            else:
+                setattr(model, name, model_value(value, kind))
+        return model
+
+    @classmethod
+    def from_data(cls, data):
+        """ from_data
+
+            Create the object from an XML element or JSON dict
+
+            INPUTS
+            * data = (mixed) XML or JSON object from the API
+        """
+        if isinstance(data, ElementTree.Element):
+            return cls.from_xml(data)
+        return cls.from_json(data)
+
+
+class Song(AmpacheObject):
+    """ Song
+
+        Song objects from songs, song, playlist_songs, advanced_search, etc.
+    """
+    FIELDS = (('title', str), ('name', str), ('artist', 'ref'), ('album', 'ref'), ('albumartist', 'ref'),
+              ('disk', int), ('disksubtitle', str), ('track', int), ('filename', str), ('genre', 'genres'),
+              ('playlisttrack', int), ('time', int), ('year', int), ('format', str), ('stream_format', str),
+              ('bitrate', int), ('stream_bitrate', int), ('rate', int), ('mode', str), ('mime', str),
+              ('stream_mime', str), ('url', str), ('size', int), ('mbid', str), ('art', str),
+              ('has_art', bool), ('flag', bool), ('rating', int), ('averagerating', float), ('playcount', int),
+              ('catalog', int), ('composer', str), ('channels', int), ('comment', str), ('license', str),
+              ('publisher', str), ('language', str), ('lyrics', str), ('replaygain_album_gain', float),
+              ('replaygain_album_peak', float), ('replaygain_track_gain', float),
+              ('replaygain_track_peak', float), ('r128_album_gain', int), ('r128_track_gain', int))
+    __slots__ = model_slots(FIELDS)
+
+
+class Album(AmpacheObject):
+    """ Album
+
+        Album objects from albums, album, artist_albums, etc.
+    """
+    FIELDS = (('name', str), ('prefix', str), ('basename', str), ('artist', 'ref'), ('time', int),
+              ('year', int), ('songcount', int), ('diskcount', int), ('type', str), ('genre', 'genres'),
+              ('art', str), ('has_art', bool), ('flag', bool), ('rating', int), ('averagerating', float),
+              ('mbid', str), ('mbid_group', str))
+    __slots__ = model_slots(FIELDS)
+
+
+class Artist(AmpacheObject):
+    """ Artist
+
+        Artist objects from artists, artist, genre_artists, etc.
+    """
+    FIELDS = (('name', str), ('prefix', str), ('basename', str), ('albumcount', int), ('songcount', int),
+              ('genre', 'genres'), ('art', str), ('has_art', bool), ('flag', bool), ('rating', int),
+              ('averagerating', float), ('mbid', str), ('summary', str), ('time', int), ('yearformed', int),
+              ('placeformed', str))
+    __slots__ = model_slots(FIELDS)
+
+
+class Playlist(AmpacheObject):
+    """ Playlist
+
+        Playlist objects from playlists, playlist, smartlists, etc.
+    """
+    FIELDS = (('name', str), ('owner', str), ('items', int), ('type', str), ('art', str), ('has_access', bool),
+              ('has_collaborate', bool), ('has_art', bool), ('flag', bool), ('rating', int),
+              ('averagerating', float), ('md5', str), ('last_update', int))
+    __slots__ = model_slots(FIELDS)
+
+
+class Podcast(AmpacheObject):
+    """ Podcast
+
+        Podcast objects from podcasts and podcast
+    """
+    FIELDS = (('name', str), ('description', str), ('language', str), ('copyright', str), ('feed_url', str),
+              ('generator', str), ('website', str), ('build_date', str), ('sync_date', str), ('public_url', str),
+              ('art', str), ('has_art', bool), ('flag', bool), ('rating', int), ('averagerating', float))
+    __slots__ = model_slots(FIELDS)
+
+
+class PodcastEpisode(AmpacheObject):
+    """ PodcastEpisode
+
+        Podcast_episode objects from podcast_episodes and podcast_episode
+    """
+    FIELDS = (('title', str), ('name', str), ('podcast', 'ref'), ('description', str), ('category', str),
+              ('author', str), ('author_full', str), ('website', str), ('pubdate', str), ('state', str),
+              ('filelength', str), ('filesize', str), ('filename', str), ('mime', str), ('time', int),
+              ('size', int), ('bitrate', int), ('stream_bitrate', int), ('rate', int), ('mode', str),
+              ('channels', int), ('public_url', str), ('url', str), ('catalog', int), ('art', str),
+              ('has_art', bool), ('flag', bool), ('rating', int), ('averagerating', float), ('playcount', int),
+              ('played', str))
+    __slots__ = model_slots(FIELDS)
+
+
+class Genre(AmpacheObject):
+    """ Genre
+
+        Genre objects from genres, genre, tags and tag
+    """
+    FIELDS = (('name', str), ('albums', int), ('artists', int), ('songs', int), ('videos', int),
+              ('playlists', int), ('live_streams', int), ('is_hidden', bool))
+    __slots__ = model_slots(FIELDS)
+
+
+class Video(AmpacheObject):
+    """ Video
+
+        Video objects from videos and video
+    """
+    FIELDS = (('title', str), ('mime', str), ('resolution', str), ('size', int), ('genre', 'genres'),
+              ('time', int), ('url', str), ('art', str), ('has_art', bool), ('flag', bool), ('rating', int),
+              ('averagerating', float), ('playcount', int))
+    __slots__ = model_slots(FIELDS)
+
+
+# model class for each object name in a response
+MODELS = {
+    'album': Album,
+    'artist': Artist,
+    'genre': Genre,
+    'playlist': Playlist,
+    'podcast': Podcast,
+    'podcast_episode': PodcastEpisode,
+    'song': Song,
+    'tag': Genre,
+    'video': Video,
+}
+
+
+class API(object):
+
+    def __init__(self):
+        self.AMPACHE_API = 'xml'
+        self.AMPACHE_VERSION = '6.9.0'
+        self.AMPACHE_SERVER = ''
+        self.AMPACHE_DEBUG = False
+        self.DOCS_PATH = 'docs/'
+        self.CONFIG_FILE = 'ampache.json'
+        self.CONFIG_PATH = ''
+        self.AMPACHE_URL = ''
+        self.AMPACHE_SESSION = ''
+        self.AMPACHE_USER = ''
+        self.AMPACHE_KEY = ''
+        self.AMPACHE_BEARER_TOKEN = ''
+        self.AMPACHE_TRANSPORT = Transport()
+        self.AMPACHE_CHUNK_SIZE = 65536
+        self.AMPACHE_CACHE = None
+        self.AMPACHE_REVALIDATE = False
+        self.AMPACHE_REVALIDATE_ENTRIES = 1000
+        self.AMPACHE_AUTO_HANDSHAKE = False
+        self.AMPACHE_SESSION_MARGIN = 60
+        self.AMPACHE_SESSION_EXPIRE = 0
+        self.AMPACHE_RETRIES = 0
+        self.AMPACHE_RETRY_BACKOFF = 0.5
+        self.AMPACHE_CIRCUIT_BREAKER = None
+        self.AMPACHE_RAISE_ERRORS = False
+        self.AMPACHE_RATE_LIMITER = None
+        # time of the handshake that started the session (see is_session_expiring)
+        self.session_time = 0
+        # (ampache_url, ampache_api, ampache_user, version) of the last handshake (see renew_session)
+        self.session_handshake = None
+        self.session_lock = threading.Lock()
+        # (AMPACHE_URL, AMPACHE_API, server url) see get_server_url
+        self.server_url = ('', '', '')
+        # object name to stream from the current thread's request (see iter_response)
+        self.stream_state = threading.local()
+        # AmpacheError of the current thread's last request or None (see get_last_error)
+        self.transport_state = threading.local()
+        # (md5, response) for playlist_songs and smartlist_songs, least recently used first (see revalidate_request)
+        self.playlist_store = collections.OrderedDict()
+        self.playlist_lock = threading.Lock()
+        # Test colors for printing
+        self.OKGREEN = '\033[92m'
+        self.WARNING = '\033[93m'
+        self.FAIL = '\033[91m'
+        self.ENDC = '\033[0m'
+
+    """
+    ----------------
+    HELPER FUNCTIONS
+    ----------------
+    """
+
+    def set_format(self, myformat: str):
+        """ set_format
+
+            Allow forcing a default API output format
+
+            INPUTS
+            * myformat = (string) 'xml'|'json'
+        """
+        if myformat == 'xml' or myformat == 'json':
+            if self.AMPACHE_DEBUG:
+                print('AMPACHE_API set to ' + myformat)
+            self.AMPACHE_API = myformat
+
+    def set_debug(self, mybool: bool):
+        """ set_debug
+
+            This function can be used to enable/disable debugging messages
+
+            INPUTS
+            * bool = (boolean) Enable/disable debug messages
+        """
+        if self.AMPACHE_DEBUG:
+            if mybool:
+                print('AMPACHE_DEBUG' + f": {self.OKGREEN}enabled{self.ENDC}")
+            else:
+                print('AMPACHE_DEBUG' + f": {self.WARNING}disabled{self.ENDC}")
+        self.AMPACHE_DEBUG = mybool
+
+    def set_debug_path(self, path_string: str):
+        """ set_debug_path
+
+        This function can be used to set the output folder for docs
+
+        INPUTS
+        * path_string = (string) folder path
+        """
+        self.DOCS_PATH = path_string
+
+    def set_version(self, myversion: str):
+        """ set_version
+
+            Allow forcing a default API version
+
+            api3 = '390001'
+            api4 = '443000'
+            api5 = '5.5.6'
+            api6 = '6.6.0'
+
+            INPUTS
+            * myversion = (string) '6.6.0'|'390001'
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_VERSION set to ' + myversion)
+        self.AMPACHE_VERSION = myversion
+
+    def set_user(self, myuser: str):
+        """ set_user
+
+            Set the user string for connection
+
+            INPUTS
+            * myuser = (string) ''
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_USER set to ' + myuser)
+        self.AMPACHE_USER = myuser
+
+    def set_key(self, mykey: str):
+        """ set_key
+
+            set AMPACHE_KEY (api key or password)
+
+            INPUTS
+            * mykey = (string) ''
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_KEY set to ' + mykey)
+        self.AMPACHE_KEY = mykey
+
+    def set_bearer_token(self, bearer_token: str):
+        """ set_key
+
+            set AMPACHE_BEARER_TOKEN (used for header authentication)
+
+            INPUTS
+            * bearer_token = (string) ''
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_BEARER_TOKEN set to ' + bearer_token)
+        self.AMPACHE_BEARER_TOKEN = bearer_token
+
+    def set_url(self, myurl: str):
+        """ set_url
+
+            set the ampache url
+
+            INPUTS
+            * myurl = (string) ''
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_URL set to ' + myurl)
+        self.AMPACHE_URL = myurl
+
+    def set_transport(self, transport):
+        """ set_transport
+
+            Replace the HTTP transport used for requests (e.g. a Transport with a larger pool)
+
+            INPUTS
+            * transport = (Transport) object with get(url, headers, stream) and save() methods
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_TRANSPORT set to ' + type(transport).__name__)
+        self.AMPACHE_TRANSPORT = transport
+
+    def set_chunk_size(self, chunk_size: int):
+        """ set_chunk_size
+
+            Set the number of bytes read and written at a time by stream, download and get_art
+
+            INPUTS
+            * chunk_size = (integer) bytes per chunk
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_CHUNK_SIZE set to ' + str(chunk_size))
+        self.AMPACHE_CHUNK_SIZE = chunk_size
+
+    def set_cache(self, cache):
+        """ set_cache
+
+            Cache responses of read-only functions (None disables the cache)
+
+            INPUTS
+            * cache = (ResponseCache|SQLiteCache) object with get_key(), get(), set() and invalidate() methods
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_CACHE set to ' + type(cache).__name__)
+        self.AMPACHE_CACHE = cache
+
+    def set_revalidate(self, mybool: bool, max_entries: int = 1000):
+        """ set_revalidate
+
+            Keep a copy of playlist_songs and smartlist_songs and only download them again
+            when playlist_hash has changed (API 6.6.0+)
+            The least recently used list is dropped when max_entries lists are kept
+
+            INPUTS
+            * mybool      = (boolean) True|False
+            * max_entries = (integer) maximum number of lists kept //optional
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_REVALIDATE set to ' + str(mybool))
+        self.AMPACHE_REVALIDATE = mybool
+        self.AMPACHE_REVALIDATE_ENTRIES = max_entries
+        with self.playlist_lock:
+            while len(self.playlist_store) > max_entries:
+                self.playlist_store.popitem(last=False)
+
+    def set_auto_handshake(self, mybool: bool, margin: int = 60):
+        """ set_auto_handshake
+
+            Refresh the session before it expires and handshake again when the server rejects it
+            The failed request is sent once more with the new session
+
+            INPUTS
+            * mybool = (boolean) True|False
+            * margin = (integer) seconds before session_expire to refresh the session //optional
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_AUTO_HANDSHAKE set to ' + str(mybool))
+        self.AMPACHE_AUTO_HANDSHAKE = mybool
+        self.AMPACHE_SESSION_MARGIN = margin
+
+    def set_timeout(self, timeout):
+        """ set_timeout
+
+            Set how long the transport waits for the server to connect and to send data
+
+            INPUTS
+            * timeout = (float|tuple) seconds or (connect, read) seconds, None waits forever
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_TRANSPORT timeout set to ' + str(timeout))
+        self.AMPACHE_TRANSPORT.set_timeout(timeout)
+
+    def set_retries(self, retries: int, backoff: float = 0.5):
+        """ set_retries
+
+            Send read requests again after connection errors, timeouts and 5xx responses.
+            Each retry waits a random time up to backoff * 2 ** attempt seconds
+            Functions that change data are never sent twice
+
+            INPUTS
+            * retries = (integer) number of retries, 0 disables them
+            * backoff = (float) seconds for the first retry //optional
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_RETRIES set to ' + str(retries))
+        self.AMPACHE_RETRIES = retries
+        self.AMPACHE_RETRY_BACKOFF = backoff
+
+    def set_circuit_breaker(self, breaker):
+        """ set_circuit_breaker
+
+            Fail requests straight away while the server keeps failing (None disables the breaker)
+
+            INPUTS
+            * breaker = (CircuitBreaker) object with allow(), success() and failure() methods
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_CIRCUIT_BREAKER set to ' + type(breaker).__name__)
+        self.AMPACHE_CIRCUIT_BREAKER = breaker
+
+    def set_raise_errors(self, mybool: bool):
+        """ set_raise_errors
+
+            Raise TransportError and ResponseError instead of returning False when a request fails.
+            Error responses from the server are still returned (see get_last_error)
+
+            INPUTS
+            * mybool = (boolean) True|False
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_RAISE_ERRORS set to ' + str(mybool))
+        self.AMPACHE_RAISE_ERRORS = mybool
+
+    def set_rate_limiter(self, limiter):
+        """ set_rate_limiter
+
+            Limit how fast requests are sent and how many run at once (None disables the limits)
+
+            INPUTS
+            * limiter = (RateLimiter) object with limit() and async_limit() methods
+        """
+        if self.AMPACHE_DEBUG:
+            print('AMPACHE_RATE_LIMITER set to ' + type(limiter).__name__)
+        self.AMPACHE_RATE_LIMITER = limiter
+
+    def set_config_path(self, path: str):
+        """ set_config_path
+
+            Set the folder which contains your config to a folder instead of the working directory
+
+            INPUTS
+            * path = (string) ''
+        """
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.CONFIG_PATH = path
+
+    def get_config(self):
+        """ get_config
+
+            Read the config and set values from the json config file
+        """
+        output_file = os.path.join(self.CONFIG_PATH, self.CONFIG_FILE)
+        if os.path.isfile(output_file):
+            with open(output_file, 'r') as file:
+                config = json.load(file)
+            try:
+                self.AMPACHE_URL = config["ampache_url"]
+                self.AMPACHE_USER = config["ampache_user"]
+                self.AMPACHE_KEY = config["ampache_apikey"]
+                self.AMPACHE_BEARER_TOKEN = config["ampache_bearer_token"]
+                self.AMPACHE_SESSION = config["ampache_session"]
+                self.AMPACHE_API = config["api_format"]
+            except TypeError:
+                return False
+            except IndexError:
+                return False
+
+            return True
+        return False
+
+    def save_config(self):
+        """ save_config
+
+            Save config to a json file for use later
+        """
+        config = {
+            "ampache_url": self.AMPACHE_URL,
+            "ampache_user": self.AMPACHE_USER,
+            "ampache_apikey": self.AMPACHE_KEY,
+            "ampache_bearer_token": self.AMPACHE_BEARER_TOKEN,
+            "ampache_session": self.AMPACHE_SESSION,
+            "api_format": self.AMPACHE_API
+        }
+
+        if self.CONFIG_PATH and not os.path.isdir(self.CONFIG_PATH):
+            os.makedirs(self.CONFIG_PATH)
+        output_file = os.path.join(self.CONFIG_PATH, self.CONFIG_FILE)
+        with open(output_file, 'w') as file:
+            json.dump(config, file)
+
+    def test_result(self, result, title):
+        """ test_result
+
+            This function can be used to enable/disable debugging messages
+
+            INPUTS
+            * result = The response from the request
+            * title = (string) generally the function name that was called
+        """
+        if not result:
+            print("ampache." + title + f": {self.FAIL}FAIL{self.ENDC}")
+            return False
+        if 'Require: ' in result:
+            print(f"ampache." + title + f": {self.WARNING}WARNING{self.ENDC} " + result)
+            return True
+        if result:
+            print("ampache." + title + f": {self.OKGREEN}PASS{self.ENDC}")
+            return True
+        print("ampache." + title + f": {self.FAIL}FAIL{self.ENDC}")
+        return False
+
+    def return_data(self, data, api_format=None):
+        """ return_data
+
+            return json or xml data based on api format
+
+            INPUTS
+            * data       = (string)
+            * api_format = (string) 'xml'|'json' format of the request, AMPACHE_API by default //optional
+        """
+        # json format
+        if (api_format or self.AMPACHE_API) == 'json':
+            try:
+                json_data = data if isinstance(data, dict) else json.loads(data.decode('utf-8'))
+            except json.decoder.JSONDecodeError:
+                return False
+            return json_data
+        # xml format
+        else:
+            try:
+                tree = data if isinstance(data, ElementTree.Element) else ElementTree.fromstring(data.decode('utf-8') if isinstance(data, bytes) else data)
+            except ElementTree.ParseError:
+                return False
+            return tree
+
+    @staticmethod
+    def find_objects(data, attribute: str):
+        """ find_objects
+
+            Return the JSON value stored under attribute in the response, in its first item or
+            in the first item of that (older list shaped responses) or None when it isn't there
+
+            INPUTS
+            * data      = (mixed) JSON from the API
+            * attribute = (string) attribute you are searching for
+        """
+        node = data
+        for depth in range(3):
+            if isinstance(node, dict):
+                return node.get(attribute)
+            if not isinstance(node, list) or not node:
+                return None
+            node = node[0]
+        return None
+
+    def get_id_list(self, data, attribute: str):
+        """ get_id_list
+
+            return a list of id's from the data you've got from the api
+
+            INPUTS
+            * data      = (mixed) XML or JSON from the API
+            * attribute = (string) attribute you are searching for
+        """
+        if isinstance(data, ElementTree.Element):
+            return [child.attrib['id'] for child in data.findall(attribute) if 'id' in child.attrib]
+        if not data:
+            return list()
+        value = self.find_objects(data, attribute)
+        # index responses only list the id so plain values are only read from the attribute
+        read_values = value is not None
+        if value is None and isinstance(data, list):
+            # a list of objects
+            value = data
+        if isinstance(value, dict):
+            return [value['id']] if value.get('id') else list()
+        if not isinstance(value, list):
+            return list()
+        id_list = list()
+        for data_object in value:
+            if isinstance(data_object, dict):
+                if 'id' in data_object:
+                    id_list.append(data_object['id'])
+            elif isinstance(data_object, list):
+                if data_object and isinstance(data_object[0], dict) and 'id' in data_object[0]:
+                    id_list.append(data_object[0]['id'])
+            elif read_values and isinstance(data_object, (str, int)):
+                id_list.append(data_object)
+        return id_list
+
+    def get_object_list(self, data, field: str):
+        """ get_object_list
+
+            return a list of objects from the data matching your field string
+
+            INPUTS
+            * data  = (mixed) XML or JSON from the API
+            * field = (string) field you are searching for
+        """
+        if isinstance(data, ElementTree.Element):
+            return data.findall(field)
+        if not data:
+            return list()
+        value = self.find_objects(data, field)
+        if value is None:
+            # a single object
+            return [data]
+        if not isinstance(value, (dict, list)):
+            return list()
+        return list(value)
+
+    @staticmethod
+    def page_tag(method: str, params: dict):
+        """ page_tag
+
+            Return the object name used in the response of an offset/limit function
+
+            INPUTS
+            * method = (string) API function name e.g. 'songs'
+            * params = (dict) execute() parameters for the function
+        """
+        if method in PAGE_TYPED:
+            return params.get('object_type', 'song')
+        return PAGE_TAGS.get(method, method)
+
+    @staticmethod
+    def get_page(data, object_tag: str):
+        """ get_page
+
+            Return the list of objects in a single page of results.
+            Errors and empty responses return an empty list
+
+            INPUTS
+            * data       = (mixed) XML or JSON from the API
+            * object_tag = (string) object name in the response e.g. 'song'
+        """
+        if isinstance(data, ElementTree.Element):
+            return data.findall(object_tag)
+        if isinstance(data, dict):
+            data = data.get(object_tag, [])
+        if isinstance(data, dict):
+            # index with include returns children keyed by parent id
+            return list(data.items())
+        if isinstance(data, list):
+            return data
+        return []
+
+    def paginate(self, method: str, params=None, page_size: int = 100, object_tag=None):
+        """ paginate
+
+            Generator that walks an offset/limit function one page at a time and yields each object.
+            Only the current page is held in memory so you can iterate a whole catalog.
+            When a page fails the walk stops and get_last_error() returns the error
+            (it is raised when AMPACHE_RAISE_ERRORS is enabled)
+
+            INPUTS
+            * method     = (string) API function name e.g. 'songs', 'playlist_songs', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
+        """
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        offset = int(params.get('offset', 0))
+        remaining = int(params.get('limit', 0))
+        while True:
+            limit = min(page_size, remaining) if remaining else page_size
+            result, error = self.fetch_page(method, dict(params, offset=offset, limit=limit))
+            if error is not None:
+                self.set_page_error(error)
+                return
+            page = self.get_page(result, object_tag)
+            for data_object in page:
+                yield data_object
+            if remaining:
+                remaining = remaining - len(page)
+                if remaining <= 0:
+                    return
+            if len(page) < limit:
+                return
+            offset = offset + limit
+
+    def prefetch(self, method: str, params=None, page_size: int = 100, workers: int = 4, object_tag=None):
+        """ prefetch
+
+            Generator like paginate that keeps the next pages downloading on a thread pool.
+            Objects are yielded in order and at most `workers` pages are held in memory.
+            Closing the generator early cancels the pages that haven't started.
+            A failed page stops the walk like paginate
+
+            INPUTS
+            * method     = (string) API function name e.g. 'songs', 'index', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * workers    = (integer) number of pages in flight //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
+        """
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        offset = int(params.get('offset', 0))
+        remaining = int(params.get('limit', 0))
+        end = offset + remaining if remaining else 0
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        pending = collections.deque()
+
+        def submit(page_offset):
+            limit = min(page_size, end - page_offset) if end else page_size
+            if limit <= 0:
+                return False
+            pending.append((limit, executor.submit(self.fetch_page, method,
+                                                   dict(params, offset=page_offset, limit=limit))))
+            return True
+
+        next_offset = offset
+        try:
+            while len(pending) < workers and submit(next_offset):
+                next_offset = next_offset + page_size
+            while pending:
+                limit, future = pending.popleft()
+                result, error = future.result()
+                if error is not None:
+                    # the error was kept by the worker thread
+                    self.set_page_error(error)
+                    return
+                page = self.get_page(result, object_tag)
+                if len(page) < limit:
+                    yield from page
+                    return
+                if submit(next_offset):
+                    next_offset = next_offset + page_size
+                yield from page
+                page = None
+        finally:
+            for limit, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def fetch_page(self, method: str, params: dict):
+        """ fetch_page
+
+            Run one page for paginate or prefetch and return (response, error)
+            error is None when the page worked, not found errors (4704) are an empty page
+
+            INPUTS
+            * method = (string) API function name
+            * params = (dict) execute() parameters with offset and limit
+        """
+        self.transport_state.error = None
+        result = self.execute(method, params)
+        error = self.get_page_error(result, method)
+        if error is None:
+            self.transport_state.error = None
+        return result, error
+
+    def get_page_error(self, result, method: str):
+        """ get_page_error
+
+            Return the AmpacheError of a failed page or None
+
+            INPUTS
+            * result = (mixed) XML or JSON from the API, False when the request failed
+            * method = (string) API function name
+        """
+        if result is False:
+            return self.get_last_error() or AmpacheError('The request failed', method)
+        error_code = self.get_error_code(result)
+        if error_code and not error_code == '4704':
+            return ApiError(self.get_error_message(result), method, error_code)
+        return None
+
+    def set_page_error(self, error):
+        """ set_page_error
+
+            Keep the error of a failed page for get_last_error() in the thread reading the pages
+            and return False (or raise it when AMPACHE_RAISE_ERRORS is enabled)
+
+            INPUTS
+            * error = (AmpacheError) error of the page
+        """
+        self.transport_state.error = error
+        if self.AMPACHE_RAISE_ERRORS:
+            raise error
+        return False
+
+    def get_models(self, data, object_tag: str):
+        """ get_models
+
+            Generator that yields a typed object (Song, Album, Artist, ...) for each object in the response.
+            Objects are built one at a time and have the same attributes for XML and JSON
+
+            INPUTS
+            * data       = (mixed) XML or JSON from the API
+            * object_tag = (string) 'song'|'album'|'artist'|'playlist'|'podcast'|'podcast_episode'|'genre'|'video'
+        """
+        model = MODELS[object_tag]
+        if isinstance(data, dict) and 'id' in data:
+            # single object responses e.g. song, album
+            yield model.from_json(data)
+            return
+        for data_object in self.get_page(data, object_tag):
+            yield model.from_data(data_object)
+
+    def iter_models(self, method: str, params=None, page_size: int = 100, object_tag=None):
+        """ iter_models
+
+            Generator like paginate that yields typed objects instead of XML elements or JSON dicts
+
+            INPUTS
+            * method     = (string) API function name e.g. 'songs', 'playlist_songs', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
+        """
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        model = MODELS[object_tag]
+        for data_object in self.paginate(method, params, page_size, object_tag):
+            yield model.from_data(data_object)
+
+    @staticmethod
+    def plan_ids(object_ids, batch_size: int = 50):
+        """ plan_ids
+
+            Split ids into the cheapest set of requests for get_by_ids and return a list of (method, params)
+            * runs of at least batch_size ids that cover half or more of their range use one id range search
+            * other ids are searched batch_size at a time with 'or' id rules
+            * a single id left over uses the object function (song, album, artist)
+
+            INPUTS
+            * object_ids = (list) unique string ids
+            * batch_size = (integer) number of ids for each advanced_search //optional
+        """
+        numeric = sorted(int(object_id) for object_id in object_ids if object_id.isdigit())
+        leftover = [object_id for object_id in object_ids if not object_id.isdigit()]
+        plan = list()
+        run = list()
+        for object_id in numeric + [None]:
+            if object_id is not None and (not run or object_id - run[-1] <= 2):
+                run.append(object_id)
+                continue
+            if len(run) >= batch_size:
+                plan.append(('advanced_search', {'rules': [['id', 0, run[0]], ['id', 1, run[-1]]],
+                                                 'operator': 'and'}))
+            else:
+                leftover.extend(str(run_id) for run_id in run)
+            run = [object_id]
+        for start in range(0, len(leftover), batch_size):
+            batch = leftover[start:start + batch_size]
+            if len(batch) == 1:
+                plan.append((None, {'filter_id': batch[0]}))
+            else:
+                plan.append(('advanced_search', {'rules': [['id', 2, object_id] for object_id in batch],
+                                                 'operator': 'or'}))
+        return plan
+
+    def get_cached_object(self, object_type: str, object_id: str):
+        """ get_cached_object
+
+            Return the typed object from an AMPACHE_CACHE response for song/album/artist or None
+
+            INPUTS
+            * object_type = (string) 'song'|'album'|'artist'
+            * object_id   = (string) $object_id
+        """
+        if not self.AMPACHE_CACHE:
+            return None
+        ampache_url = self.get_server_url()
+        cache_key = self.AMPACHE_CACHE.get_key(ampache_url, {'action': object_type,
+                                                             'auth': self.AMPACHE_SESSION,
+                                                             'filter': object_id}, self.get_cache_user())
+        cached_response = self.AMPACHE_CACHE.get(cache_key) if cache_key else None
+        if cached_response is None:
+            return None
+        return next(self.get_models(self.return_data(cached_response, self.get_format(ampache_url)), object_type), None)
+
+    def get_by_ids(self, object_type: str, object_ids, workers: int = 8, batch_size: int = 50):
+        """ get_by_ids
+
+            Return a dict of typed objects keyed by id for a list of song, album or artist ids.
+            Duplicate ids are requested once, cached responses are reused and the rest are
+            fetched concurrently with the requests from plan_ids().
+            Ids that don't exist are missing from the dict.
+            Returns False when a request fails (see get_last_error)
+
+            INPUTS
+            * object_type = (string) 'song'|'album'|'artist'
+            * object_ids  = (list) $object_id list
+            * workers     = (integer) number of requests running at once //optional
+            * batch_size  = (integer) number of ids for each advanced_search //optional
+        """
+        results = dict()
+        missing = list()
+        for object_id in dict.fromkeys(str(object_id) for object_id in object_ids):
+            cached_object = self.get_cached_object(object_type, object_id)
+            if cached_object is None:
+                missing.append(object_id)
+            else:
+                results[object_id] = cached_object
+        wanted = set(missing)
+        model = MODELS[object_type]
+
+        def fetch(request):
+            method, params = request
+            if method is None:
+                result = self.execute(object_type, params)
+                return self.get_page_error(result, object_type) or list(self.get_models(result, object_type))
+            objects = [model.from_data(data_object) for data_object in
+                       self.paginate(method, dict(params, object_type=object_type), 500, object_type)]
+            return self.get_last_error() or objects
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for objects in executor.map(fetch, self.plan_ids(missing, batch_size)):
+                if isinstance(objects, AmpacheError):
+                    return self.set_page_error(objects)
+                for data_object in objects:
+                    if data_object.id in wanted:
+                        results[data_object.id] = data_object
+        return results
+
+    @staticmethod
+    def get_column_readers(object_tag: str, columns):
+        """ get_column_readers
+
+            Return [(column, typecode, reader), ...] to read numeric columns from XML or JSON objects
+            or False when a column isn't a number in the model for object_tag.
+            Missing integers are read as 0 and missing floats as nan
+
+            INPUTS
+            * object_tag = (string) 'song'|'album'|'artist'|'playlist'|'podcast'|'podcast_episode'|'genre'|'video'
+            * columns    = (tuple) model attributes e.g. ('time', 'bitrate', 'artist_id')
+        """
+        kinds = {'id': (int, False)}
+        for name, kind in MODELS[object_tag].FIELDS:
+            if kind == 'ref':
+                kinds[name + '_id'] = (int, name)
+            else:
+                kinds[name] = (kind, False)
+        readers = list()
+        for column in columns:
+            kind, child = kinds.get(column, (str, False))
+            if kind not in (int, float, bool):
+                return False
+            default = float('nan') if kind is float else 0
+
+            def reader(data_object, column=column, kind=kind, child=child, default=default):
+                if isinstance(data_object, ElementTree.Element):
+                    if column == 'id':
+                        value = data_object.get('id')
+                    elif child:
+                        element = data_object.find(child)
+                        value = None if element is None else element.get('id')
+                    else:
+                        value = data_object.findtext(column)
+                else:
+                    value = data_object.get(child or column)
+                    if child:
+                        value = value.get('id') if isinstance(value, dict) else None
+                value = model_value(value, kind)
+                return default if value is None else value
+
+            readers.append((column, 'd' if kind is float else 'q', reader))
+        return readers
+
+    @staticmethod
+    def get_column_arrays(arrays: dict):
+        """ get_column_arrays
+
+            Return the array.array columns as NumPy arrays (sharing the same memory) when NumPy is installed
+
+            INPUTS
+            * arrays = (dict) {column: array.array}
+        """
+        if numpy is None:
+            return arrays
+        return {column: numpy.frombuffer(values, dtype=numpy.float64 if values.typecode == 'd' else numpy.int64)
+                for column, values in arrays.items()}
+
+    def export_columns(self, method: str, params=None, columns=EXPORT_COLUMNS, page_size: int = 100,
+                       object_tag=None):
+        """ export_columns
+
+            Read every page of a function into typed columns in one pass and return {column: values}.
+            Values are NumPy arrays when NumPy is installed, otherwise array.array ('q' integers, 'd' floats)
+            Returns False when a column isn't a number for this object or a page fails (see get_last_error)
+
+            INPUTS
+            * method     = (string) API function name e.g. 'songs', 'stats', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * columns    = (tuple) numeric model attributes e.g. ('time', 'bitrate', 'year', 'artist_id') //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
+        """
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        readers = self.get_column_readers(object_tag, columns)
+        if readers is False:
+            return False
+        arrays = {column: array.array(typecode) for column, typecode, reader in readers}
+        for data_object in self.paginate(method, params, page_size, object_tag):
+            for column, typecode, reader in readers:
+                arrays[column].append(reader(data_object))
+        if self.get_last_error() is not None:
+            return False
+        return self.get_column_arrays(arrays)
+
+    def songs_by_ids(self, object_ids, workers: int = 8, batch_size: int = 50):
+        """ songs_by_ids
+
+            Return a dict of Song objects keyed by id (see get_by_ids)
+
+            INPUTS
+            * object_ids = (list) $song_id list
+            * workers    = (integer) number of requests running at once //optional
+            * batch_size = (integer) number of ids for each advanced_search //optional
+        """
+        return self.get_by_ids('song', object_ids, workers, batch_size)
+
+    def albums_by_ids(self, object_ids, workers: int = 8, batch_size: int = 50):
+        """ albums_by_ids
+
+            Return a dict of Album objects keyed by id (see get_by_ids)
+
+            INPUTS
+            * object_ids = (list) $album_id list
+            * workers    = (integer) number of requests running at once //optional
+            * batch_size = (integer) number of ids for each advanced_search //optional
+        """
+        return self.get_by_ids('album', object_ids, workers, batch_size)
+
+    def artists_by_ids(self, object_ids, workers: int = 8, batch_size: int = 50):
+        """ artists_by_ids
+
+            Return a dict of Artist objects keyed by id (see get_by_ids)
+
+            INPUTS
+            * object_ids = (list) $artist_id list
+            * workers    = (integer) number of requests running at once //optional
+            * batch_size = (integer) number of ids for each advanced_search //optional
+        """
+        return self.get_by_ids('artist', object_ids, workers, batch_size)
+
+    @staticmethod
+    def write_xml(xmlstr, filename: str):
+        """ write_xml
+
+            This function can be used to write your xml responses to a file.
+
+            INPUTS
+            * xmlstr   = (xml) xml to write to file
+            * filename = (string) path and filename (e.g. './ampache.xml')
+        """
+        if xmlstr:
+            text_file = open(filename, "w")
+            text_file.write(ElementTree.tostring(xmlstr).decode())
+            text_file.close()
+
+    @staticmethod
+    def get_message(data):
+        """ get_message
+
+            Return the string message text from the api response
+
+            INPUTS
+            * data = (mixed) XML or JSON from the API
+        """
+        message = data
+        print(data)
+        if 'error' in data:
+            try:
+                message = data['error']['message']
+            except TypeError:
+                message = data['error']
+            except KeyError:
+                message = data['error']['errorMessage']
+        if 'success' in data:
+            try:
+                message = data['success']['message']
+            except TypeError:
+                message = data['success']
+        return message
+
+    @staticmethod
+    def get_error_code(data):
+        """ get_error_code
+
+            Return the errorCode of an error response as a string or False when there is no error
+
+            INPUTS
+            * data = (mixed) XML or JSON from the API
+        """
+        if isinstance(data, dict):
+            if not 'error' in data:
+                return False
+            error = data['error']
+            if isinstance(error, dict):
+                return str(error.get('errorCode', error.get('code', '0')))
+            return '0'
+        if isinstance(data, ElementTree.Element):
+            error = data.find('error')
+            if error is None:
+                return False
+            return error.attrib.get('errorCode', error.attrib.get('code', '0'))
+        return False
+
+    @staticmethod
+    def get_error_message(data):
+        """ get_error_message
+
+            Return the errorMessage of an error response or an empty string
+
+            INPUTS
+            * data = (mixed) XML or JSON from the API
+        """
+        if isinstance(data, dict):
+            error = data.get('error')
+            if isinstance(error, dict):
+                return str(error.get('errorMessage', error.get('message', '')))
+            return str(error or '')
+        if isinstance(data, ElementTree.Element):
+            return data.findtext('error/errorMessage') or data.findtext('error') or ''
+        return ''
+
+    @staticmethod
+    def get_session_expire(data):
+        """ get_session_expire
+
+            Return the session_expire of a handshake or ping response as unix time or 0
+
+            INPUTS
+            * data = (mixed) XML or JSON from the API
+        """
+        if isinstance(data, dict):
+            session_expire = data.get('session_expire')
+        elif isinstance(data, ElementTree.Element):
+            session_expire = data.findtext('session_expire')
+        else:
+            return 0
+        try:
+            return int(datetime.datetime.fromisoformat(session_expire).timestamp())
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def get_hash(data):
+        """ get_hash
+
+            Return the md5 string from a playlist_hash response or False
+
+            INPUTS
+            * data = (mixed) XML or JSON from the API
+        """
+        if isinstance(data, dict):
+            return data.get('md5') or False
+        if isinstance(data, ElementTree.Element):
+            return data.findtext('md5') or False
+        return False
+
+    @staticmethod
+    def write_json(json_data: str, filename: str):
+        """ write_json
+
+            This function can be used to write your json responses to a file.
+
+            INPUTS
+            * json_data = (json) json to write to file
+            * filename  = (string) path and filename (e.g. './ampache.json')
+        """
+        if json_data:
+            text_file = open(filename, "w")
+            text_file.write(json.dumps(json_data))
+            text_file.close()
+
+    @staticmethod
+    def encrypt_password(password: str, current_time: int):
+        """ encrypt_password
+
+            This function can be used to encrypt your password into the accepted format.
+
+            INPUTS
+            * password = (string) unencrypted password string
+            * time     = (integer) linux time
+        """
+        key = hashlib.sha256(password.encode()).hexdigest()
+        passphrase = str(current_time) + key
+        sha_signature = hashlib.sha256(passphrase.encode()).hexdigest()
+        return sha_signature
+
+    @staticmethod
+    def encrypt_string(api_key: str, username: str):
+        """ encrypt_string
+
+            This function can be used to encrypt your apikey into the accepted format.
+
+            INPUTS
+            * api_key = (string) unencrypted apikey
+            * user    = (string) username
+        """
+        key = hashlib.sha256(api_key.encode()).hexdigest()
+        passphrase = username + key
+        sha_signature = hashlib.sha256(passphrase.encode()).hexdigest()
+        return sha_signature
+
+    def fetch_url(self, full_url: str, api_format: str, method: str, headers: dict = None):
+        """ fetch_url
+
+            This function is used to fetch the string results using the pooled transport.
+            Failed read requests are sent again (see set_retries) unless AMPACHE_CIRCUIT_BREAKER is open.
+            Returns False when the request fails and keeps the error for get_last_error()
+
+            INPUTS
+            * full_url   = (string) url to fetch
+            * api_format = (string) 'xml'|'json'
+            * method     = (string)
+            * headers    = (dict) optional HTTP headers
+        """
+        attempt = 0
+        while True:
+            if self.AMPACHE_CIRCUIT_BREAKER and not self.AMPACHE_CIRCUIT_BREAKER.allow():
+                return self.set_error(CircuitOpenError('Too many failed requests to the server', method))
+            try:
+                with self.limit_request(method):
+                    ampache_response = self.AMPACHE_TRANSPORT.get(full_url, headers).content
+            except (requests.exceptions.RequestException, ValueError) as exception:
+                error = self.get_transport_error(exception, method)
+            else:
+                self.transport_state.error = None
+                if self.AMPACHE_CIRCUIT_BREAKER:
+                    self.AMPACHE_CIRCUIT_BREAKER.success()
+                if self.AMPACHE_DEBUG:
+                    self.debug_response(full_url, api_format, method, ampache_response)
+                return ampache_response
+            if not self.is_retry(method, error, attempt):
+                return self.set_error(error)
+            time.sleep(self.get_retry_delay(attempt))
+            attempt += 1
+
+    def limit_request(self, action: str):
+        """ limit_request
+
+            Return the AMPACHE_RATE_LIMITER context manager that wraps each request
+
+            INPUTS
+            * action = (string) API function name
+        """
+        if self.AMPACHE_RATE_LIMITER:
+            return self.AMPACHE_RATE_LIMITER.limit(action)
+        return contextlib.nullcontext()
+
+    @staticmethod
+    def get_transport_error(exception, method: str):
+        """ get_transport_error
+
+            Return the TransportError (or RequestTimeout) for an exception raised by the transport
+
+            INPUTS
+            * exception = (Exception) requests, aiohttp or ValueError exception
+            * method    = (string) API function name
+        """
+        # requests raises ConnectionError for read timeouts when the adapter has a Retry
+        reason = getattr(exception.args[0], 'reason', None) if exception.args else None
+        if isinstance(exception, (requests.exceptions.Timeout, asyncio.TimeoutError)) or \
+                isinstance(reason, ReadTimeoutError):
+            return RequestTimeout(str(exception) or 'The server did not answer in time', method)
+        status = getattr(getattr(exception, 'response', None), 'status_code', None)
+        return TransportError(str(exception), method, status or getattr(exception, 'status', None))
+
+    def is_retry(self, method: str, error, attempt: int):
+        """ is_retry
+
+            Count a failed request for AMPACHE_CIRCUIT_BREAKER and return True when it should be sent again.
+            Only connection errors, timeouts and 5xx responses of functions that don't change data are retried
+
+            INPUTS
+            * method  = (string) API function name
+            * error   = (TransportError) error of the failed request
+            * attempt = (integer) retries sent so far
+        """
+        server_error = error.status is None or error.status >= 500
+        if self.AMPACHE_CIRCUIT_BREAKER:
+            if server_error:
+                self.AMPACHE_CIRCUIT_BREAKER.failure()
+            else:
+                self.AMPACHE_CIRCUIT_BREAKER.success()
+        return server_error and attempt < self.AMPACHE_RETRIES and not ResponseCache.is_write(method)
+
+    def get_retry_delay(self, attempt: int):
+        """ get_retry_delay
+
+            Return a random wait between 0 and AMPACHE_RETRY_BACKOFF * 2 ** attempt seconds (RETRY_MAX_DELAY at most)
+            so clients that failed together don't retry together
+
+            INPUTS
+            * attempt = (integer) retries sent so far
+        """
+        return random.uniform(0, min(RETRY_MAX_DELAY, self.AMPACHE_RETRY_BACKOFF * 2 ** attempt))
+
+    def get_last_error(self):
+        """ get_last_error
+
+            Return the AmpacheError of the last request sent by this thread or None when it worked.
+            TransportError and ResponseError mean the request failed, ApiError is an error response from the server
+        """
+        return getattr(self.transport_state, 'error', None)
+
+    def set_error(self, error):
+        """ set_error
+
+            Keep the error for get_last_error() and return False (or raise it when AMPACHE_RAISE_ERRORS is enabled)
+
+            INPUTS
+            * error = (AmpacheError) error of the request
+        """
+        self.transport_state.error = error
+        if self.AMPACHE_RAISE_ERRORS and not isinstance(error, ApiError):
+            raise error
+        return False
+
+    def check_result(self, result, api_method: str, api_format: str):
+        """ check_result
+
+            Keep a ResponseError or ApiError for get_last_error() and return the parsed response
+
+            INPUTS
+            * result     = (mixed) XML or JSON from the API, False when it couldn't be parsed
+            * api_method = (string) API function name
+            * api_format = (string) 'xml'|'json' format of the request
+        """
+        if result is False:
+            return self.set_error(ResponseError('The response is not valid ' + api_format, api_method))
+        error_code = self.get_error_code(result)
+        if error_code:
+            self.set_error(ApiError(self.get_error_message(result), api_method, error_code))
+        return result
+
+    def debug_response(self, full_url: str, api_format: str, method: str, ampache_response):
+        """ debug_response
+
+            Print the response and write it to DOCS_PATH when AMPACHE_DEBUG is enabled
+
+            INPUTS
+            * full_url         = (string) url that was fetched
+            * api_format       = (string) 'xml'|'json'
+            * method           = (string)
+            * ampache_response = (bytes) raw response body
+        """
+        docs_path = self.DOCS_PATH
+        if docs_path == "docs/":
+            docs_path = docs_path + api_format + "-responses/"
+        url_response = ampache_response.decode('utf-8')
+        print(url_response)
+        print(full_url)
+        try:
+            os.makedirs(docs_path, exist_ok=True)
+            text_file = open(docs_path + method + "." + api_format, "w", encoding="utf-8")
+            text_file.write(url_response)
+            text_file.close()
+        except FileNotFoundError:
+            pass
+
+    def request_url(self, ampache_url, data):
+        """ request_url
+
+            Return the full url and HTTP headers for an API call
+            The auth parameter is replaced by an Authorization header when using a bearer token
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+        """
+        headers = {}
+        if hasattr(self, 'AMPACHE_BEARER_TOKEN') and self.AMPACHE_BEARER_TOKEN:
+            headers['Authorization'] = f'Bearer {self.AMPACHE_BEARER_TOKEN}'
+            data.pop('auth', None)
+        full_url = ampache_url + '?' + encode_query(data)
+        return full_url, headers
+
+    def get_cache_user(self):
+        """ get_cache_user
+
+            Return the account AMPACHE_CACHE keys belong to, AMPACHE_USER or AMPACHE_BEARER_TOKEN
+            Without either the session of the request is used
+        """
+        return self.AMPACHE_USER or self.AMPACHE_BEARER_TOKEN
+
+    def get_server_url(self):
+        """ get_server_url
+
+            Return the server url for AMPACHE_URL and AMPACHE_API
+            e.g. 'https://music.com.au/server/xml.server.php'
+        """
+        server_url = self.server_url
+        ampache_url = self.AMPACHE_URL
+        api_format = self.AMPACHE_API
+        if not server_url[0] == ampache_url or not server_url[1] == api_format:
+            server_url = (ampache_url, api_format, ampache_url + '/server/' + api_format + '.server.php')
+            self.server_url = server_url
+        return server_url[2]
+
+    @staticmethod
+    def get_format(ampache_url: str):
+        """ get_format
+
+            Return the response format of a server url ('json' for json.server.php otherwise 'xml')
+            Requests use the format of their url so changing AMPACHE_API doesn't affect calls in flight
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+        """
+        return 'json' if ampache_url.split('?')[0].endswith('json.server.php') else 'xml'
+
+    def get_data(self, api_method: str, data: dict, optional=()):
+        """ get_data
+
+            Return the url parameters for an API call starting with action and auth
+            Keys in optional are left out when the value is empty (False, 0, '' or None)
+
+            INPUTS
+            * api_method = (string) API function name
+            * data       = (dict) url parameters
+            * optional   = (tuple) keys that are only sent with a value //optional
+        """
+        params = {'action': api_method, 'auth': self.AMPACHE_SESSION}
+        for key, value in data.items():
+            if value or not key in optional:
+                params[key] = value
+        return params
+
+    def api_request(self, api_method: str, data: dict, optional=()):
+        """ api_request
+
+            Send an API call to get_server_url() with the parameters from get_data()
+
+            INPUTS
+            * api_method = (string) API function name
+            * data       = (dict) url parameters
+            * optional   = (tuple) keys that are only sent with a value //optional
+        """
+        return self.get_request(self.get_server_url(), self.get_data(api_method, data, optional), api_method)
+
+    def get_request(self, ampache_url, data, api_method):
+        # only the first request of the function is streamed, not the ping or handshake of check_session
+        object_tag = getattr(self.stream_state, 'object_tag', None)
+        self.stream_state.object_tag = None
+        api_format = self.get_format(ampache_url)
+        self.transport_state.error = None
+        cache_key = False
+        if self.AMPACHE_CACHE and not object_tag:
+            cache_key = self.AMPACHE_CACHE.get_key(ampache_url, data, self.get_cache_user())
+        if cache_key:
+            cached_response = self.AMPACHE_CACHE.get(cache_key)
+            if cached_response is not None:
+                return self.return_data(cached_response, api_format)
+        if object_tag:
+            return self.stream_request(ampache_url, data, api_method, object_tag)
+        data = self.check_session(data, api_method)
+        full_url, headers = self.request_url(ampache_url, data)
+        request_response = self.fetch_url(full_url, api_format, api_method, headers)
+        if isinstance(request_response, bool):
+            return False
+        result = self.cache_response(cache_key, api_method, request_response, api_format)
+        if self.is_session_error(data, api_method, result) and self.refresh_session(data['auth']):
+            full_url, headers = self.request_url(ampache_url, dict(data, auth=self.AMPACHE_SESSION))
+            request_response = self.fetch_url(full_url, api_format, api_method, headers)
+            if isinstance(request_response, bool):
+                return False
+            result = self.cache_response(cache_key, api_method, request_response, api_format)
+        return self.check_result(result, api_method, api_format)
+
+    def check_session(self, data: dict, api_method: str):
+        """ check_session
+
+            Return the url parameters with the current session when AMPACHE_AUTO_HANDSHAKE is enabled
+            The session is refreshed first when it expires within AMPACHE_SESSION_MARGIN seconds
+
+            INPUTS
+            * data       = (dict) url parameters
+            * api_method = (string) API function name
+        """
+        if not self.uses_session(data, api_method):
+            return data
+        if self.is_session_expiring():
+            self.refresh_session(data['auth'], True)
+        if self.AMPACHE_SESSION and not data['auth'] == self.AMPACHE_SESSION:
+            return dict(data, auth=self.AMPACHE_SESSION)
+        return data
+
+    def uses_session(self, data: dict, api_method: str):
+        """ uses_session
+
+            Return True when AMPACHE_AUTO_HANDSHAKE manages the session auth for this request
+
+            INPUTS
+            * data       = (dict) url parameters
+            * api_method = (string) API function name
+        """
+        return (self.AMPACHE_AUTO_HANDSHAKE and 'auth' in data and not api_method in SESSION_SKIP_ACTIONS
+                and not self.AMPACHE_BEARER_TOKEN)
+
+    def is_session_expiring(self):
+        """ is_session_expiring
+
+            Return True when AMPACHE_SESSION_EXPIRE is less than AMPACHE_SESSION_MARGIN seconds away
+            (or half of the session time for short sessions)
+        """
+        if not self.AMPACHE_SESSION_EXPIRE:
+            return False
+        # short sessions are refreshed half way through so each session is used
+        margin = min(self.AMPACHE_SESSION_MARGIN, (self.AMPACHE_SESSION_EXPIRE - self.session_time) / 2)
+        return time.time() > self.AMPACHE_SESSION_EXPIRE - margin
+
+    def store_session_expire(self, data, handshake=False):
+        """ store_session_expire
+
+            Keep the session_expire of a handshake or ping response in AMPACHE_SESSION_EXPIRE
+
+            INPUTS
+            * data      = (mixed) XML or JSON from the API
+            * handshake = (boolean) the response started a new session //optional
+        """
+        self.AMPACHE_SESSION_EXPIRE = self.get_session_expire(data)
+        if handshake or not self.session_time:
+            self.session_time = time.time()
+
+    def is_session_error(self, data: dict, api_method: str, result):
+        """ is_session_error
+
+            Return True when the server rejected the session of a request (errorCode 4701)
+
+            INPUTS
+            * data       = (dict) url parameters that were sent
+            * api_method = (string) API function name
+            * result     = (mixed) XML or JSON from the API
+        """
+        return self.uses_session(data, api_method) and self.get_error_code(result) == '4701'
+
+    def refresh_session(self, auth, check_ping=False):
+        """ refresh_session
+
+            Return a working session after auth was rejected or is about to expire.
+            Only one thread sends the handshake, the others wait and use the new session
+
+            INPUTS
+            * auth       = (string) session auth that was used
+            * check_ping = (boolean) ping first as the server may have extended the session //optional
+        """
+        with self.session_lock:
+            if self.AMPACHE_SESSION and not auth == self.AMPACHE_SESSION:
+                return self.AMPACHE_SESSION
+            # another thread may have extended the session with a ping while this one waited
+            if check_ping and self.AMPACHE_SESSION and not self.is_session_expiring():
+                return self.AMPACHE_SESSION
+            if check_ping and self.AMPACHE_SESSION and self.ping(self.AMPACHE_URL, self.AMPACHE_SESSION):
+                if not self.is_session_expiring():
+                    return self.AMPACHE_SESSION
+            return self.renew_session()
+
+    def renew_session(self):
+        """ renew_session
+
+            Handshake again using the details of the last handshake
+            Password handshakes need the password in AMPACHE_KEY (see set_key)
+        """
+        if not self.session_handshake:
+            return False
+        ampache_url, ampache_api, ampache_user, version = self.session_handshake
+        if ampache_user:
+            if not self.AMPACHE_KEY:
+                return False
+            timestamp = int(time.time())
+            return self.handshake(ampache_url, self.encrypt_password(self.AMPACHE_KEY, timestamp),
+                                  ampache_user, timestamp, version)
+        return self.handshake(ampache_url, ampache_api, False, 0, version)
+
+    def cache_response(self, cache_key, api_method: str, request_response: bytes, api_format=None):
+        """ cache_response
+
+            Parse a response and keep it in AMPACHE_CACHE when it is not an error.
+            Responses from functions that change data empty the cache
+
+            INPUTS
+            * cache_key        = (string|boolean) key from AMPACHE_CACHE.get_key() or False
+            * api_method       = (string) API function name
+            * request_response = (bytes) raw response body
+            * api_format       = (string) 'xml'|'json' format of the request //optional
+        """
+        result = self.return_data(request_response, api_format)
+        if cache_key and result is not False and not self.get_error_code(result):
+            self.AMPACHE_CACHE.set(cache_key, api_method, request_response)
+        elif self.AMPACHE_CACHE:
+            self.AMPACHE_CACHE.invalidate(api_method)
+        return result
+
+    def revalidate_request(self, ampache_url, data, api_method, playlist_id):
+        """ revalidate_request
+
+            Call playlist_hash first and return the stored song list when the md5 hasn't changed.
+            Falls back to get_request for random lists, streamed responses or servers without playlist_hash.
+            Lists are stored per user (see get_cache_user) and a rejected session is refreshed like get_request
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * api_method  = (string) 'playlist_songs'|'smartlist_songs'
+            * playlist_id = (string) playlist_hash filter e.g. '4' or 'smart_5'
+        """
+        if not self.AMPACHE_REVALIDATE or 'random' in data or getattr(self.stream_state, 'object_tag', None):
+            return self.get_request(ampache_url, data, api_method)
+        md5 = self.get_hash(self.playlist_hash(playlist_id))
+        if not md5:
+            return self.get_request(ampache_url, data, api_method)
+        api_format = self.get_format(ampache_url)
+        store_key = self.get_store_key(ampache_url, data, api_method)
+        stored = self.get_stored_playlist(store_key)
+        if stored and stored[0] == md5:
+            return self.return_data(stored[1], api_format)
+        data = self.check_session(data, api_method)
+        full_url, headers = self.request_url(ampache_url, data)
+        request_response = self.fetch_url(full_url, api_format, api_method, headers)
+        if isinstance(request_response, bool):
+            return False
+        result = self.store_playlist(store_key, md5, request_response, api_format)
+        if self.is_session_error(data, api_method, result) and self.refresh_session(data['auth']):
+            full_url, headers = self.request_url(ampache_url, dict(data, auth=self.AMPACHE_SESSION))
+            request_response = self.fetch_url(full_url, api_format, api_method, headers)
+            if isinstance(request_response, bool):
+                return False
+            result = self.store_playlist(store_key, md5, request_response, api_format)
+        return self.check_result(result, api_method, api_format)
+
+    def get_store_key(self, ampache_url, data: dict, api_method: str):
+        """ get_store_key
+
+            Return the playlist_store key of a song list request, lists are kept per user like AMPACHE_CACHE
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * api_method  = (string) 'playlist_songs'|'smartlist_songs'
+        """
+        owner = self.get_cache_user() or data.get('auth', '')
+        return owner, ampache_url, api_method, str(data['filter']), data['offset'], data['limit']
+
+    def get_stored_playlist(self, store_key: tuple):
+        """ get_stored_playlist
+
+            Return the (md5, response) kept by store_playlist or None
+
+            INPUTS
+            * store_key = (tuple) key from get_store_key()
+        """
+        with self.playlist_lock:
+            stored = self.playlist_store.get(store_key)
+            if stored:
+                self.playlist_store.move_to_end(store_key)
+            return stored
+
+    def store_playlist(self, store_key: tuple, md5: str, request_response: bytes, api_format=None):
+        """ store_playlist
+
+            Parse a song list and keep it with the playlist md5 when it is not an error
+            The least recently used lists are dropped over AMPACHE_REVALIDATE_ENTRIES
+
+            INPUTS
+            * store_key        = (tuple) key from get_store_key()
+            * md5              = (string) playlist_hash of the list
+            * request_response = (bytes) raw response body
+            * api_format       = (string) 'xml'|'json' format of the request //optional
+        """
+        result = self.return_data(request_response, api_format)
+        if result is not False and not self.get_error_code(result):
+            with self.playlist_lock:
+                self.playlist_store[store_key] = (md5, request_response)
+                self.playlist_store.move_to_end(store_key)
+                while len(self.playlist_store) > self.AMPACHE_REVALIDATE_ENTRIES:
+                    self.playlist_store.popitem(last=False)
+        return result
+
+    def stream_request(self, ampache_url, data, api_method: str, object_tag: str):
+        """ stream_request
+
+            Generator that reads a response off the socket in AMPACHE_CHUNK_SIZE pieces
+            and yields each object as soon as it has been parsed.
+            A rejected session (errorCode 4701) is refreshed and the request sent again like get_request
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * api_method  = (string) API function name
+            * object_tag  = (string) object name in the response e.g. 'song'
+        """
+        self.transport_state.error = None
+        api_format = self.get_format(ampache_url)
+        errors = []
+
+        def on_error(result):
+            # error responses and invalid responses are kept like check_result does for other requests
+            errors.append(result)
+            self.check_result(False if result is None else result, api_method, api_format)
+
+        data = self.check_session(data, api_method)
+        full_url, headers = self.request_url(ampache_url, dict(data))
+        yield from self.stream_url(full_url, headers, api_method, object_tag, on_error)
+        # an error response has no objects so the request can be sent again with the new session
+        if errors and errors[0] is not None and self.is_session_error(data, api_method, errors[0]):
+            if self.refresh_session(data['auth']):
+                self.transport_state.error = None
+                full_url, headers = self.request_url(ampache_url, dict(data, auth=self.AMPACHE_SESSION))
+                yield from self.stream_url(full_url, headers, api_method, object_tag, on_error)
+
+    def stream_url(self, full_url: str, headers: dict, api_method: str, object_tag: str, on_error=None):
+        """ stream_url
+
+            Generator that fetches a url with a streamed response and yields each parsed object.
+            Uses AMPACHE_CIRCUIT_BREAKER and retries like fetch_url until the response starts,
+            a response that fails part way isn't sent again as objects have already been yielded
+
+            INPUTS
+            * full_url   = (string) url to fetch
+            * headers    = (dict) optional HTTP headers
+            * api_method = (string) API function name
+            * object_tag = (string) object name in the response e.g. 'song'
+            * on_error   = (function) passed to parse_xml_stream or parse_json_stream //optional
+        """
+        attempt = 0
+        while True:
+            if self.AMPACHE_CIRCUIT_BREAKER and not self.AMPACHE_CIRCUIT_BREAKER.allow():
+                self.set_error(CircuitOpenError('Too many failed requests to the server', api_method))
+                return
+            # the request keeps its AMPACHE_RATE_LIMITER slot until the response has been read
+            with self.limit_request(api_method):
+                try:
+                    result = self.AMPACHE_TRANSPORT.get(full_url, headers, True)
+                except (requests.exceptions.RequestException, ValueError) as exception:
+                    error = self.get_transport_error(exception, api_method)
+                else:
+                    if self.AMPACHE_CIRCUIT_BREAKER:
+                        self.AMPACHE_CIRCUIT_BREAKER.success()
+                    with result:
+                        chunks = result.iter_content(self.AMPACHE_CHUNK_SIZE)
+                        try:
+                            if self.get_format(full_url) == 'json':
+                                yield from self.parse_json_stream(chunks, object_tag, on_error)
+                            else:
+                                yield from self.parse_xml_stream(chunks, object_tag, on_error)
+                        except requests.exceptions.RequestException as exception:
+                            self.set_error(self.get_transport_error(exception, api_method))
+                    return
+            if not self.is_retry(api_method, error, attempt):
+                self.set_error(error)
+                return
+            time.sleep(self.get_retry_delay(attempt))
+            attempt += 1
+
+    @staticmethod
+    def parse_xml_stream(chunks, object_tag: str, on_error=None):
+        """ parse_xml_stream
+
+            Generator that incrementally parses XML and yields each child of <root> named object_tag.
+            Each object is removed from the tree once the next one is read so memory stays at one object
+
+            INPUTS
+            * chunks     = (iterable) bytes of the response
+            * object_tag = (string) object name in the response e.g. 'song'
+            * on_error   = (function) called with <root><error> for an error or None for an invalid response //optional
+        """
+        parser = ElementTree.XMLPullParser(events=('start', 'end'))
+        root = None
+        depth = 0
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+                for event, element in parser.read_events():
+                    if event == 'start':
+                        if root is None:
+                            root = element
+                        depth = depth + 1
+                        continue
+                    depth = depth - 1
+                    if depth == 1:
+                        if element.tag == object_tag:
+                            yield element
+                        elif element.tag == 'error' and on_error:
+                            error = ElementTree.Element(root.tag)
+                            error.append(element)
+                            on_error(error)
+                        root.clear()
+            parser.close()
+        except ElementTree.ParseError:
+            if on_error:
+                on_error(None)
+            return
+        # a valid XML page that isn't an API response (e.g. from a proxy) is invalid too
+        if on_error and not root.tag == 'root':
+            on_error(None)
+
+    @staticmethod
+    def parse_json_stream(chunks, object_tag: str, on_error=None):
+        """ parse_json_stream
+
+            Generator that incrementally parses JSON and yields each item of the object_tag list
+            (e.g. {"total_count": 2, "song": [{...}, {...}]}) or of a top level list.
+            Only the unparsed part of the response is kept in memory
+
+            INPUTS
+            * chunks     = (iterable) bytes of the response
+            * object_tag = (string) object name in the response e.g. 'song'
+            * on_error   = (function) called with {'error': ...} for an error or None for an invalid response //optional
+        """
+        chunks = iter(chunks)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        scanner = json.JSONDecoder()
+        text = ''
+        pos = 0
+        finished = False
+
+        def read_more(size=1):
+            # drop the parsed text and append at least size characters from the response
+            nonlocal text, pos, finished
+            parts = [text[pos:]]
+            length = len(parts[0])
+            target = length + size
+            while length < target and not finished:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    finished = True
+                    parts.append(decoder.decode(b'', True))
+                else:
+                    parts.append(decoder.decode(chunk))
+                length = length + len(parts[-1])
+            text = ''.join(parts)
+            pos = 0
+
+        def peek():
+            # skip whitespace and return the next character ('' at the end of the response)
+            nonlocal pos
+            while True:
+                while pos < len(text) and text[pos] in ' \t\n\r':
+                    pos = pos + 1
+                if pos < len(text):
+                    return text[pos]
+                if finished:
+                    return ''
+                read_more()
+
+        def read_value():
+            # a value is complete once another character follows it (or the response has ended)
+            nonlocal pos
+            while True:
+                peek()
+                try:
+                    value, end = scanner.raw_decode(text, pos)
+                    if end < len(text) or finished:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if finished:
+                        raise
+                # double the buffer before decoding again so large values stay linear
+                read_more(len(text) - pos)
+
+        try:
+            char = peek()
+            if char == '{':
+                pos = pos + 1
+                while True:
+                    # an object without object_tag or error (e.g. an unexpected response) is invalid
+                    if not peek() == '"':
+                        raise ValueError('object_tag not found')
+                    key = read_value()
+                    if not peek() == ':':
+                        raise ValueError('expected :')
+                    pos = pos + 1
+                    if key == object_tag and peek() == '[':
+                        break
+                    value = read_value()
+                    if key == object_tag:
+                        if isinstance(value, dict):
+                            # index with include returns children keyed by parent id
+                            yield from value.items()
+                        return
+                    if key == 'error' and on_error:
+                        on_error({'error': value})
+                        return
+                    if not peek() == ',':
+                        raise ValueError('object_tag not found')
+                    pos = pos + 1
+            elif not char == '[':
+                raise ValueError('expected an object or a list')
+            pos = pos + 1
+            while True:
+                char = peek()
+                if char == ']':
+                    return
+                if not char:
+                    raise ValueError('unexpected end of the list')
+                yield read_value()
+                if peek() == ']':
+                    return
+                if not peek() == ',':
+                    raise ValueError('expected , or ]')
+                pos = pos + 1
+        except ValueError:
+            # json.JSONDecodeError is a ValueError
+            if on_error:
+                on_error(None)
+
+    def iter_response(self, method: str, params=None, object_tag=None):
+        """ iter_response
+
+            Generator that runs an API function with a streamed response and yields each object
+            while the rest of the response is still downloading.
+            XML is parsed with XMLPullParser and processed elements are cleared from the tree,
+            JSON objects are decoded one at a time from the list in the response.
+
+            INPUTS
+            * method     = (string) API function name e.g. 'songs', 'index', 'advanced_search'
+            * params     = (dict) execute() parameters //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
+        """
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        self.stream_state.object_tag = object_tag
+        try:
+            result = self.execute(method, params)
+        finally:
+            self.stream_state.object_tag = None
+        if result:
+            yield from result
+
+    def get_file(self, ampache_url, data, destination, make_dirs=False, resume=False, progress=None):
+        """ get_file
+
+            Fetch a binary API response (stream, download, get_art) and write it to a file.
+            The body is streamed in AMPACHE_CHUNK_SIZE pieces to 'destination.part'
+            which is renamed to destination once complete and matches the size sent by the server.
+            Failed and incomplete transfers use the CircuitBreaker and retries (see set_retries),
+            a retry continues the part file with resume and starts the file again without it.
+            With resume a failed transfer keeps the part file and the next call continues from it.
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * destination = (string) full file path
+            * make_dirs   = (boolean) create the destination folder if missing //optional
+            * resume      = (boolean) continue 'destination.part' with an HTTP Range request //optional
+            * progress    = (function) called with (bytes_written, total_bytes) after each chunk //optional
+        """
+        if make_dirs:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+        elif not os.path.isdir(os.path.dirname(destination)):
+            return False
+        self.transport_state.error = None
+        data = self.check_session(data, data['action'])
+        full_url, headers = self.request_url(ampache_url, data)
+        part_file = destination + '.part'
+        attempt = 0
+        while True:
+            if self.AMPACHE_CIRCUIT_BREAKER and not self.AMPACHE_CIRCUIT_BREAKER.allow():
+                return self.discard_file(part_file, resume,
+                                         CircuitOpenError('Too many failed requests to the server', data['action']))
+            try:
+                with self.limit_request(data['action']):
+                    complete = self.AMPACHE_TRANSPORT.save(full_url, headers, part_file, self.AMPACHE_CHUNK_SIZE,
+                                                           resume, progress)
+            except (requests.exceptions.RequestException, ValueError) as exception:
+                error = self.get_transport_error(exception, data['action'])
+            except OSError as exception:
+                return self.discard_file(part_file, resume, AmpacheError(str(exception), data['action']))
+            else:
+                if complete:
+                    if self.AMPACHE_CIRCUIT_BREAKER:
+                        self.AMPACHE_CIRCUIT_BREAKER.success()
+                    os.replace(part_file, destination)
+                    return True
+                error = TransportError('The file is incomplete', data['action'])
+            # a retry continues the part file with resume, otherwise the file is written again
+            if not self.is_retry(data['action'], error, attempt):
+                return self.discard_file(part_file, resume, error)
+            time.sleep(self.get_retry_delay(attempt))
+            attempt += 1
+
+    def discard_file(self, part_file: str, resume: bool, error):
+        """ discard_file
+
+            Remove the part file of a failed get_file (unless it will be resumed) and return False
+
+            INPUTS
+            * part_file = (string) full path of 'destination.part'
+            * resume    = (boolean) keep the part file for the next call
+            * error     = (AmpacheError) error kept for get_last_error()
+        """
+        if not resume and os.path.isfile(part_file):
+            os.remove(part_file)
+        return self.set_error(error)
+
+    """
+    -------------
+    API FUNCTIONS
+    -------------
+    """
+
+    def handshake(self, ampache_url: str, ampache_api: str, ampache_user=False,
+                  timestamp: int = 0, version: str = '6.6.0'):
+        """ handshake
+            MINIMUM_API_VERSION=380001
+
+            This is the function that handles verifying a new handshake
+            Takes a timestamp, auth key, and username.
+
+            INPUTS
+            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
+            * ampache_api = (string) encrypted apikey OR password if using password auth
+            * user        = (string) username //optional
+            * timestamp   = (integer) UNIXTIME() //optional
+            * version     = (string) //optional
+        """
+        ampache_url, data, api_method = self.handshake_request(ampache_url, ampache_api, ampache_user,
+                                                               timestamp, version)
+        return self.handshake_response(self.get_request(ampache_url, data, api_method))
+
+    def handshake_request(self, ampache_url: str, ampache_api: str, ampache_user=False,
+                          timestamp: int = 0, version: str = '6.6.0'):
+        """ handshake_request
+
+            Set AMPACHE_URL and return the server url, parameters and method name for a handshake
+
+            INPUTS
+            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
+            * ampache_api = (string) encrypted apikey OR password if using password auth
+            * user        = (string) username //optional
+            * timestamp   = (integer) UNIXTIME() //optional
+            * version     = (string) //optional
+        """
+        self.AMPACHE_URL = ampache_url
+        self.session_handshake = (ampache_url, ampache_api, ampache_user, version)
+        if timestamp == 0:
+            timestamp = int(time.time())
+        ampache_url = self.get_server_url()
+        api_method = 'handshake'
+        data = {'action': api_method,
+                'auth': ampache_api,
+                'user': ampache_user,
+                'timestamp': str(timestamp),
+                'version': version}
+        if not ampache_user:
+            data.pop('user')
+        if not timestamp or not ampache_user:
+            data.pop('timestamp')
+        if not version:
+            data.pop('version')
+        return ampache_url, data, api_method
+
+    def handshake_response(self, ampache_response):
+        """ handshake_response
+
+            Store the server version and session auth from a handshake response and return the auth
+
+            INPUTS
+            * ampache_response = (mixed) XML or JSON from the API
+        """
+        self.AMPACHE_SESSION_EXPIRE = 0
+        if isinstance(ampache_response, bool):
+            return False
+        # json format
+        if isinstance(ampache_response, dict) or \
+                (self.AMPACHE_API == 'json' and not isinstance(ampache_response, ElementTree.Element)):
+            json_data = ampache_response if isinstance(ampache_response, dict) else json.loads(ampache_response.decode('utf-8'))
+            if 'api' in json_data:
+                self.AMPACHE_SERVER = json_data['api']
+            if 'auth' in json_data:
+                self.AMPACHE_SESSION = json_data['auth']
+                self.store_session_expire(json_data, True)
+                return json_data['auth']
+            else:
+                self.AMPACHE_SESSION = False
+                return False
+        # xml format
+        else:
+            try:
+                tree = ampache_response if isinstance(ampache_response, ElementTree.Element) else ElementTree.fromstring(ampache_response.decode('utf-8') if isinstance(ampache_response, bytes) else ampache_response)
+            except ElementTree.ParseError:
+                return False
+            try:
+                self.AMPACHE_SERVER = tree.find('api').text
+            except AttributeError:
+                pass
+            try:
+                token = tree.find('auth').text
+            except AttributeError:
+                token = False
+            self.AMPACHE_SESSION = token
+            if token:
+                self.store_session_expire(tree, True)
+            return token
+
+    def ping(self, ampache_url: str, ampache_api=False, version: str = '6.6.0'):
+        """ ping
+            MINIMUM_API_VERSION=380001
+
+            This can be called without being authenticated, it is useful for determining if what the status
+            of the server is, and what version it is running/compatible with
+
+            INPUTS
+            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
+            * ampache_api = (string) encrypted apikey //optional
+        """
+        ampache_url, data, api_method = self.ping_request(ampache_url, ampache_api, version)
+        return self.ping_response(ampache_url, ampache_api, self.get_request(ampache_url, data, api_method))
+
+    def ping_request(self, ampache_url: str, ampache_api=False, version: str = '6.6.0'):
+        """ ping_request
+
+            Return the server url, parameters and method name for a ping
+
+            INPUTS
+            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
+            * ampache_api = (string) encrypted apikey //optional
+        """
+        ampache_url = ampache_url + '/server/' + self.AMPACHE_API + '.server.php'
+        api_method = 'ping'
+        data = {'action': api_method,
+                'version': version,
+                'auth': ampache_api}
+        if not ampache_api:
+            data.pop('auth')
+        return ampache_url, data, api_method
+
+    def ping_response(self, ampache_url: str, ampache_api, ampache_response):
+        """ ping_response
+
+            Store the server version from a ping response and return the session when it is still valid
+
+            INPUTS
+            * ampache_url      = (string) server url that was pinged
+            * ampache_api      = (string) session auth that was sent
+            * ampache_response = (mixed) XML or JSON from the API
+        """
+        if isinstance(ampache_response, bool):
+            self.AMPACHE_SESSION = False
+            return False
+        # json format
+        if isinstance(ampache_response, dict) or \
+                (self.AMPACHE_API == 'json' and not isinstance(ampache_response, ElementTree.Element)):
+            json_data = ampache_response if isinstance(ampache_response, dict) else json.loads(ampache_response.decode('utf-8'))
+            if 'api' in json_data:
+                self.AMPACHE_SERVER = json_data['api']
+            if 'session_expire' in json_data:
+                if not self.AMPACHE_URL:
+                    self.AMPACHE_URL = ampache_url
+                self.AMPACHE_SESSION = ampache_api
+                self.store_session_expire(json_data)
+                return ampache_api
+            else:
+                self.AMPACHE_SESSION = False
+                return False
+        # xml format
+        else:
+            try:
+                tree = ampache_response if isinstance(ampache_response, ElementTree.Element) else ElementTree.fromstring(ampache_response.decode('utf-8') if isinstance(ampache_response, bytes) else ampache_response)
+            except ElementTree.ParseError:
+                return False
+            try:
+                self.AMPACHE_SERVER = tree.find('api').text
+            except AttributeError:
+                pass
+            try:
+                token = tree.find('session_expire').text
+                if token and not self.AMPACHE_URL:
+                    self.AMPACHE_URL = ampache_url
+                self.AMPACHE_SESSION = ampache_api
+                self.store_session_expire(tree)
+            except AttributeError:
+                return False
+            return ampache_api
+
+    def register(self, username, fullname, password, email):
+        """ register
+            MINIMUM_API_VERSION=6.0.0
+
+            Register a new user.
+            Requires the username, password and email.
+
+            INPUTS
+            * username = (string) $username
+            * fullname = (string) $fullname //optional
+            * password = (string) hash('sha256', $password)
+            * email    = (string) $email
+        """
+        ampache_url = self.get_server_url()
+        api_method = 'register'
+        data = {'action': api_method,
+                'username': username,
+                'fullname': fullname,
+                'password': password,
+                'email': email}
+        return self.get_request(ampache_url, data, api_method)
+
+    def lost_password(self, auth):
+        """ lost_password
+            MINIMUM_API_VERSION=6.1.0
+
+            Allows a non-admin user to reset their password without web access to the main site.
+            It requires a reset token hash using your username and email
+
+            INPUTS
+            * auth = (string) (
+                $username;
+                $key = hash('sha256', 'email');
+                auth = hash('sha256', $username . $key);
+              )
+        """
+        ampache_url = self.get_server_url()
+        api_method = 'lost_password'
+        data = {'action': api_method,
+                'auth': auth}
+        return self.get_request(ampache_url, data, api_method)
+
+    def goodbye(self):
+        """ goodbye
+            MINIMUM_API_VERSION=400001
+
+            Destroy session for ampache_api auth key.
+        """
+        return self.api_request('goodbye', {})
+
+    def url_to_song(self, url):
+        """ url_to_song
+            MINIMUM_API_VERSION=380001
+
+            This takes a url and returns the song object in question
+
+            INPUTS
+            * url = (string) Full Ampache URL from server, translates back into a song XML
+        """
+        data = {'url': url}
+        return self.api_request('url_to_song', data)
 
     def get_similar(self, object_type, filter_id: int, offset=0, limit=0):
         """ get_similar
             MINIMUM_API_VERSION=420000
 
-            Return similar artist id's or similar song ids compared to the input filter
+            Return similar artist id's or similar song ids compared to the input filter
+
+            INPUTS
+            * object_type = (string) 'song'|'album'|'artist'|'playlist'
+            * filter_id   = (integer) $artist_id or song_id
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+        """
+        data = {'type': object_type,
+                'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit)}
+        return self.api_request('get_similar', data)
+
+    def list(self, object_type, filter_str=False, exact=False, add=False, update=False,
+             offset=0, limit=0, sort=False, cond=False):
+        """ list
+            MINIMUM_API_VERSION=6.0.0
+
+            This takes a named array of objects and returning `id`, `name`, `prefix` and `basename`
+
+            INPUTS
+            * object_type = (string) 'song'|'album'|'artist'|'album_artist'|'playlist'
+            * filter_str  = (string) search the name of the object_type //optional
+            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * add         = (integer) UNIXTIME() //optional
+            * update      = (integer) UNIXTIME() //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'type': object_type,
+                'filter': filter_str,
+                'exact': exact,
+                'add': add,
+                'update': update,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('list', data, ('filter', 'exact', 'add', 'update', 'sort', 'cond'))
+
+    def browse(self, filter_str=False,
+               object_type=False, catalog=False, add=False, update=False,
+               offset=0, limit=0, sort=False, cond=False):
+        """ browse
+            MINIMUM_API_VERSION=6.0.0
+
+            Return children of a parent object in a folder traversal/browse style
+            If you don't send any parameters you'll get a catalog list (the 'root' path)
+
+            INPUTS
+            * filter_str  = (string) object_id //optional
+            * object_type = (string) 'root', 'catalog', 'artist', 'album', 'podcast' // optional
+            * catalog     = (integer) catalog ID you are browsing
+            * add         = Api::set_filter(date) //optional
+            * update      = Api::set_filter(date) //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_str,
+                'type': object_type,
+                'catalog': catalog,
+                'add': add,
+                'update': update,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('browse', data, ('filter', 'type', 'catalog', 'add', 'update', 'sort', 'cond'))
+
+    def index(self, object_type, filter_str=False, exact=False, add=False, update=False,
+              include=False, offset=0, limit=0, hide_search=False, sort=False, cond=False):
+        """ index
+            MINIMUM_API_VERSION=400001
+
+            This takes a collection of inputs and return ID's for the object type
+            Add 'include' to include child objects
+
+            INPUTS
+            * object_type = (string) 'catalog', 'song', 'album', 'artist', 'album_artist', 'song_artist', 'playlist', 'podcast', 'podcast_episode', 'share', 'video', 'live_stream'
+            * filter_str  = (string) search the name of the object_type //optional
+            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * add         = (integer) UNIXTIME() //optional
+            * update      = (integer) UNIXTIME() //optional
+            * include     = (integer) 0,1 include songs if available for that object //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * hide_search = (integer) 0,1, if true do not include searches/smartlists in the result //optional
+            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        if bool(include):
+            include = 1
+        data = {'type': object_type,
+                'filter': filter_str,
+                'exact': exact,
+                'add': add,
+                'update': update,
+                'include': include,
+                'offset': str(offset),
+                'limit': str(limit),
+                'hide_search': hide_search,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('index', data, ('filter', 'exact', 'add', 'update', 'include', 'hide_search', 'sort',
+                                                'cond'))
+
+    def get_indexes(self, object_type, filter_str=False, exact=False, add=False,
+                    update=False, include=False, offset=0, limit=0, sort=False, cond=False):
+        """ get_indexes
+            MINIMUM_API_VERSION=400001
+
+            This takes a collection of inputs and returns ID + name for the object type
+
+            INPUTS
+            * object_type = (string) 'catalog'|'album_artist'|'song_artist'|'song'|'album'|'artist'|'album_artist'|'playlist'
+            * filter_str  = (string) search the name of the object_type //optional
+            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * add         = (integer) UNIXTIME() //optional
+            * update      = (integer) UNIXTIME() //optional
+            * include     = (integer) 0,1 include songs if available for that object //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        if bool(include):
+            include = 1
+        data = {'type': object_type,
+                'filter': filter_str,
+                'exact': exact,
+                'add': add,
+                'update': update,
+                'include': include,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('get_indexes', data, ('filter', 'exact', 'add', 'update', 'include', 'sort', 'cond'))
+
+    def artists(self, filter_str=False, add=False, update=False,
+                offset=0, limit=0, include=False, album_artist=False, sort=False, cond=False):
+        """ artists
+            MINIMUM_API_VERSION=380001
+
+            This takes a collection of inputs and returns artist objects.
+
+            INPUTS
+            * filter_str   = (string) search the name of an artist //optional
+            * add          = (integer) UNIXTIME() //optional
+            * update       = (integer) UNIXTIME() //optional
+            * offset       = (integer) //optional
+            * limit        = (integer) //optional
+            * include      = (string) 'albums', 'songs' //optional
+            * album_artist = (boolean) 0,1 if true filter for album artists only //optional
+            * cond         = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort         = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        if bool(include) and not isinstance(include, str):
+            include = 'albums,songs'
+        data = {'filter': filter_str,
+                'add': add,
+                'update': update,
+                'offset': str(offset),
+                'limit': str(limit),
+                'include': include,
+                'album_artist': album_artist,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('artists', data, ('filter', 'add', 'update', 'include', 'album_artist', 'sort', 'cond'))
+
+    def artist(self, filter_id: int, include=False):
+        """ artist
+            MINIMUM_API_VERSION=380001
+
+            This returns a single artist based on the UID of said artist
+
+            INPUTS
+            * filter_id   = (integer) $artist_id
+            * include     = (string) 'albums', 'songs' //optional
+        """
+        if bool(include) and not isinstance(include, str):
+            include = 'albums,songs'
+        data = {'filter': filter_id,
+                'include': include}
+        return self.api_request('artist', data, ('include',))
+
+    def artist_albums(self, filter_id: int, offset=0, limit=0, album_artist=False,
+                      sort=False, cond=False):
+        """ artist_albums
+            MINIMUM_API_VERSION=380001
+
+            This returns the albums of an artist
+
+            INPUTS
+            * filter_id    = (integer) $artist_id
+            * offset       = (integer) //optional
+            * limit        = (integer) //optional
+            * album_artist = (integer) 0,1, if true return albums where the UID is an album_artist of the object //optional
+            * cond         = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort         = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
+                'album_artist': album_artist,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('artist_albums', data, ('album_artist', 'sort', 'cond'))
+
+    def artist_songs(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ artist_songs
+            MINIMUM_API_VERSION=380001
+
+            This returns the songs of the specified artist
+
+            INPUTS
+            * filter_id = (integer) $artist_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('artist_songs', data, ('sort', 'cond'))
+
+    def albums(self, filter_str=False,
+               exact=False, add=False, update=False, offset=0, limit=0,
+               include=False, sort=False, cond=False):
+        """ albums
+            MINIMUM_API_VERSION=380001
+
+            This returns albums based on the provided search filters
+
+            INPUTS
+            * filter_str = (string) search the name of an album //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * add        = (integer) UNIXTIME() //optional
+            * update     = (integer) UNIXTIME() //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * include    = (string) 'songs' //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        if bool(include) and not isinstance(include, str):
+            include = 'songs'
+        data = {'filter': filter_str,
+                'exact': exact,
+                'add': add,
+                'update': update,
+                'offset': str(offset),
+                'limit': str(limit),
+                'include': include,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('albums', data, ('filter', 'exact', 'add', 'update', 'include', 'sort', 'cond'))
+
+    def album(self, filter_id: int, include=False):
+        """ album
+            MINIMUM_API_VERSION=380001
+
+            This returns a single album based on the UID provided
+
+            INPUTS
+            * filter_id   = (integer) $album_id
+            * include     = (string) 'songs' //optional
+        """
+        if bool(include) and not isinstance(include, str):
+            include = 'songs'
+        data = {'filter': filter_id,
+                'include': include}
+        return self.api_request('album', data, ('include',))
+
+    def album_songs(self, filter_id: int, offset=0, limit=0,
+                    exact=False, sort=False, cond=False):
+        """ album_songs
+            MINIMUM_API_VERSION=380001
+
+            This returns the songs of a specified album
+
+            INPUTS
+            * filter_id = (integer) $album_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * exact     = (integer) 0,1, if true don't group songs from different disks //optional (IGNORED IN API6)
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        if bool(exact):
+            exact = 1
+        else:
+            exact = 0
+        data = {'filter': filter_id,
+                'exact': exact,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('album_songs', data, ('exact', 'sort', 'cond'))
+
+    def genres(self, filter_str=False,
+               exact=False, offset=0, limit=0, sort=False, cond=False):
+        """ genres
+            MINIMUM_API_VERSION=380001
+
+            This returns the genres (Tags) based on the specified filter
+
+            INPUTS
+            * filter_str = (string) search the name of a genre //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_str,
+                'exact': exact,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('genres', data, ('filter', 'exact', 'sort', 'cond'))
+
+    def genre(self, filter_id: int):
+        """ genre
+            MINIMUM_API_VERSION=380001
+
+            This returns a single genre based on UID
+
+            INPUTS
+            * filter_id = (integer) $genre_id
+        """
+        data = {'filter': filter_id}
+        return self.api_request('genre', data)
+
+    def genre_artists(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ genre_artists
+            MINIMUM_API_VERSION=380001
+
+            This returns the artists associated with the genre in question as defined by the UID
+
+            INPUTS
+            * filter_id = (integer) $genre_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('genre_artists', data, ('sort', 'cond'))
+
+    def genre_albums(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ genre_albums
+            MINIMUM_API_VERSION=380001
+
+            This returns the albums associated with the genre in question
+
+            INPUTS
+            * filter_id = (integer) $genre_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('genre_albums', data, ('sort', 'cond'))
+
+    def genre_songs(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ genre_songs
+            MINIMUM_API_VERSION=380001
+
+            returns the songs for this genre
+
+            INPUTS
+            * filter_id = (integer) $genre_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('genre_songs', data, ('sort', 'cond'))
+
+    def songs(self, filter_str=False, exact=False, add=False, update=False,
+              offset=0, limit=0, sort=False, cond=False):
+        """ songs
+            MINIMUM_API_VERSION=380001
+
+            Returns songs based on the specified filter_str
+
+            INPUTS
+            * filter_str = (string) search the name of a song //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * add        = (integer) UNIXTIME() //optional
+            * update     = (integer) UNIXTIME() //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'exact': exact,
+                'add': add,
+                'update': update,
+                'filter': filter_str,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('songs', data, ('exact', 'add', 'update', 'filter', 'sort', 'cond'))
+
+    def song(self, filter_id: int):
+        """ song
+            MINIMUM_API_VERSION=380001
+
+            returns a single song
+
+            INPUTS
+            * filter_id  = (integer) $song_id
+        """
+        data = {'filter': filter_id}
+        return self.api_request('song', data)
+
+    def song_delete(self, filter_id: int):
+        """ song_delete
+            MINIMUM_API_VERSION=5.0.0
+
+            Delete an existing song.
+
+            INPUTS
+            * filter_id   = (string) UID of song to delete
+        """
+        data = {'filter': filter_id}
+        return self.api_request('song_delete', data)
+
+    def song_tags(self, filter_id: int):
+        """ song_tags
+            MINIMUM_API_VERSION=7.5.0
+
+            Get the full song file tags using VaInfo
+            This is used to get tags for remote catalogs to allow maximum data to be returned
+
+            INPUTS
+            * filter_id   = (string) UID of song to fetch
+        """
+        data = {'filter': filter_id}
+        return self.api_request('song_tags', data)
+
+    def user_playlists(self, filter_str=False, exact=False, offset=0, limit=0,
+                       sort=False, cond=False, include=False):
+        """ user_playlists
+            MINIMUM_API_VERSION=6.3.0
+
+            This returns playlists based on the specified filter (Does not include searches / smartlists)
+
+            INPUTS
+            * filter_str = (string) search the name of a playlist //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * include    = (integer) 0,1, if true include playlist contents
+        """
+        data = {'filter': filter_str,
+                'exact': exact,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond,
+                'include': include}
+        return self.api_request('user_playlists', data, ('filter', 'exact', 'sort', 'cond', 'include'))
+
+    def user_smartlists(self, filter_str=False, exact=False, offset=0, limit=0,
+                        sort=False, cond=False, include=False):
+        """ user_smartlists
+            MINIMUM_API_VERSION=6.3.0
+
+            This returns smartlists (searches) based on the specified filter (Does not include playlists)
+
+            INPUTS
+            * filter_str = (string) search the name of a playlist //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * include    = (integer) 0,1, if true include playlist contents
+        """
+        data = {'filter': filter_str,
+                'exact': exact,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond,
+                'include': include}
+        return self.api_request('user_smartlists', data, ('filter', 'exact', 'sort', 'cond', 'include'))
+
+    def playlists(self, filter_str=False, exact=False, offset=0, limit=0, hide_search=False,
+                  show_dupes=False, include=False, sort=False, cond=False):
+        """ playlists
+            MINIMUM_API_VERSION=380001
+
+            This returns playlists based on the specified filter
+
+            INPUTS
+            * filter_str  = (string) search the name of a playlist //optional
+            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * hide_search = (integer) 0,1, if true do not include searches/smartlists in the result //optional
+            * show_dupes  = (integer) 0,1, if true ignore 'api_hide_dupe_searches' setting //optional
+            * include     = (integer) 0,1, if true include the objects in the playlist //optional
+            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_str,
+                'exact': exact,
+                'offset': str(offset),
+                'limit': str(limit),
+                'hide_search': hide_search,
+                'show_dupes': show_dupes,
+                'include': include,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('playlists', data, ('filter', 'exact', 'hide_search', 'show_dupes', 'include', 'sort',
+                                                    'cond'))
+
+    def playlist(self, filter_id: int):
+        """ playlist
+            MINIMUM_API_VERSION=380001
+
+            This returns a single playlist
+
+            INPUTS
+            * filter_id  = (integer) $playlist_id
+        """
+        data = {'filter': filter_id}
+        return self.api_request('playlist', data)
+
+    def playlist_hash(self, filter_id: int):
+        """ playlist_hash
+            MINIMUM_API_VERSION=6.6.0
+
+            his returns the md5 hash for the songs in a playlist
+
+            INPUTS
+            filter_id = (string) UID of playlist
+        """
+        data = {'filter': filter_id}
+        return self.api_request('playlist_hash', data)
+
+    def playlist_songs(self, filter_id: int, random=False, offset=0, limit=0):
+        """ playlist_songs
+            MINIMUM_API_VERSION=380001
+
+            This returns the songs for a playlist
+            When AMPACHE_REVALIDATE is enabled the list is only downloaded again when playlist_hash changes
+
+            INPUTS
+            * filter_id   = (integer) $playlist_id
+            * random      = (integer) 0,1, if true get random songs using limit //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+        """
+        ampache_url = self.get_server_url()
+        api_method = 'playlist_songs'
+        data = {'filter': filter_id,
+                'random': random,
+                'offset': str(offset),
+                'limit': str(limit)}
+        data = self.get_data(api_method, data, ('random',))
+        return self.revalidate_request(ampache_url, data, api_method, str(filter_id))
+
+    def playlist_create(self, playlist_name, playlist_type):
+        """ playlist_create
+            MINIMUM_API_VERSION=380001
+
+            This create a new playlist and return it
+
+            INPUTS
+            * playlist_name = (string)
+            * playlist_type = (string) public | private
+        """
+        data = {'name': playlist_name,
+                'type': playlist_type}
+        return self.api_request('playlist_create', data)
+
+    def playlist_edit(self, filter_id: int, playlist_name=False,
+                      playlist_type=False, owner=False, items=False, tracks=False):
+        """ playlist_edit
+            MINIMUM_API_VERSION=400001
+
+            This modifies name and type of a playlist
+
+            INPUTS
+            * filter_id     = (integer)
+            * playlist_name = (string) playlist name //optional
+            * playlist_type = (string) 'public'|'private' //optional
+            * owner         = (string) Change playlist owner to the user id (-1 = System playlist) //optional
+            * items         = (string) comma-separated song_id's (replaces existing items with a new id) //optional
+            * tracks        = (string) comma-separated playlisttrack numbers matched to 'items' in order //optional
+        """
+        data = {'filter': filter_id,
+                'name': playlist_name,
+                'type': playlist_type,
+                'owner': owner,
+                'items': items,
+                'tracks': tracks}
+        return self.api_request('playlist_edit', data, ('name', 'type', 'owner', 'items', 'tracks'))
+
+    def playlist_delete(self, filter_id: int):
+        """ playlist_delete
+            MINIMUM_API_VERSION=380001
+
+            This deletes a playlist
+
+            INPUTS
+            * filter_id   = (integer) $playlist_id
+        """
+        data = {'filter': filter_id}
+        return self.api_request('playlist_delete', data)
+
+    def playlist_add(self, filter_id: int, object_id: int, object_type: str):
+        """ playlist_add
+            MINIMUM_API_VERSION=6.3.0
+
+            This adds a song to a playlist, allowing different song parent types
+
+            INPUTS
+            * filter = (int) UID of playlist
+            * id     = (int) $object_id
+            * type   = (string) 'song', 'album', 'artist', 'playlist'
+        """
+        data = {'filter': filter_id,
+                'id': object_id,
+                'type': object_type}
+        return self.api_request('playlist_add', data)
+
+    def playlist_add_song(self, filter_id: int, song_id, check=False):
+        """ playlist_add_song
+            MINIMUM_API_VERSION=380001
+            CHANGED_IN_API_VERSION=400003
+
+            This adds a song to a playlist.
+            Added duplicate checks in 400003
+
+            INPUTS
+            * filter_id   = (integer) $playlist_id
+            * song_id     = (integer) $song_id
+            * check       = (boolean|integer) (True,False | 0|1) Check for duplicates //optional
+        """
+        if bool(check):
+            check = 1
+        else:
+            check = 0
+        data = {'song': song_id,
+                'filter': filter_id,
+                'check': check}
+        return self.api_request('playlist_add_song', data)
+
+    def playlist_remove_song(self, filter_id: int,
+                             song_id=False, track=False):
+        """ playlist_remove_song
+            MINIMUM_API_VERSION=380001
+            CHANGED_IN_API_VERSION=400001
+
+            This removes a song from a playlist. Previous versions required 'track' instead of 'song'.
+
+            INPUTS
+            * filter_id   = (integer) $playlist_id
+            * song_id     = (integer) $song_id //optional
+            * track       = (integer) $playlist_track number //optional
+        """
+        data = {'filter': filter_id,
+                'song': song_id,
+                'track': track}
+        return self.api_request('playlist_remove_song', data, ('song', 'track'))
+
+    def playlist_generate(self, mode='random',
+                          filter_str=False, album_id=False, artist_id=False, flagged=False,
+                          list_format='song', offset=0, limit=0):
+        """ playlist_generate
+            MINIMUM_API_VERSION=400001
+            CHANGED_IN_API_VERSION=400002
+
+            Get a list of song XML, indexes or id's based on some simple search criteria =
+            'recent' will search for tracks played after 'Popular Threshold' days
+            'forgotten' will search for tracks played before 'Popular Threshold' days
+            'unplayed' added in 400002 for searching unplayed tracks
+
+            INPUTS
+            * mode        = (string) 'recent', 'forgotten', 'unplayed', 'random' (default = 'random') //optional
+            * filter_str  = (string) string LIKE matched to song title //optional
+            * album_id    = (integer) $album_id //optional
+            * artist_id   = (integer) $artist_id //optional
+            * flagged     = (integer) get flagged songs only 0, 1 (default=0) //optional
+            * list_format = (string) 'song', 'index','id' (default = 'song') //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+        """
+        data = {'mode': mode,
+                'filter': filter_str,
+                'album': album_id,
+                'artist': artist_id,
+                'flag': flagged,
+                'format': list_format,
+                'offset': offset,
+                'limit': limit}
+        return self.api_request('playlist_generate', data, ('filter', 'album', 'artist', 'flag'))
+
+    def smartlists(self, filter_str=False, exact=False, offset=0, limit=0, include=False, sort=False, cond=False):
+        """ smartlists
+            MINIMUM_API_VERSION=380001
+
+            This returns smartlists based on the specified filter
+
+            INPUTS
+            * filter_str  = (string) search the name of a smartlist //optional
+            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * include     = (integer) 0,1, if true include the objects in the smartlist //optional
+            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_str,
+                'exact': exact,
+                'offset': str(offset),
+                'limit': str(limit),
+                'include': include,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('smartlists', data, ('filter', 'exact', 'include', 'sort', 'cond'))
+
+    def smartlist(self, filter_id: int):
+        """ smartlist
+            MINIMUM_API_VERSION=380001
+
+            This returns a single smartlist
+
+            INPUTS
+            * filter_id  = (integer) $smartlist_id
+        """
+        data = {'filter': filter_id}
+        return self.api_request('smartlist', data)
+
+    def smartlist_songs(self, filter_id: int, random=False, offset=0, limit=0):
+        """ smartlist_songs
+            MINIMUM_API_VERSION=380001
+
+            This returns the songs for a smartlist
+            When AMPACHE_REVALIDATE is enabled the list is only downloaded again when playlist_hash changes
+
+            INPUTS
+            * filter_id   = (integer) $smartlist_id
+            * random      = (integer) 0,1, if true get random songs using limit //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+        """
+        ampache_url = self.get_server_url()
+        api_method = 'smartlist_songs'
+        data = {'filter': filter_id,
+                'random': random,
+                'offset': str(offset),
+                'limit': str(limit)}
+        data = self.get_data(api_method, data, ('random',))
+        playlist_id = str(filter_id)
+        if not playlist_id.startswith('smart_'):
+            playlist_id = 'smart_' + playlist_id
+        return self.revalidate_request(ampache_url, data, api_method, playlist_id)
+
+    def smartlist_delete(self, filter_id: int):
+        """ smartlist_delete
+            MINIMUM_API_VERSION=380001
+
+            This deletes a smartlist
+
+            INPUTS
+            * filter_id   = (integer) $smartlist_id
+        """
+        data = {'filter': filter_id}
+        return self.api_request('smartlist_delete', data)
+
+    def shares(self, filter_str=False,
+               exact=False, offset=0, limit=0, sort=False, cond=False):
+        """ shares
+            MINIMUM_API_VERSION=420000
+
+            INPUTS
+            * filter_str = (string) search the name of a share //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_str,
+                'exact': exact,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('shares', data, ('filter', 'exact', 'sort', 'cond'))
+
+    def share(self, filter_id: int):
+        """ share
+            MINIMUM_API_VERSION=420000
+
+            Return shares by UID
+
+            INPUTS
+            * filter_id   = (integer) UID of Share
+        """
+        data = {'filter': filter_id}
+        return self.api_request('share', data)
+
+    def share_create(self, filter_id: int, object_type,
+                     description=False, expires=False):
+        """ share_create
+            MINIMUM_API_VERSION=420000
+
+            Create a public url that can be used by anyone to stream media.
+            Takes the file id with optional description and expires parameters.
+
+           INPUTS
+            * filter_id   = (integer) $object_id
+            * object_type = (string) object_type ('song', 'album', 'artist')
+            * description = (string) description (will be filled for you if empty) //optional
+            * expires     = (integer) days to keep active //optional
+        """
+        data = {'filter': filter_id,
+                'type': object_type,
+                'description': description,
+                'expires': expires}
+        return self.api_request('share_create', data, ('description', 'expires'))
+
+    def share_edit(self, filter_id: int, can_stream=False, can_download=False,
+                   expires=False, description=False):
+        """ share_edit
+            MINIMUM_API_VERSION=420000
+
+            Update the description and/or expiration date for an existing share.
+            Takes the share id to update with optional description and expires parameters.
+
+            INPUT
+            * filter_id    = (integer) UID of Share
+            * can_stream   = (boolean) 0,1 //optional
+            * can_download = (boolean) 0,1 //optional
+            * expires      = (integer) number of whole days before expiry //optional
+            * description  = (string) update description //optional
+        """
+        data = {'filter': filter_id,
+                'stream': can_stream,
+                'download': can_download,
+                'expires': expires,
+                'description': description}
+        return self.api_request('share_edit', data, ('stream', 'download', 'expires', 'description'))
+
+    def share_delete(self, filter_id: int):
+        """ share_delete
+            MINIMUM_API_VERSION=420000
+
+            Delete an existing share.
+
+            INPUT
+            * filter_id   = (integer) UID of Share to delete
+        """
+        data = {'filter': filter_id}
+        return self.api_request('share_delete', data)
+
+    def catalogs(self, filter_str=False, offset=0, limit=0, sort=False, cond=False):
+        """ catalogs
+            MINIMUM_API_VERSION=420000
+
+            INPUTS
+            * filter_str = (string) search the name of a catalog //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_str,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('catalogs', data, ('filter', 'sort', 'cond'))
+
+    def catalog(self, filter_id: int, offset=0, limit=0):
+        """ catalog
+            MINIMUM_API_VERSION=420000
+
+            Return catalogs by UID
+
+            INPUTS
+            * filter_id   = (integer) UID of catalog
+        """
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit)}
+        return self.api_request('catalog', data)
+
+    def catalog_add(self, cat_name, cat_path, cat_type=False, media_type=False, file_pattern=False,
+                    folder_pattern=False, username=False, password=False):
+        """ catalog_add
+            MINIMUM_API_VERSION=6.0.0
+
+            Create a new catalog
+
+            INPUTS
+            * name           = (string) catalog_name
+            * path           = (string) URL or folder path for your catalog
+            * type           = (string) catalog_type default: local ('local', 'beets', 'remote', 'subsonic', 'seafile', 'beetsremote') //optional
+            * media_type     = (string) Default: 'music' ('music', 'podcast', 'clip', 'tvshow', 'movie', 'personal_video') //optional
+            * file_pattern   = (string) Pattern used identify tags from the file name. Default '%T - %t' //optional
+            * folder_pattern = (string) Pattern used identify tags from the folder name. Default '%a/%A' //optional
+            * username       = (string) login to remote catalog ('remote', 'subsonic', 'seafile') //optional
+            * password       = (string) password to remote catalog ('remote', 'subsonic', 'seafile', 'beetsremote') //optional
+        """
+        data = {'name': cat_name,
+                'path': cat_path,
+                'type': cat_type,
+                'media_type': media_type,
+                'file_pattern': file_pattern,
+                'folder_pattern': folder_pattern,
+                'username': username,
+                'password': password}
+        return self.api_request('catalog_add', data, ('type', 'media_type', 'file_pattern', 'folder_pattern',
+                                                      'username', 'password'))
+
+    def catalog_delete(self, filter_id: int):
+        """ catalog_delete
+            MINIMUM_API_VERSION=6.0.0
+
+            Delete an existing catalog. (if it exists)
+
+            INPUTS
+            * filter = (string) catalog_id to delete
+        """
+        data = {'filter': filter_id}
+        return self.api_request('catalog_delete', data)
+
+    def catalog_action(self, task, catalog_id):
+        """ catalog_action
+            MINIMUM_API_VERSION=400001
+
+            Kick off a catalog update or clean for the selected catalog
+
+            INPUTS
+            * task        = (string) 'add_to_catalog'|'clean_catalog'|'verify_catalog'|'gather_art'
+            * catalog_id  = (integer) $catalog_id
+        """
+        data = {'task': task,
+                'catalog': catalog_id}
+        return self.api_request('catalog_action', data)
+
+    def catalog_file(self, file, task, catalog_id):
+        """ catalog_file
+            MINIMUM_API_VERSION=420000
+
+            Perform actions on local catalog files.
+            Single file versions of catalog add, clean and verify.
+            Make sure you remember to urlencode those file names!
+
+            INPUTS
+            * file        = (string) urlencode(FULL path to local file)
+            * task        = (string) 'add'|'clean'|'verify'|'remove'
+            * catalog_id  = (integer) $catalog_id
+        """
+        data = {'file': file,
+                'task': task,
+                'catalog': catalog_id}
+        return self.api_request('catalog_file', data)
+
+    def catalog_folder(self, folder, task, catalog_id):
+        """ catalog_folder
+            MINIMUM_API_VERSION=6.0.0
+
+            Perform actions on local catalog folders.
+            Single folder versions of catalog add, clean and verify.
+            Make sure you remember to urlencode those folder names!
 
             INPUTS
-            * object_type = (string) 'song'|'album'|'artist'|'playlist'
-            * filter_id   = (integer) $artist_id or song_id
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
+            * folder        = (string) urlencode(FULL path to local folder)
+            * task        = (string) 'add'|'clean'|'verify'|'remove'
+            * catalog_id  = (integer) $catalog_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'get_similar'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit)}
-        return self.get_request(ampache_url, data, api_method)
-
-    def list(self, object_type, filter_str=False, exact=False, add=False, update=False,
-             offset=0, limit=0, sort=False, cond=False):
-        """ list
-            MINIMUM_API_VERSION=6.0.0
+        data = {'folder': folder,
+                'task': task,
+                'catalog': catalog_id}
+        return self.api_request('catalog_folder', data)
 
-            This takes a named array of objects and returning `id`, `name`, `prefix` and `basename`
+    def podcasts(self, filter_str=False,
+                 exact=False, offset=0, limit=0, sort=False, cond=False):
+        """ podcasts
+            MINIMUM_API_VERSION=420000
 
             INPUTS
-            * object_type = (string) 'song'|'album'|'artist'|'album_artist'|'playlist'
-            * filter_str  = (string) search the name of the object_type //optional
-            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * add         = (integer) UNIXTIME() //optional
-            * update      = (integer) UNIXTIME() //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * filter_str = (string) search the name of a podcast //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'list'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'filter': filter_str,
+        data = {'filter': filter_str,
                 'exact': exact,
-                'add': add,
-                'update': update,
                 'offset': str(offset),
                 'limit': str(limit),
                 'sort': sort,
                 'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('podcasts', data, ('filter', 'exact', 'sort', 'cond'))
 
-    def browse(self, filter_str=False,
-               object_type=False, catalog=False, add=False, update=False,
-               offset=0, limit=0, sort=False, cond=False):
-        """ browse
-            MINIMUM_API_VERSION=6.0.0
+    def podcast(self, filter_id: int, include=False):
+        """ podcast
+            MINIMUM_API_VERSION=420000
 
-            Return children of a parent object in a folder traversal/browse style
-            If you don't send any parameters you'll get a catalog list (the 'root' path)
+            Return podcasts by UID
 
             INPUTS
-            * filter_str  = (string) object_id //optional
-            * object_type = (string) 'root', 'catalog', 'artist', 'album', 'podcast' // optional
-            * catalog     = (integer) catalog ID you are browsing
-            * add         = Api::set_filter(date) //optional
-            * update      = Api::set_filter(date) //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * filter_id   = (integer) UID of Podcast
+            * include     = (string) 'episodes' Include episodes with the response //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'browse'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'type': object_type,
-                'catalog': catalog,
-                'add': add,
-                'update': update,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not object_type:
-            data.pop('type')
-        if not catalog:
-            data.pop('catalog')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'include': include}
+        return self.api_request('podcast', data, ('include',))
 
-    def index(self, object_type, filter_str=False, exact=False, add=False, update=False,
-              include=False, offset=0, limit=0, hide_search=False, sort=False, cond=False):
-        """ index
-            MINIMUM_API_VERSION=400001
+    def podcast_create(self, url, catalog_id):
+        """ podcast_create
+            MINIMUM_API_VERSION=420000
 
-            This takes a collection of inputs and return ID's for the object type
-            Add 'include' to include child objects
+            Return podcasts by UID
 
             INPUTS
-            * object_type = (string) 'catalog', 'song', 'album', 'artist', 'album_artist', 'song_artist', 'playlist', 'podcast', 'podcast_episode', 'share', 'video', 'live_stream'
-            * filter_str  = (string) search the name of the object_type //optional
-            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * add         = (integer) UNIXTIME() //optional
-            * update      = (integer) UNIXTIME() //optional
-            * include     = (integer) 0,1 include songs if available for that object //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * hide_search = (integer) 0,1, if true do not include searches/smartlists in the result //optional
-            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * url         = (string) rss url for podcast
+            * catalog_id  = (string) podcast catalog
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        if bool(include):
-            include = 1
-        api_method = 'index'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'filter': filter_str,
-                'exact': exact,
-                'add': add,
-                'update': update,
-                'include': include,
-                'offset': str(offset),
-                'limit': str(limit),
-                'hide_search': hide_search,
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not include:
-            data.pop('include')
-        if not hide_search:
-            data.pop('hide_search')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'url': url,
+                'catalog': catalog_id}
+        return self.api_request('podcast_create', data)
 
-    def get_indexes(self, object_type, filter_str=False, exact=False, add=False,
-                    update=False, include=False, offset=0, limit=0, sort=False, cond=False):
-        """ get_indexes
-            MINIMUM_API_VERSION=400001
+    def podcast_edit(self, filter_id: int,
+                     feed=False, title=False, website=False,
+                     description=False, generator=False, copyright_str=False):
+        """ podcast_edit
+            MINIMUM_API_VERSION=420000
 
-            This takes a collection of inputs and returns ID + name for the object type
+            Update the description and/or expiration date for an existing podcast.
+            Takes the podcast id to update with optional description and expires parameters.
 
             INPUTS
-            * object_type = (string) 'catalog'|'album_artist'|'song_artist'|'song'|'album'|'artist'|'album_artist'|'playlist'
-            * filter_str  = (string) search the name of the object_type //optional
-            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * add         = (integer) UNIXTIME() //optional
-            * update      = (integer) UNIXTIME() //optional
-            * include     = (integer) 0,1 include songs if available for that object //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * filter_id     = (integer) $podcast_id
+            * feed          = (string) feed url (xml!) //optional
+            * title         = (string) title string //optional
+            * website       = (string) source website url //optional
+            * description   = (string) //optional
+            * generator     = (string) //optional
+            * copyright_str = (string) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'get_indexes'
-        if bool(include):
-            include = 1
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'filter': filter_str,
-                'exact': exact,
-                'add': add,
-                'update': update,
-                'include': include,
+        data = {'filter': filter_id,
+                'feed': feed,
+                'title': title,
+                'website': website,
+                'description': description,
+                'generator': generator,
+                'copyright': copyright_str}
+        return self.api_request('podcast_edit', data, ('feed', 'title', 'website', 'description', 'generator',
+                                                       'copyright'))
+
+    def podcast_delete(self, filter_id: int):
+        """ podcast_delete
+            MINIMUM_API_VERSION=420000
+
+            Delete an existing podcast.
+
+            INPUTS
+            * filter_id   = (integer) UID of podcast to delete
+        """
+        data = {'filter': filter_id}
+        return self.api_request('podcast_delete', data)
+
+    def podcast_episodes(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ podcast_episodes
+            MINIMUM_API_VERSION=420000
+
+            INPUTS
+            * filter_id = (string) UID of podcast
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_id,
                 'offset': str(offset),
                 'limit': str(limit),
                 'sort': sort,
                 'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not include:
-            data.pop('include')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('podcast_episodes', data, ('sort', 'cond'))
 
-    def artists(self, filter_str=False, add=False, update=False,
-                offset=0, limit=0, include=False, album_artist=False, sort=False, cond=False):
-        """ artists
+    def podcast_episode(self, filter_id: int):
+        """ podcast_episode
+            MINIMUM_API_VERSION=420000
+
+            Return podcast_episodes by UID
+
+            INPUTS
+            * filter_id   = (integer) UID of Podcast
+        """
+        data = {'filter': filter_id}
+        return self.api_request('podcast_episode', data)
+
+    def podcast_episode_delete(self, filter_id: int):
+        """ podcast_episode_delete
+            MINIMUM_API_VERSION=420000
+
+            Delete an existing podcast_episode.
+
+            INPUTS
+            * filter_id   = (integer) UID of podcast_episode to delete
+        """
+        data = {'filter': filter_id}
+        return self.api_request('podcast_episode_delete', data)
+
+    def update_podcast(self, filter_id: int):
+        """ update_podcast
+            MINIMUM_API_VERSION=420000
+
+            Sync and download new podcast episodes
+
+            INPUTS
+            * filter_id   = (integer) UID of Podcast
+        """
+        data = {'filter': filter_id}
+        return self.api_request('update_podcast', data)
+
+    def search_songs(self, filter_str, offset=0, limit=0):
+        """ search_songs
             MINIMUM_API_VERSION=380001
 
-            This takes a collection of inputs and returns artist objects.
+            This searches the songs and returns... songs
 
             INPUTS
-            * filter_str   = (string) search the name of an artist //optional
-            * add          = (integer) UNIXTIME() //optional
-            * update       = (integer) UNIXTIME() //optional
-            * offset       = (integer) //optional
-            * limit        = (integer) //optional
-            * include      = (string) 'albums', 'songs' //optional
-            * album_artist = (boolean) 0,1 if true filter for album artists only //optional
-            * cond         = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort         = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * filter_str  = (string) search the name of a song
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        if bool(include) and not isinstance(include, str):
-            include = 'albums,songs'
-        api_method = 'artists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'add': add,
-                'update': update,
+        data = {'filter': filter_str,
                 'offset': str(offset),
-                'limit': str(limit),
-                'include': include,
-                'album_artist': album_artist,
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not include:
-            data.pop('include')
-        if not album_artist:
-            data.pop('album_artist')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+                'limit': str(limit)}
+        return self.api_request('search_songs', data)
 
-    def artist(self, filter_id: int, include=False):
-        """ artist
-            MINIMUM_API_VERSION=380001
+    def search_rules(self, filter_str):
+        """ search_rules
+            MINIMUM_API_VERSION=6.8.0
 
-            This returns a single artist based on the UID of said artist
+            Print a list of valid search rules for your search type
 
             INPUTS
-            * filter_id   = (integer) $artist_id
-            * include     = (string) 'albums', 'songs' //optional
+            * filter_str = (string) 'song', 'album', 'song_artist', 'album_artist', 'artist', 'label', 'playlist', 'podcast', 'podcast_episode', 'genre', 'user', 'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        if bool(include) and not isinstance(include, str):
-            include = 'albums,songs'
-        api_method = 'artist'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'include': include}
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_str}
+        return self.api_request('search_rules', data)
 
-    def artist_albums(self, filter_id: int, offset=0, limit=0, album_artist=False,
-                      sort=False, cond=False):
-        """ artist_albums
+    def search(self, rules, operator='and', object_type='song', offset=0, limit=0, random=0):
+        """ search
             MINIMUM_API_VERSION=380001
 
-            This returns the albums of an artist
+            Perform an advanced search given passed rules
+            the rules can occur multiple times and are joined by the operator item.
+
+            Refer to the wiki for further information
+            https://ampache.org/api/api-advanced-search
 
             INPUTS
-            * filter_id    = (integer) $artist_id
-            * offset       = (integer) //optional
-            * limit        = (integer) //optional
-            * album_artist = (integer) 0,1, if true return albums where the UID is an album_artist of the object //optional
-            * cond         = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort         = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * rules       = (array) = [[rule_1,rule_1_operator,rule_1_input],[rule_2,rule_2_operator,rule_2_input],[etc]]
+            * operator    = (string) 'and'|'or' (whether to match one rule or all) //optional
+            * object_type = (string)  //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * random      = (integer) 0|1' //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'artist_albums'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'album_artist': album_artist,
-                'sort': sort,
-                'cond': cond}
-        if not album_artist:
-            data.pop('album_artist')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
+        ampache_url = self.get_server_url()
+        api_method = 'search'
+        data = {'operator': operator,
+                'type': object_type,
+                'offset': offset,
+                'limit': limit,
+                'random': random}
+        data = self.get_data(api_method, data)
+        count = 0
+        # inputs  [rule_1, rule_1_operator, rule_1_input]
+        # example ['year', 2, 1999]
+        for item in rules:
+            count = count + 1
+            data['rule_' + str(count)] = item[0]
+            data['rule_' + str(count) + '_operator'] = item[1]
+            data['rule_' + str(count) + '_input'] = item[2]
+            if item[0] == 'metadata':
+                data['rule_' + str(count) + '_subtype'] = item[3]
         return self.get_request(ampache_url, data, api_method)
 
-    def artist_songs(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ artist_songs
-            MINIMUM_API_VERSION=380001
+    def search_group(self, rules,
+                     operator='and', object_type='all', offset=0, limit=0, random=0):
+        """ search_group
+            MINIMUM_API_VERSION=6.3.0
 
-            This returns the songs of the specified artist
+            Perform a search given passed rules and return matching objects in a group.
+            If the rules to not exist for the object type or would return the entire table they will not return objects
+
+            Refer to the wiki for further information on rule_* types and data
+            https://ampache.org/api/api-xml-methods
+            https://ampache.org/api/api-json-methods
 
             INPUTS
-            * filter_id = (integer) $artist_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * rules       = (array) = [[rule_1,rule_1_operator,rule_1_input],[rule_2,rule_2_operator,rule_2_input],[etc]]
+            * operator    = (string) 'and'|'or' (whether to match one rule or all) //optional
+            * object_type = (string)  //optional
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * random      = (integer) 0|1' //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'artist_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
+        ampache_url = self.get_server_url()
+        api_method = 'search_group'
+        data = {'operator': operator,
+                'type': object_type,
+                'offset': offset,
+                'limit': limit,
+                'random': random}
+        data = self.get_data(api_method, data)
+        count = 0
+        # inputs  [rule_1, rule_1_operator, rule_1_input]
+        # example ['year', 2, 1999]
+        for item in rules:
+            count = count + 1
+            data['rule_' + str(count)] = item[0]
+            data['rule_' + str(count) + '_operator'] = item[1]
+            data['rule_' + str(count) + '_input'] = item[2]
+            if item[0] == 'metadata':
+                data['rule_' + str(count) + '_subtype'] = item[3]
         return self.get_request(ampache_url, data, api_method)
 
-    def albums(self, filter_str=False,
-               exact=False, add=False, update=False, offset=0, limit=0,
-               include=False, sort=False, cond=False):
-        """ albums
+    def videos(self, filter_str=False,
+               exact=False, offset=0, limit=0, sort=False, cond=False):
+        """ videos
             MINIMUM_API_VERSION=380001
 
-            This returns albums based on the provided search filters
+            This returns video objects!
 
             INPUTS
-            * filter_str = (string) search the name of an album //optional
+            * filter_str = (string) search the name of a video //optional
             * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * add        = (integer) UNIXTIME() //optional
-            * update     = (integer) UNIXTIME() //optional
             * offset     = (integer) //optional
             * limit      = (integer) //optional
-            * include    = (string) 'songs' //optional
             * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
             * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'albums'
-        if bool(include) and not isinstance(include, str):
-            include = 'songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
+        data = {'exact': exact,
                 'filter': filter_str,
-                'exact': exact,
-                'add': add,
-                'update': update,
                 'offset': str(offset),
                 'limit': str(limit),
-                'include': include,
                 'sort': sort,
                 'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not include:
-            data.pop('include')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('videos', data, ('exact', 'filter', 'sort', 'cond'))
 
-    def album(self, filter_id: int, include=False):
-        """ album
+    def video(self, filter_id: int):
+        """ video
             MINIMUM_API_VERSION=380001
 
-            This returns a single album based on the UID provided
+            This returns a single video
 
             INPUTS
-            * filter_id   = (integer) $album_id
-            * include     = (string) 'songs' //optional
+            * filter_id   = (integer) $video_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'album'
-        if bool(include) and not isinstance(include, str):
-            include = 'songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'include': include}
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id}
+        return self.api_request('video', data)
 
-    def album_songs(self, filter_id: int, offset=0, limit=0,
-                    exact=False, sort=False, cond=False):
-        """ album_songs
+    def localplay(self, command, oid=False, otype=False, clear=False):
+        """ localplay
             MINIMUM_API_VERSION=380001
+            CHANGED_IN_API_VERSION=5.0.0
 
-            This returns the songs of a specified album
+            This is for controlling localplay
 
             INPUTS
-            * filter_id = (integer) $album_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * exact     = (integer) 0,1, if true don't group songs from different disks //optional (IGNORED IN API6)
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * command     = (string) 'next', 'prev', 'stop', 'play', 'pause', 'add', 'volume_up',
+                                     'volume_down', 'volume_mute', 'delete_all', 'skip', 'status'
+            * oid         = (integer) object_id //optional
+            * otype       = (string) 'Song', 'Video', 'Podcast_Episode', 'Channel',
+                                     'Broadcast', 'Democratic', 'Live_Stream' //optional
+            * clear       = (integer) 0,1 Clear the current playlist before adding //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'album_songs'
-        if bool(exact):
-            exact = 1
-        else:
-            exact = 0
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'command': command,
+                'oid': oid,
+                'type': otype,
+                'clear': clear}
+        return self.api_request('localplay', data, ('oid', 'type', 'clear'))
 
-    def genres(self, filter_str=False,
-               exact=False, offset=0, limit=0, sort=False, cond=False):
-        """ genres
+    def localplay_songs(self):
+        """ localplay_songs
+            MINIMUM_API_VERSION=5.0.0
+
+            Get the list of songs in your localplay playlist
+        """
+        return self.api_request('localplay_songs', {})
+
+    def democratic(self, method, oid):
+        """ democratic
             MINIMUM_API_VERSION=380001
 
-            This returns the genres (Tags) based on the specified filter
+            This is for controlling democratic play
 
             INPUTS
-            * filter_str = (string) search the name of a genre //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * oid         = (integer) object_id (song_id|playlist_id)
+            * method      = (string) 'vote'|'devote'|'playlist'|'play'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'genres'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'oid': oid,
+                'method': method}
+        return self.api_request('democratic', data)
 
-    def genre(self, filter_id: int):
-        """ genre
+    def stats(self, object_type, filter_str='random',
+              username=False, user_id=False, offset=0, limit=0, sort=False, cond=False):
+        """ stats
             MINIMUM_API_VERSION=380001
+            CHANGED_IN_API_VERSION=400001
 
-            This returns a single genre based on UID
+            This gets library stats for different object types. When filter is null get some random items instead
 
             INPUTS
-            * filter_id = (integer) $genre_id
+            * object_type = (string) 'song'|'album'|'artist'
+            * filter_str  = (string) 'newest'|'highest'|'frequent'|'recent'|'flagged'|'random'
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
+            * user_id     = (integer) //optional
+            * username    = (string) //optional
+            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'genre'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'type': object_type,
+                'filter': filter_str,
+                'offset': offset,
+                'limit': limit,
+                'user_id': user_id,
+                'username': username,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('stats', data, ('user_id', 'username', 'sort', 'cond'))
 
-    def genre_artists(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ genre_artists
-            MINIMUM_API_VERSION=380001
+    def users(self, sort=False, cond=False):
+        """ users
+            MINIMUM_API_VERSION=5.0.0
 
-            This returns the artists associated with the genre in question as defined by the UID
+            Get ids and usernames for your site users
 
             INPUTS
-            * filter_id = (integer) $genre_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * cond = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'genre_artists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
+        data = {'sort': sort,
                 'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('users', data, ('sort', 'cond'))
 
-    def genre_albums(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ genre_albums
+    def user(self, username: str):
+        """ user
             MINIMUM_API_VERSION=380001
 
-            This returns the albums associated with the genre in question
+            This get an user public information
 
             INPUTS
-            * filter_id = (integer) $genre_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * username    =
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'genre_albums'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'username': username}
+        return self.api_request('user', data)
 
-    def genre_songs(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ genre_songs
+    def followers(self, username: str, sort=False, cond=False):
+        """ followers
             MINIMUM_API_VERSION=380001
 
-            returns the songs for this genre
+            This get an user followers
 
             INPUTS
-            * filter_id = (integer) $genre_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * username =
+            * cond     = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort     = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'genre_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
+        data = {'username': username,
                 'sort': sort,
                 'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('followers', data, ('sort', 'cond'))
 
-    def songs(self, filter_str=False, exact=False, add=False, update=False,
-              offset=0, limit=0, sort=False, cond=False):
-        """ songs
+    def following(self, username: str):
+        """ following
             MINIMUM_API_VERSION=380001
 
-            Returns songs based on the specified filter_str
+            This get the user list followed by an user
 
             INPUTS
-            * filter_str = (string) search the name of a song //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * add        = (integer) UNIXTIME() //optional
-            * update     = (integer) UNIXTIME() //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * username    =
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'exact': exact,
-                'add': add,
-                'update': update,
-                'filter': filter_str,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'username': username}
+        return self.api_request('following', data)
 
-    def song(self, filter_id: int):
-        """ song
+    def toggle_follow(self, username: str):
+        """ toggle_follow
             MINIMUM_API_VERSION=380001
 
-            returns a single song
+            This follow/unfollow an user
 
             INPUTS
-            * filter_id  = (integer) $song_id
+            * username    =
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'song'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'username': username}
+        return self.api_request('toggle_follow', data)
 
-    def song_delete(self, filter_id: int):
-        """ song_delete
-            MINIMUM_API_VERSION=5.0.0
+    def last_shouts(self, username, limit=0):
+        """ last_shouts
+            MINIMUM_API_VERSION=380001
 
-            Delete an existing song.
+            This get the latest posted shouts
 
             INPUTS
-            * filter_id   = (string) UID of song to delete
+            * username    =
+            * limit       = (integer) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'song_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'username': username,
+                'limit': limit}
+        return self.api_request('last_shouts', data)
 
-    def song_tags(self, filter_id: int):
-        """ song_tags
-            MINIMUM_API_VERSION=7.5.0
+    def player(self, filter_str, object_type='song', state='play', play_time=0, client=CLIENT_NAME):
+        """ player
+            MINIMUM_API_VERSION=6.4.0
 
-            Get the full song file tags using VaInfo
-            This is used to get tags for remote catalogs to allow maximum data to be returned
+            Inform the server about the state of your client. (Song you are playing, Play/Pause state, etc.)
+
+            filter_str  = (integer) $object_id
+            object_type = (string)  $object_type ('song', 'podcast_episode', 'video'), DEFAULT 'song'//optional
+            state       = (string)  'play', 'stop', DEFAULT 'play' //optional
+            play_time   = (integer) current song time in whole seconds, DEFAULT 0 //optional
+            client      = (string)  $agent, DEFAULT 'python3-ampache' //optional
+        """
+        data = {'filter': filter_str,
+                'type': object_type,
+                'state': state,
+                'time': play_time,
+                'client': client}
+        return self.api_request('player', data)
+
+    def now_playing(self):
+        """  now_playing
+             MINIMUM_API_VERSION=6.3.1
+
+             Get what is currently being played by all users.
+        """
+        return self.api_request('now_playing', {})
+
+    def rate(self, object_type, object_id, rating):
+        """ rate
+            MINIMUM_API_VERSION=380001
+
+            This rates a library item
 
             INPUTS
-            * filter_id   = (string) UID of song to fetch
+            * object_type = (string) 'song'|'album'|'artist'
+            * object_id   = (integer) $object_id
+            * rating      = (integer) 0|1|2|3|4|5
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'song_tags'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        if isinstance(rating, str):
+            if rating.isdigit():
+                rating = int(rating)
+            else:
+                rating = -1
+        if (rating < 0 or rating > 5) or not (
+                object_type == 'song' or object_type == 'album' or object_type == 'artist'):
+            return False
+        data = {'type': object_type,
+                'id': object_id,
+                'rating': rating}
+        return self.api_request('rate', data)
 
-    def user_playlists(self, filter_str=False, exact=False, offset=0, limit=0,
-                       sort=False, cond=False, include=False):
-        """ user_playlists
-            MINIMUM_API_VERSION=6.3.0
+    def flag(self, object_type, object_id, flagbool, date=False):
+        """ flag
+            MINIMUM_API_VERSION=400001
 
-            This returns playlists based on the specified filter (Does not include searches / smartlists)
+            This flags a library item as a favorite
+
+            Setting flagbool to true (1) will set the flag
+            Setting flagbool to false (0) will remove the flag
 
             INPUTS
-            * filter_str = (string) search the name of a playlist //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
-            * include    = (integer) 0,1, if true include playlist contents
+            * object_type = (string) 'song'|'album'|'artist'
+            * object_id   = (integer) $object_id
+            * flagbool    = (boolean|integer) (True,False | 0|1)
+            * date        = (integer) UNIXTIME() //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user_playlists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond,
-                'include': include}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+        if bool(flagbool):
+            flag_state = 1
+        else:
+            flag_state = 0
+        data = {'type': object_type,
+                'id': object_id,
+                'flag': flag_state,
+                'date': date}
+        return self.api_request('flag', data, ('date',))
 
-    def user_smartlists(self, filter_str=False, exact=False, offset=0, limit=0,
-                        sort=False, cond=False, include=False):
-        """ user_smartlists
-            MINIMUM_API_VERSION=6.3.0
+    def record_play(self, object_id, user_id=False, client=CLIENT_NAME, date=False):
+        """ record_play
+            MINIMUM_API_VERSION=400001
 
-            This returns smartlists (searches) based on the specified filter (Does not include playlists)
+            Take a song_id and update the object_count and user_activity table with a play.
+            This allows other sources to record play history to ampache
 
             INPUTS
-            * filter_str = (string) search the name of a playlist //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
-            * include    = (integer) 0,1, if true include playlist contents
+            * object_id   = (integer) $object_id
+            * user_id     = (integer) $user_id //optional
+            * client      = (string) $agent //optional
+            * date        = (integer) UNIXTIME() //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user_smartlists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond,
-                'include': include}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'id': object_id,
+                'user': user_id,
+                'client': client,
+                'date': date}
+        return self.api_request('record_play', data, ('user', 'date'))
 
-    def playlists(self, filter_str=False, exact=False, offset=0, limit=0, hide_search=False,
-                  show_dupes=False, include=False, sort=False, cond=False):
-        """ playlists
-            MINIMUM_API_VERSION=380001
+    def scrobble(self, title, artist_name, album_name,
+                 mbtitle=False, mbartist=False, mbalbum=False, stime=False,
+                 client=CLIENT_NAME):
+        """ scrobble
+            MINIMUM_API_VERSION=400001
 
-            This returns playlists based on the specified filter
+            Search for a song using text info and then record a play if found.
+            This allows other sources to record play history to ampache
 
             INPUTS
-            * filter_str  = (string) search the name of a playlist //optional
-            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * hide_search = (integer) 0,1, if true do not include searches/smartlists in the result //optional
-            * show_dupes  = (integer) 0,1, if true ignore 'api_hide_dupe_searches' setting //optional
-            * include     = (integer) 0,1, if true include the objects in the playlist //optional
-            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * title       = (string) song title
+            * artist_name = (string) artist name
+            * album_name  = (string) album name
+            * mbtitle     = (string) song mbid //optional
+            * mbartist    = (string) artist mbid //optional
+            * mbalbum     = (string) album mbid //optional
+            * stime       = (integer) UNIXTIME() //optional
+            * client      = (string) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'hide_search': hide_search,
-                'show_dupes': show_dupes,
-                'include': include,
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not hide_search:
-            data.pop('hide_search')
-        if not show_dupes:
-            data.pop('show_dupes')
-        if not include:
-            data.pop('include')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'client': client,
+                'date': str(stime),
+                'song': title,
+                'artist': artist_name,
+                'album': album_name,
+                'songmbid': mbtitle,
+                'albummbid': mbalbum,
+                'artistmbid': mbartist}
+        return self.api_request('scrobble', data, ('songmbid', 'albummbid', 'artistmbid'))
+
+    def timeline(self, username, limit=0, since=0):
+        """ timeline
+            MINIMUM_API_VERSION=380001
 
-    def playlist(self, filter_id: int):
-        """ playlist
+            This get a user timeline
+
+            INPUTS
+            * username    = (string)
+            * limit       = (integer) //optional
+            * since       = (integer) UNIXTIME() //optional
+        """
+        data = {'username': username,
+                'limit': limit,
+                'since': since}
+        return self.api_request('timeline', data)
+
+    def friends_timeline(self, limit=0, since=0):
+        """ friends_timeline
             MINIMUM_API_VERSION=380001
 
-            This returns a single playlist
+            This get current user friends timeline
 
             INPUTS
-            * filter_id  = (integer) $playlist_id
+            * limit       = (integer) //optional
+            * since       = (integer) UNIXTIME() //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'limit': limit,
+                'since': since}
+        return self.api_request('friends_timeline', data)
 
-    def playlist_hash(self, filter_id: int):
-        """ playlist_hash
-            MINIMUM_API_VERSION=6.6.0
+    def update_from_tags(self, object_type, object_id):
+        """ update_from_tags
+            MINIMUM_API_VERSION=400001
 
-            his returns the md5 hash for the songs in a playlist
+            updates a single album,artist,song from the tag data
 
             INPUTS
-            filter_id = (string) UID of playlist
+            * object_type = (string) 'artist'|'album'|'song'
+            * object_id   = (integer) $artist_id, $album_id, $song_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_hash'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'type': object_type,
+                'id': object_id}
+        return self.api_request('update_from_tags', data)
 
-    def playlist_songs(self, filter_id: int, random=False, offset=0, limit=0):
-        """ playlist_songs
-            MINIMUM_API_VERSION=380001
+    def update_art(self, object_type, object_id, overwrite=False):
+        """ update_art
+            MINIMUM_API_VERSION=400001
 
-            This returns the songs for a playlist
+            updates a single album, artist, song looking for art files
+            Doesn't overwrite existing art by default.
 
             INPUTS
-            * filter_id   = (integer) $playlist_id
-            * random      = (integer) 0,1, if true get random songs using limit //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
+            * object_type = (string) 'artist'|'album'|'song'
+            * object_id   = (integer) $artist_id, $album_id, $song_id
+            * overwrite   = (boolean|integer) (True,False | 0|1) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'random': random,
-                'offset': str(offset),
-                'limit': str(limit)}
-        if not random:
-            data.pop('random')
-        return self.get_request(ampache_url, data, api_method)
+        if bool(overwrite):
+            overwrite = 1
+        else:
+            overwrite = 0
+        data = {'type': object_type,
+                'id': object_id,
+                'overwrite': overwrite}
+        return self.api_request('update_art', data)
 
-    def playlist_create(self, playlist_name, playlist_type):
-        """ playlist_create
-            MINIMUM_API_VERSION=380001
+    def update_artist_info(self, filter_id):
+        """ update_artist_info
+            MINIMUM_API_VERSION=400001
 
-            This create a new playlist and return it
+            Update artist information and fetch similar artists from last.fm
+            Make sure lastfm_api_key is set in your configuration file
 
             INPUTS
-            * playlist_name = (string)
-            * playlist_type = (string) public | private
+            * filter_id = (integer) $artist_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_create'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'name': playlist_name,
-                'type': playlist_type}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'id': filter_id}
+        return self.api_request('update_artist_info', data)
 
-    def playlist_edit(self, filter_id: int, playlist_name=False,
-                      playlist_type=False, owner=False, items=False, tracks=False):
-        """ playlist_edit
+    def stream(self, object_id, object_type, destination, stats=1, resume=False, progress=None):
+        """ stream
             MINIMUM_API_VERSION=400001
 
-            This modifies name and type of a playlist
+            stream a song or podcast episode
 
             INPUTS
-            * filter_id     = (integer)
-            * playlist_name = (string) playlist name //optional
-            * playlist_type = (string) 'public'|'private' //optional
-            * owner         = (string) Change playlist owner to the user id (-1 = System playlist) //optional
-            * items         = (string) comma-separated song_id's (replaces existing items with a new id) //optional
-            * tracks        = (string) comma-separated playlisttrack numbers matched to 'items' in order //optional
+            * object_id   = (string) $song_id / $podcast_episode_id
+            * object_type = (string) 'song'|'podcast'
+            * destination = (string) full file path
+            * stats       = (integer) 0,1, if false disable stat recording when playing the object //optional
+            * resume      = (boolean) continue an interrupted transfer from 'destination.part' //optional
+            * progress    = (function) called with (bytes_written, total_bytes) after each chunk //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_edit'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'name': playlist_name,
-                'type': playlist_type,
-                'owner': owner,
-                'items': items,
-                'tracks': tracks}
-        if not playlist_name:
-            data.pop('name')
-        if not playlist_type:
-            data.pop('type')
-        if not owner:
-            data.pop('owner')
-        if not items:
-            data.pop('items')
-        if not tracks:
-            data.pop('tracks')
-        return self.get_request(ampache_url, data, api_method)
+        ampache_url = self.get_server_url()
+        api_method = 'stream'
+        data = {'id': object_id,
+                'type': object_type,
+                'stats': stats}
+        data = self.get_data(api_method, data)
+        return self.get_file(ampache_url, data, destination, False, resume, progress)
 
-    def playlist_delete(self, filter_id: int):
-        """ playlist_delete
-            MINIMUM_API_VERSION=380001
+    def download(self, object_id, object_type, destination,
+                 transcode='raw', bitrate=False, stats=1, resume=False, progress=None):
+        """ download
+            MINIMUM_API_VERSION=400001
 
-            This deletes a playlist
+            download a song or podcast episode
 
             INPUTS
-            * filter_id   = (integer) $playlist_id
+            * object_id   = (string) $song_id / $podcast_episode_id / $search_id / $playlist_id
+            * object_type = (string) 'song'|'podcast'|'search'|'playlist'
+            * destination = (string) full file path
+            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional SONG ONLY
+            * bitrate     = (integer) max bitrate for transcoding, '128', '256' //optional SONG ONLY
+            * stats       = (integer) 0,1, if false disable stat recording when playing the object //optional
+            * resume      = (boolean) continue an interrupted transfer from 'destination.part' //optional
+            * progress    = (function) called with (bytes_written, total_bytes) after each chunk //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        ampache_url = self.get_server_url()
+        api_method = 'download'
+        data = {'id': object_id,
+                'type': object_type,
+                'format': transcode,
+                'bitrate': bitrate,
+                'stats': stats}
+        data = self.get_data(api_method, data, ('bitrate',))
+        return self.get_file(ampache_url, data, destination, True, resume, progress)
 
-    def playlist_add(self, filter_id: int, object_id: int, object_type: str):
-        """ playlist_add
-            MINIMUM_API_VERSION=6.3.0
+    def get_external_metadata(self, filter_id, object_type):
+        """ get_external_metadata
+            MINIMUM_API_VERSION=400001
 
-            This adds a song to a playlist, allowing different song parent types
+            get data from metadata plugins
 
             INPUTS
-            * filter = (int) UID of playlist
-            * id     = (int) $object_id
-            * type   = (string) 'song', 'album', 'artist', 'playlist'
+            * filter_id   = (string) $song_id / $album_id / $artist_id
+            * object_type = (string) 'song', 'artist', 'album'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_add'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'id': object_id,
+        data = {'filter': filter_id,
                 'type': object_type}
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('get_external_metadata', data)
 
-    def playlist_add_song(self, filter_id: int, song_id, check=False):
-        """ playlist_add_song
-            MINIMUM_API_VERSION=380001
-            CHANGED_IN_API_VERSION=400003
+    def get_lyrics(self, filter_id, plugins=False):
+        """ get_lyrics
+            MINIMUM_API_VERSION=6.9.0
 
-            This adds a song to a playlist.
-            Added duplicate checks in 400003
+            Return Database lyrics or search with plugins by Song id
 
             INPUTS
-            * filter_id   = (integer) $playlist_id
-            * song_id     = (integer) $song_id
-            * check       = (boolean|integer) (True,False | 0|1) Check for duplicates //optional
+            * filter_id = (string) $song_id / $album_id / $artist_id
+            * plugins   = (int) 0,1, if false disable plugin lookup (Default: 1)
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_add_song'
-        if bool(check):
-            check = 1
-        else:
-            check = 0
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'song': song_id,
-                'filter': filter_id,
-                'check': check}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'plugins': plugins}
+        return self.api_request('get_lyrics', data, ('plugins',))
 
-    def playlist_remove_song(self, filter_id: int,
-                             song_id=False, track=False):
-        """ playlist_remove_song
-            MINIMUM_API_VERSION=380001
-            CHANGED_IN_API_VERSION=400001
+    def get_art(self, object_id, object_type, destination):
+        """ get_art
+            MINIMUM_API_VERSION=400001
 
-            This removes a song from a playlist. Previous versions required 'track' instead of 'song'.
+            get the binary art for an item
 
             INPUTS
-            * filter_id   = (integer) $playlist_id
-            * song_id     = (integer) $song_id //optional
-            * track       = (integer) $playlist_track number //optional
+            * object_id   = (string) $song_id / $podcast_episode_id
+            * object_type = (string) 'song', 'artist', 'album', 'playlist', 'search', 'podcast'
+            * destination = (string) output file path
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_remove_song'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'song': song_id,
-                'track': track}
-        if not song_id:
-            data.pop('song')
-        if not track:
-            data.pop('track')
-        return self.get_request(ampache_url, data, api_method)
+        ampache_url = self.get_server_url()
+        api_method = 'get_art'
+        data = {'id': object_id,
+                'type': object_type}
+        data = self.get_data(api_method, data)
+        return self.get_file(ampache_url, data, destination)
 
-    def playlist_generate(self, mode='random',
-                          filter_str=False, album_id=False, artist_id=False, flagged=False,
-                          list_format='song', offset=0, limit=0):
-        """ playlist_generate
+    def user_create(self, username: str, password: str, email: str,
+                    fullname=False, disable=False):
+        """ user_create
             MINIMUM_API_VERSION=400001
-            CHANGED_IN_API_VERSION=400002
 
-            Get a list of song XML, indexes or id's based on some simple search criteria =
-            'recent' will search for tracks played after 'Popular Threshold' days
-            'forgotten' will search for tracks played before 'Popular Threshold' days
-            'unplayed' added in 400002 for searching unplayed tracks
+            Create a new user. (Requires the username, password and email.) @param array $input
 
             INPUTS
-            * mode        = (string) 'recent', 'forgotten', 'unplayed', 'random' (default = 'random') //optional
-            * filter_str  = (string) string LIKE matched to song title //optional
-            * album_id    = (integer) $album_id //optional
-            * artist_id   = (integer) $artist_id //optional
-            * flagged     = (integer) get flagged songs only 0, 1 (default=0) //optional
-            * list_format = (string) 'song', 'index','id' (default = 'song') //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
+            * username    = (string) $username
+            * password    = (string) hash('sha256', $password))
+            * email       = (string) 'user@gmail.com'
+            * fullname    = (string) //optional
+            * disable     = (boolean|integer) (True,False | 0|1) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'playlist_generate'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'mode': mode,
-                'filter': filter_str,
-                'album': album_id,
-                'artist': artist_id,
-                'flag': flagged,
-                'format': list_format,
-                'offset': offset,
-                'limit': limit}
-        if not filter_str:
-            data.pop('filter')
-        if not album_id:
-            data.pop('album')
-        if not artist_id:
-            data.pop('artist')
-        if not flagged:
-            data.pop('flag')
-        return self.get_request(ampache_url, data, api_method)
+        if bool(disable):
+            disable = 1
+        else:
+            disable = 0
+        if hashlib.sha256(password.encode()).hexdigest() != password:
+            password = hashlib.sha256(password.encode()).hexdigest()
+        data = {'username': username,
+                'password': password,
+                'email': email,
+                'fullname': fullname,
+                'disable': disable}
+        return self.api_request('user_create', data, ('fullname',))
+
+    def user_edit(self, username, password=False, fullname=False, email=False,
+                  website=False, state=False, city=False, disable=False, maxbitrate=False,
+                  fullname_public=False, reset_apikey=False, reset_streamtoken=False, clear_stats=False):
+        """ user_edit
+            MINIMUM_API_VERSION=6.0.0
+
+            Update an existing user. @param array $input
+
+            INPUTS
+            * username          = (string) $username
+            * password          = (string) hash('sha256', $password)) //optional
+            * fullname          = (string) $fullname //optional
+            * email             = (string) $email //optional
+            * website           = (string) $website //optional
+            * state             = (string) $state //optional
+            * city              = (string) $city //optional
+            * disable           = (integer) 0,1 true to disable the user (if enabled) //optional
+            * group             = (integer) Catalog filter group for the new user //optional, default = 0
+            * maxbitrate        = (integer) $maxbitrate //optional
+            * fullname_public   = (integer) 0,1 true to enable, false to disable using fullname in public display //optional
+            * reset_apikey      = (integer) 0,1 true to reset a user Api Key //optional
+            * reset_streamtoken = (integer) 0,1 true to reset a user Stream Token //optional
+            * clear_stats       = (integer) 0,1 true reset all stats for this user //optional
+        """
+        if bool(disable):
+            disable = 1
+        data = {'username': username,
+                'password': password,
+                'fullname': fullname,
+                'email': email,
+                'website': website,
+                'state': state,
+                'city': city,
+                'disable': disable,
+                'maxbitrate': maxbitrate,
+                'fullname_public': fullname_public,
+                'reset_apikey': reset_apikey,
+                'reset_streamtoken': reset_streamtoken,
+                'clear_stats': clear_stats}
+        return self.api_request('user_edit', data, ('password', 'fullname', 'email', 'website', 'state', 'city',
+                                                    'disable', 'maxbitrate', 'fullname_public', 'reset_apikey',
+                                                    'reset_streamtoken', 'clear_stats'))
 
-    def smartlists(self, filter_str=False, exact=False, offset=0, limit=0, include=False, sort=False, cond=False):
-        """ smartlists
-            MINIMUM_API_VERSION=380001
+    def user_delete(self, username: str):
+        """ user_delete
+            MINIMUM_API_VERSION=400001
 
-            This returns smartlists based on the specified filter
+            Delete an existing user. @param array $input
 
             INPUTS
-            * filter_str  = (string) search the name of a smartlist //optional
-            * exact       = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * include     = (integer) 0,1, if true include the objects in the smartlist //optional
-            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * username    = (string) $username
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'smartlists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'include': include,
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not include:
-            data.pop('include')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'username': username}
+        return self.api_request('user_delete', data)
 
-    def smartlist(self, filter_id: int):
-        """ smartlist
-            MINIMUM_API_VERSION=380001
+    def user_preferences(self):
+        """ user_preferences
+            MINIMUM_API_VERSION=5.0.0
 
-            This returns a single smartlist
+            Returns user_preferences
 
             INPUTS
-            * filter_id  = (integer) $smartlist_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'smartlist'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('user_preferences', {})
 
-    def smartlist_songs(self, filter_id: int, random=False, offset=0, limit=0):
-        """ smartlist_songs
-            MINIMUM_API_VERSION=380001
+    def user_preference(self, filter_str):
+        """ user_preference
+            MINIMUM_API_VERSION=5.0.0
 
-            This returns the songs for a smartlist
+            Returns preference based on the specified filter_str
 
             INPUTS
-            * filter_id   = (integer) $smartlist_id
-            * random      = (integer) 0,1, if true get random songs using limit //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
+            * filter_str  = (string) search the name of a preference
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'smartlist_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'random': random,
-                'offset': str(offset),
-                'limit': str(limit)}
-        if not random:
-            data.pop('random')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_str}
+        return self.api_request('user_preference', data)
 
-    def smartlist_delete(self, filter_id: int):
-        """ smartlist_delete
-            MINIMUM_API_VERSION=380001
+    def system_preferences(self):
+        """ system_preferences
+            MINIMUM_API_VERSION=5.0.0
 
-            This deletes a smartlist
+            Returns system_preferences
 
             INPUTS
-            * filter_id   = (integer) $smartlist_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'smartlist_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('system_preferences', {})
 
-    def shares(self, filter_str=False,
-               exact=False, offset=0, limit=0, sort=False, cond=False):
-        """ shares
-            MINIMUM_API_VERSION=420000
+    def system_preference(self, filter_str):
+        """ system_preference
+            MINIMUM_API_VERSION=5.0.0
+
+            Returns preference based on the specified filter_str
 
             INPUTS
-            * filter_str = (string) search the name of a share //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * filter_str  = (string) search the name of a preference
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'shares'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_str}
+        return self.api_request('system_preference', data)
 
-    def share(self, filter_id: int):
-        """ share
-            MINIMUM_API_VERSION=420000
+    def system_update(self):
+        """ system_update
+            MINIMUM_API_VERSION=5.0.0
 
-            Return shares by UID
+            update ampache
 
             INPUTS
-            * filter_id   = (integer) UID of Share
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'share'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('system_update', {})
 
-    def share_create(self, filter_id: int, object_type,
-                     description=False, expires=False):
-        """ share_create
-            MINIMUM_API_VERSION=420000
+    def preference_create(self, filter_str, type_str, default, category,
+                          description=False, subcategory=False, level=100):
+        """ preference_create
+            MINIMUM_API_VERSION=5.0.0
 
-            Create a public url that can be used by anyone to stream media.
-            Takes the file id with optional description and expires parameters.
+            Returns preference based on the specified filter_str
 
-           INPUTS
-            * filter_id   = (integer) $object_id
-            * object_type = (string) object_type ('song', 'album', 'artist')
-            * description = (string) description (will be filled for you if empty) //optional
-            * expires     = (integer) days to keep active //optional
+            INPUTS
+            * filter_str  = (string) search the name of a preference
+            * type_str    = (string) 'boolean', 'integer', 'string', 'special'
+            * default     = (string|integer) default value
+            * category    = (string) 'interface', 'internal', 'options', 'playlist', 'plugins', 'streaming', 'system'
+            * description = (string) description of preference //optional
+            * subcategory = (string) $subcategory //optional
+            * level       = (integer) access level required to change the value (default 100) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'share_create'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'type': object_type,
+        data = {'filter': filter_str,
+                'type': type_str,
+                'default': default,
+                'category': category,
                 'description': description,
-                'expires': expires}
-        if not description:
-            data.pop('description')
-        if not expires:
-            data.pop('expires')
-        return self.get_request(ampache_url, data, api_method)
+                'subcategory': subcategory,
+                'level': level}
+        return self.api_request('preference_create', data, ('description', 'subcategory'))
 
-    def share_edit(self, filter_id: int, can_stream=False, can_download=False,
-                   expires=False, description=False):
-        """ share_edit
-            MINIMUM_API_VERSION=420000
+    def preference_edit(self, filter_str, value, apply_all=0, default=0):
+        """ preference_edit
+            MINIMUM_API_VERSION=5.0.0
 
-            Update the description and/or expiration date for an existing share.
-            Takes the share id to update with optional description and expires parameters.
+            Returns preference based on the specified filter_str
 
-            INPUT
-            * filter_id    = (integer) UID of Share
-            * can_stream   = (boolean) 0,1 //optional
-            * can_download = (boolean) 0,1 //optional
-            * expires      = (integer) number of whole days before expiry //optional
-            * description  = (string) update description //optional
+            INPUTS
+            * filter_str = (string) search the name of a preference
+            * value      = (string|integer) Preference value
+            * apply_all  = (boolean) apply to all users //optional
+            * default    = (boolean) if true set as system default (New and public users) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'share_edit'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'stream': can_stream,
-                'download': can_download,
-                'expires': expires,
-                'description': description}
-        if not can_stream:
-            data.pop('stream')
-        if not can_download:
-            data.pop('download')
-        if not expires:
-            data.pop('expires')
-        if not description:
-            data.pop('description')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_str,
+                'value': value,
+                'all': apply_all,
+                'default': default}
+        return self.api_request('preference_edit', data)
 
-    def share_delete(self, filter_id: int):
-        """ share_delete
-            MINIMUM_API_VERSION=420000
+    def preference_delete(self, filter_str):
+        """ preference_delete
+            MINIMUM_API_VERSION=5.0.0
 
-            Delete an existing share.
+            Returns preference based on the specified filter_str
 
-            INPUT
-            * filter_id   = (integer) UID of Share to delete
+            INPUTS
+            * filter_str  = (string) search the name of a preference
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'share_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_str}
+        return self.api_request('preference_delete', data)
 
-    def catalogs(self, filter_str=False, offset=0, limit=0, sort=False, cond=False):
-        """ catalogs
+    def licenses(self, filter_str=False, exact=False, add=False, update=False,
+                 offset=0, limit=0, sort=False, cond=False):
+        """ licenses
             MINIMUM_API_VERSION=420000
 
+            Returns licenses based on the specified filter_str
+
             INPUTS
-            * filter_str = (string) search the name of a catalog //optional
+            * filter_str = (string) search the name of a license //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * add        = (integer) UNIXTIME() //optional
+            * update     = (integer) UNIXTIME() //optional
             * offset     = (integer) //optional
             * limit      = (integer) //optional
             * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
             * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'catalogs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
+        data = {'exact': exact,
+                'add': add,
+                'update': update,
                 'filter': filter_str,
                 'offset': str(offset),
                 'limit': str(limit),
                 'sort': sort,
                 'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('licenses', data, ('exact', 'add', 'update', 'filter', 'sort', 'cond'))
 
-    def catalog(self, filter_id: int, offset=0, limit=0):
-        """ catalog
+    def license(self, filter_id: int):
+        """ license
             MINIMUM_API_VERSION=420000
 
-            Return catalogs by UID
+            returns a single license
 
             INPUTS
-            * filter_id   = (integer) UID of catalog
+            * filter_id   = (integer) $license_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'catalog'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit)}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id}
+        return self.api_request('license', data)
 
-    def catalog_add(self, cat_name, cat_path, cat_type=False, media_type=False, file_pattern=False,
-                    folder_pattern=False, username=False, password=False):
-        """ catalog_add
-            MINIMUM_API_VERSION=6.0.0
+    def license_songs(self, filter_id: int, sort=False, cond=False):
+        """ license_songs
+            MINIMUM_API_VERSION=420000
 
-            Create a new catalog
+            returns a songs for a single license ID
 
             INPUTS
-            * name           = (string) catalog_name
-            * path           = (string) URL or folder path for your catalog
-            * type           = (string) catalog_type default: local ('local', 'beets', 'remote', 'subsonic', 'seafile', 'beetsremote') //optional
-            * media_type     = (string) Default: 'music' ('music', 'podcast', 'clip', 'tvshow', 'movie', 'personal_video') //optional
-            * file_pattern   = (string) Pattern used identify tags from the file name. Default '%T - %t' //optional
-            * folder_pattern = (string) Pattern used identify tags from the folder name. Default '%a/%A' //optional
-            * username       = (string) login to remote catalog ('remote', 'subsonic', 'seafile') //optional
-            * password       = (string) password to remote catalog ('remote', 'subsonic', 'seafile', 'beetsremote') //optional
+            * filter_id = (integer) $license_id
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+        """
+        data = {'filter': filter_id,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('license_songs', data, ('sort', 'cond'))
+
+    def live_streams(self, filter_str=False,
+                     exact=False, offset=0, limit=0, sort=False, cond=False):
+        """ live_streams
+            MINIMUM_API_VERSION=5.1.0
+
+            Returns live_streams based on the specified filter_str
+
+            INPUTS
+            * filter_str = (string) search the name of a live_stream //optional
+            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
+            * offset     = (integer) //optional
+            * limit      = (integer) //optional
+            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'catalog_add'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'name': cat_name,
-                'path': cat_path,
-                'type': cat_type,
-                'media_type': media_type,
-                'file_pattern': file_pattern,
-                'folder_pattern': folder_pattern,
-                'username': username,
-                'password': password}
-        if not cat_type:
-            data.pop('type')
-        if not media_type:
-            data.pop('media_type')
-        if not file_pattern:
-            data.pop('file_pattern')
-        if not folder_pattern:
-            data.pop('folder_pattern')
-        if not username:
-            data.pop('username')
-        if not password:
-            data.pop('password')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'exact': exact,
+                'filter': filter_str,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('live_streams', data, ('exact', 'filter', 'sort', 'cond'))
 
-    def catalog_delete(self, filter_id: int):
-        """ catalog_delete
-            MINIMUM_API_VERSION=6.0.0
+    def live_stream(self, filter_id: int):
+        """ live_stream
+            MINIMUM_API_VERSION=5.1.0
 
-            Delete an existing catalog. (if it exists)
+            Returns a single live_stream based on UID
 
             INPUTS
-            * filter = (string) catalog_id to delete
+            * filter_id   = (integer) $live_stream_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'catalog_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id}
+        return self.api_request('live_stream', data)
 
-    def catalog_action(self, task, catalog_id):
-        """ catalog_action
-            MINIMUM_API_VERSION=400001
+    def live_stream_create(self, name: str, stream_url: str, codec: str, catalog_id: int, site_url: str = ''):
+        """ live_stream_create
+            MINIMUM_API_VERSION=6.0.0
 
-            Kick off a catalog update or clean for the selected catalog
+            Create a live_stream (radio station) object.
 
             INPUTS
-            * task        = (string) 'add_to_catalog'|'clean_catalog'|'verify_catalog'|'gather_art'
-            * catalog_id  = (integer) $catalog_id
+            * name     = (string) Stream title
+            * url      = (string) URL of the http/s stream
+            * codec    = (string) stream codec ('mp3', 'flac', 'ogg', 'vorbis', 'opus', 'aac', 'alac')
+            * catalog  = (int) Catalog ID to associate with this stream
+            * site_url = (string) Homepage URL of the stream //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'catalog_action'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'task': task,
-                'catalog': catalog_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'name': name,
+                'url': stream_url,
+                'codec': codec,
+                'catalog': catalog_id,
+                'site_url': site_url}
+        return self.api_request('live_stream_create', data, ('site_url',))
 
-    def catalog_file(self, file, task, catalog_id):
-        """ catalog_file
-            MINIMUM_API_VERSION=420000
+    def live_stream_edit(self, filter_id, name: str = '', stream_url: str = '', codec: str = '', catalog_id: int = 0,
+                         site_url: str = ''):
+        """ live_stream_edit
+            MINIMUM_API_VERSION=6.0.0
 
-            Perform actions on local catalog files.
-            Single file versions of catalog add, clean and verify.
-            Make sure you remember to urlencode those file names!
+            Edit a live_stream (radio station) object.
 
             INPUTS
-            * file        = (string) urlencode(FULL path to local file)
-            * task        = (string) 'add'|'clean'|'verify'|'remove'
-            * catalog_id  = (integer) $catalog_id
+            * filter   = (string) object_id
+            * name     = (string) Stream title //optional
+            * url      = (string) URL of the http/s stream //optional
+            * codec    = (string) stream codec ('mp3', 'flac', 'ogg', 'vorbis', 'opus', 'aac', 'alac') //optional
+            * catalog  = (int) Catalog ID to associate with this stream //optional
+            * site_url = (string) Homepage URL of the stream //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'catalog_file'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'file': file,
-                'task': task,
-                'catalog': catalog_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'name': name,
+                'url': stream_url,
+                'codec': codec,
+                'catalog': catalog_id,
+                'site_url': site_url}
+        return self.api_request('live_stream_edit', data, ('name', 'url', 'codec', 'catalog', 'site_url'))
 
-    def catalog_folder(self, folder, task, catalog_id):
-        """ catalog_folder
+    def live_stream_delete(self, filter_id: int):
+        """ live_stream_delete
             MINIMUM_API_VERSION=6.0.0
 
-            Perform actions on local catalog folders.
-            Single folder versions of catalog add, clean and verify.
-            Make sure you remember to urlencode those folder names!
+            Delete an existing live_stream (radio station). (if it exists)
 
             INPUTS
-            * folder        = (string) urlencode(FULL path to local folder)
-            * task        = (string) 'add'|'clean'|'verify'|'remove'
-            * catalog_id  = (integer) $catalog_id
+            * filter_id = (integer) object_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'catalog_folder'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'folder': folder,
-                'task': task,
-                'catalog': catalog_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id}
+        return self.api_request('live_stream_delete', data)
 
-    def podcasts(self, filter_str=False,
-                 exact=False, offset=0, limit=0, sort=False, cond=False):
-        """ podcasts
+    def labels(self, filter_str=False,
+               exact=False, offset=0, limit=0, sort=False, cond=False):
+        """ labels
             MINIMUM_API_VERSION=420000
 
+            Returns labels based on the specified filter_str
+
             INPUTS
-            * filter_str = (string) search the name of a podcast //optional
+            * filter_str = (string) search the name of a label //optional
             * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
             * offset     = (integer) //optional
             * limit      = (integer) //optional
             * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
             * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcasts'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
+        data = {'filter': filter_str,
                 'exact': exact,
                 'offset': str(offset),
                 'limit': str(limit),
                 'sort': sort,
                 'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('labels', data, ('filter', 'exact', 'sort', 'cond'))
 
-    def podcast(self, filter_id: int, include=False):
-        """ podcast
+    def label(self, filter_id: int):
+        """ label
             MINIMUM_API_VERSION=420000
 
-            Return podcasts by UID
+            returns a single label
 
             INPUTS
-            * filter_id   = (integer) UID of Podcast
-            * include     = (string) 'episodes' Include episodes with the response //optional
+            * filter_id   = (integer) $label_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcast'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'include': include}
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id}
+        return self.api_request('label', data)
 
-    def podcast_create(self, url, catalog_id):
-        """ podcast_create
+    def label_artists(self, filter_id: int, sort=False, cond=False):
+        """ label_artists
             MINIMUM_API_VERSION=420000
 
-            Return podcasts by UID
+            returns a artists for a single label ID
 
             INPUTS
-            * url         = (string) rss url for podcast
-            * catalog_id  = (string) podcast catalog
+            * filter_id = (integer) $label_id
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcast_create'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'url': url,
-                'catalog': catalog_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('label_artists', data, ('sort', 'cond'))
 
-    def podcast_edit(self, filter_id: int,
-                     feed=False, title=False, website=False,
-                     description=False, generator=False, copyright_str=False):
-        """ podcast_edit
-            MINIMUM_API_VERSION=420000
+    def get_bookmark(self, filter_id: str, object_type: str, include=False, show_all=False):
+        """ get_bookmark
+            MINIMUM_API_VERSION=5.0.0
 
-            Update the description and/or expiration date for an existing podcast.
-            Takes the podcast id to update with optional description and expires parameters.
+            Get the bookmark from it's object_id and object_type.
 
             INPUTS
-            * filter_id     = (integer) $podcast_id
-            * feed          = (string) feed url (xml!) //optional
-            * title         = (string) title string //optional
-            * website       = (string) source website url //optional
-            * description   = (string) //optional
-            * generator     = (string) //optional
-            * copyright_str = (string) //optional
+            * filter_id   = (integer) object_id
+            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
+            * include     = (integer) 0,1, if true include the object in the bookmark //optional
+            * all         = (integer) 0,1, if true every bookmark related to the object //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcast_edit'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'feed': feed,
-                'title': title,
-                'website': website,
-                'description': description,
-                'generator': generator,
-                'copyright': copyright_str}
-        if not feed:
-            data.pop('feed')
-        if not title:
-            data.pop('title')
-        if not website:
-            data.pop('website')
-        if not description:
-            data.pop('description')
-        if not generator:
-            data.pop('generator')
-        if not copyright:
-            data.pop('copyright')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'type': object_type,
+                'include': include,
+                'all': show_all}
+        return self.api_request('get_bookmark', data, ('include', 'all'))
 
-    def podcast_delete(self, filter_id: int):
-        """ podcast_delete
-            MINIMUM_API_VERSION=420000
+    def bookmarks(self, client=False, include=False):
+        """ bookmarks
+            MINIMUM_API_VERSION=5.0.0
 
-            Delete an existing podcast.
+            Get information about bookmarked media this user is allowed to manage.
 
             INPUTS
-            * filter_id   = (integer) UID of podcast to delete
+            * client  = (string) filter by bookmark_id //optional
+            * include = (integer) 0,1, if true include the object in the bookmark //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcast_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'client': client,
+                'include': include}
+        return self.api_request('bookmarks', data, ('client', 'include'))
 
-    def podcast_episodes(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ podcast_episodes
-            MINIMUM_API_VERSION=420000
+    def bookmark(self, filter_id: str, include=False):
+        """ bookmark
+            MINIMUM_API_VERSION=6.1.0
+
+            Get information about bookmarked media this user is allowed to manage.
 
             INPUTS
-            * filter_id = (string) UID of podcast
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * filter  = (string) bookmark_id
+            * include = (integer) 0,1, if true include the object in the bookmark //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcast_episodes'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'include': include}
+        return self.api_request('bookmark', data, ('include',))
 
-    def podcast_episode(self, filter_id: int):
-        """ podcast_episode
-            MINIMUM_API_VERSION=420000
+    def bookmark_create(self, filter_id, object_type,
+                        position: int = 0, client: str = CLIENT_NAME, date=False, include=False):
+        """ bookmark_create
+            MINIMUM_API_VERSION=5.0.0
 
-            Return podcast_episodes by UID
+            Create a placeholder for the current media that you can return to later.
 
             INPUTS
-            * filter_id   = (integer) UID of Podcast
+            * filter_id   = (integer) object_id
+            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
+            * position    = (integer) current track time in seconds
+            * client      = (string) Agent string. (Default: 'python3-ampache') //optional
+            * date        = (integer) update time (Default: UNIXTIME()) //optional
+            * include     = (integer) 0,1, if true include the object in the bookmark //optional
+        """
+        data = {'filter': filter_id,
+                'type': object_type,
+                'position': position,
+                'client': client,
+                'date': date,
+                'include': include}
+        return self.api_request('bookmark_create', data, ('client', 'date'))
+
+    def bookmark_edit(self, filter_id, object_type,
+                      position: int = 0, client: str = CLIENT_NAME, date=False, include=False):
+        """ bookmark_edit
+            MINIMUM_API_VERSION=5.0.0
+
+            Edit a placeholder for the current media that you can return to later.
+
+            INPUTS
+            * filter_id   = (integer) object_id
+            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
+            * position    = (integer) current track time in seconds
+            * client      = (string) Agent string. (Default: 'python3-ampache') //optional
+            * date        = (integer) update time (Default: UNIXTIME()) //optional
+            * include     = (integer) 0,1, if true include the object in the bookmark //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcast_episode'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'type': object_type,
+                'position': position,
+                'client': client,
+                'date': date,
+                'include': include}
+        return self.api_request('bookmark_edit', data, ('client', 'date', 'include'))
 
-    def podcast_episode_delete(self, filter_id: int):
-        """ podcast_episode_delete
-            MINIMUM_API_VERSION=420000
+    def bookmark_delete(self, filter_id: int, object_type=False):
+        """ bookmark_delete
+            MINIMUM_API_VERSION=5.0.0
 
-            Delete an existing podcast_episode.
+            Delete an existing bookmark. (if it exists)
 
             INPUTS
-            * filter_id   = (integer) UID of podcast_episode to delete
+            * filter_id   = (integer) object_id
+            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'podcast_episode_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'type': object_type}
+        return self.api_request('bookmark_delete', data)
 
-    def update_podcast(self, filter_id: int):
-        """ update_podcast
-            MINIMUM_API_VERSION=420000
+    def deleted_songs(self, offset=0, limit=0):
+        """ deleted_songs
+            MINIMUM_API_VERSION=500000
 
-            Sync and download new podcast episodes
+            Returns deleted_song
 
             INPUTS
-            * filter_id   = (integer) UID of Podcast
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'update_podcast'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'offset': str(offset),
+                'limit': str(limit)}
+        return self.api_request('deleted_songs', data)
 
-    def search_songs(self, filter_str, offset=0, limit=0):
-        """ search_songs
-            MINIMUM_API_VERSION=380001
+    def deleted_podcast_episodes(self, offset=0, limit=0):
+        """ deleted_podcast_episodes
+            MINIMUM_API_VERSION=500000
 
-            This searches the songs and returns... songs
+            Returns deleted_podcast_episode
 
             INPUTS
-            * filter_str  = (string) search the name of a song
             * offset      = (integer) //optional
             * limit       = (integer) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'search_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'offset': str(offset),
+        data = {'offset': str(offset),
                 'limit': str(limit)}
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('deleted_podcast_episodes', data)
 
-    def search_rules(self, filter_str):
-        """ search_rules
-            MINIMUM_API_VERSION=6.8.0
+    def deleted_videos(self, offset=0, limit=0):
+        """ deleted_videos
+            MINIMUM_API_VERSION=500000
 
-            Print a list of valid search rules for your search type
+            Returns deleted_video
 
             INPUTS
-            * filter_str = (string) 'song', 'album', 'song_artist', 'album_artist', 'artist', 'label', 'playlist', 'podcast', 'podcast_episode', 'genre', 'user', 'video'
+            * offset      = (integer) //optional
+            * limit       = (integer) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'search_rules'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'offset': str(offset),
+                'limit': str(limit)}
+        return self.api_request('deleted_videos', data)
 
-    def search(self, rules, operator='and', object_type='song', offset=0, limit=0, random=0):
-        """ search
+    """
+    --------------------
+    BACKCOMPAT FUNCTIONS
+    --------------------
+    """
+
+    def advanced_search(self, rules,
+                        operator='and', object_type='song', offset=0, limit=0, random=0):
+        """ advanced_search
             MINIMUM_API_VERSION=380001
 
             Perform an advanced search given passed rules
@@ -2408,56 +5624,14 @@ class API(object):
             * limit       = (integer) //optional
             * random      = (integer) 0|1' //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'search'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'operator': operator,
-                'type': object_type,
-                'offset': offset,
-                'limit': limit,
-                'random': random}
-        count = 0
-        # inputs  [rule_1, rule_1_operator, rule_1_input]
-        # example ['year', 2, 1999]
-        for item in rules:
-            count = count + 1
-            data['rule_' + str(count)] = item[0]
-            data['rule_' + str(count) + '_operator'] = item[1]
-            data['rule_' + str(count) + '_input'] = item[2]
-            if item[0] == 'metadata':
-                data['rule_' + str(count) + '_subtype'] = item[3]
-        return self.get_request(ampache_url, data, api_method)
-
-    def search_group(self, rules,
-                     operator='and', object_type='all', offset=0, limit=0, random=0):
-        """ search_group
-            MINIMUM_API_VERSION=6.3.0
-
-            Perform a search given passed rules and return matching objects in a group.
-            If the rules to not exist for the object type or would return the entire table they will not return objects
-
-            Refer to the wiki for further information on rule_* types and data
-            https://ampache.org/api/api-xml-methods
-            https://ampache.org/api/api-json-methods
-
-            INPUTS
-            * rules       = (array) = [[rule_1,rule_1_operator,rule_1_input],[rule_2,rule_2_operator,rule_2_input],[etc]]
-            * operator    = (string) 'and'|'or' (whether to match one rule or all) //optional
-            * object_type = (string)  //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * random      = (integer) 0|1' //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'search_group'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'operator': operator,
+        ampache_url = self.get_server_url()
+        api_method = 'advanced_search'
+        data = {'operator': operator,
                 'type': object_type,
                 'offset': offset,
                 'limit': limit,
                 'random': random}
+        data = self.get_data(api_method, data)
         count = 0
         # inputs  [rule_1, rule_1_operator, rule_1_input]
         # example ['year', 2, 1999]
@@ -2470,2748 +5644,1748 @@ class API(object):
                 data['rule_' + str(count) + '_subtype'] = item[3]
         return self.get_request(ampache_url, data, api_method)
 
-    def videos(self, filter_str=False,
-               exact=False, offset=0, limit=0, sort=False, cond=False):
-        """ videos
+    def tags(self, filter_str=False,
+             exact=False, offset=0, limit=0, sort=False, cond=False):
+        """ tags
             MINIMUM_API_VERSION=380001
 
-            This returns video objects!
+            This returns the tags (Tags) based on the specified filter
 
             INPUTS
-            * filter_str = (string) search the name of a video //optional
+            * filter_str = (string) search the name of a tag //optional
             * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
             * offset     = (integer) //optional
             * limit      = (integer) //optional
             * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
             * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'videos'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'exact': exact,
+        data = {'exact': exact,
                 'filter': filter_str,
                 'offset': str(offset),
                 'limit': str(limit),
                 'sort': sort,
                 'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
-
-    def video(self, filter_id: int):
-        """ video
-            MINIMUM_API_VERSION=380001
-
-            This returns a single video
-
-            INPUTS
-            * filter_id   = (integer) $video_id
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'video'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
-
-    def localplay(self, command, oid=False, otype=False, clear=False):
-        """ localplay
-            MINIMUM_API_VERSION=380001
-            CHANGED_IN_API_VERSION=5.0.0
-
-            This is for controlling localplay
-
-            INPUTS
-            * command     = (string) 'next', 'prev', 'stop', 'play', 'pause', 'add', 'volume_up',
-                                     'volume_down', 'volume_mute', 'delete_all', 'skip', 'status'
-            * oid         = (integer) object_id //optional
-            * otype       = (string) 'Song', 'Video', 'Podcast_Episode', 'Channel',
-                                     'Broadcast', 'Democratic', 'Live_Stream' //optional
-            * clear       = (integer) 0,1 Clear the current playlist before adding //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'localplay'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'command': command,
-                'oid': oid,
-                'type': otype,
-                'clear': clear}
-        if not oid:
-            data.pop('oid')
-        if not otype:
-            data.pop('type')
-        if not clear:
-            data.pop('clear')
-        return self.get_request(ampache_url, data, api_method)
-
-    def localplay_songs(self):
-        """ localplay_songs
-            MINIMUM_API_VERSION=5.0.0
-
-            Get the list of songs in your localplay playlist
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'localplay_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION}
-        return self.get_request(ampache_url, data, api_method)
-
-    def democratic(self, method, oid):
-        """ democratic
-            MINIMUM_API_VERSION=380001
-
-            This is for controlling democratic play
-
-            INPUTS
-            * oid         = (integer) object_id (song_id|playlist_id)
-            * method      = (string) 'vote'|'devote'|'playlist'|'play'
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'democratic'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'oid': oid,
-                'method': method}
-        return self.get_request(ampache_url, data, api_method)
-
-    def stats(self, object_type, filter_str='random',
-              username=False, user_id=False, offset=0, limit=0, sort=False, cond=False):
-        """ stats
-            MINIMUM_API_VERSION=380001
-            CHANGED_IN_API_VERSION=400001
-
-            This gets library stats for different object types. When filter is null get some random items instead
-
-            INPUTS
-            * object_type = (string) 'song'|'album'|'artist'
-            * filter_str  = (string) 'newest'|'highest'|'frequent'|'recent'|'flagged'|'random'
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * user_id     = (integer) //optional
-            * username    = (string) //optional
-            * cond        = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort        = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'stats'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'filter': filter_str,
-                'offset': offset,
-                'limit': limit,
-                'user_id': user_id,
-                'username': username,
-                'sort': sort,
-                'cond': cond}
-        if not username:
-            data.pop('username')
-        if not user_id:
-            data.pop('user_id')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
-
-    def users(self, sort=False, cond=False):
-        """ users
-            MINIMUM_API_VERSION=5.0.0
-
-            Get ids and usernames for your site users
-
-            INPUTS
-            * cond = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'users'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('tags', data, ('exact', 'filter', 'sort', 'cond'))
 
-    def user(self, username: str):
-        """ user
+    def tag(self, filter_id: int):
+        """ tag
             MINIMUM_API_VERSION=380001
 
-            This get an user public information
+            This returns a single tag based on UID
 
             INPUTS
-            * username    =
+            * filter_id = (integer) $tag_id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id}
+        return self.api_request('tag', data)
 
-    def followers(self, username: str, sort=False, cond=False):
-        """ followers
+    def tag_artists(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ tag_artists
             MINIMUM_API_VERSION=380001
 
-            This get an user followers
+            This returns the artists associated with the tag in question as defined by the UID
 
             INPUTS
-            * username =
-            * cond     = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort     = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * filter_id = (integer) $tag_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'followers'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username,
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
                 'sort': sort,
                 'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return self.api_request('tag_artists', data, ('sort', 'cond'))
 
-    def following(self, username: str):
-        """ following
+    def tag_albums(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ tag_albums
             MINIMUM_API_VERSION=380001
 
-            This get the user list followed by an user
+            This returns the albums associated with the tag in question
 
             INPUTS
-            * username    =
+            * filter_id = (integer) $tag_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'following'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username}
-        return self.get_request(ampache_url, data, api_method)
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('tag_albums', data, ('sort', 'cond'))
 
-    def toggle_follow(self, username: str):
-        """ toggle_follow
+    def tag_songs(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
+        """ tag_songs
             MINIMUM_API_VERSION=380001
 
-            This follow/unfollow an user
+            returns the songs for this tag
 
             INPUTS
-            * username    =
+            * filter_id = (integer) $tag_id
+            * offset    = (integer) //optional
+            * limit     = (integer) //optional
+            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
+            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'toggle_follow'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username}
-        return self.get_request(ampache_url, data, api_method)
-
-    def last_shouts(self, username, limit=0):
-        """ last_shouts
-            MINIMUM_API_VERSION=380001
+        data = {'filter': filter_id,
+                'offset': str(offset),
+                'limit': str(limit),
+                'sort': sort,
+                'cond': cond}
+        return self.api_request('tag_songs', data, ('sort', 'cond'))
 
-            This get the latest posted shouts
+    def user_update(self, username, password=False, fullname=False, email=False,
+                    website=False, state=False, city=False, disable=False, maxbitrate=False,
+                    fullname_public=False, reset_apikey=False, reset_streamtoken=False, clear_stats=False):
+        """ user_update
+            MINIMUM_API_VERSION=6.0.0
 
-            INPUTS
-            * username    =
-            * limit       = (integer) //optional
+            Update an existing user. Backcompat function for api6 (Use user_edit)
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'last_shouts'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username,
-                'limit': limit}
-        return self.get_request(ampache_url, data, api_method)
+        return self.user_edit(username, password, fullname, email,
+                              website, state, city, disable, maxbitrate,
+                              fullname_public, reset_apikey, reset_streamtoken, clear_stats)
 
-    def player(self, filter_str, object_type='song', state='play', play_time=0, client=CLIENT_NAME):
-        """ player
-            MINIMUM_API_VERSION=6.4.0
+    @staticmethod
+    def get_actions():
+        """ get_actions
+
+            Return every API function that execute() can run as a dict of the function name
+            and its 'params' (in call order), 'required' params, 'defaults' and minimum API 'version'.
+            The registry is read from the function signatures and docstrings on the first call.
+        """
+        if not ACTIONS:
+            actions = dict()
+            for name, function in vars(API).items():
+                if not inspect.isfunction(function) or not 'MINIMUM_API_VERSION=' in (function.__doc__ or ''):
+                    continue
+                version = function.__doc__.split('MINIMUM_API_VERSION=')[1].split()[0]
+                if not '.' in version:
+                    version = version[0] + '.' + version[1] + '.' + version[2]
+                parameters = list(inspect.signature(function).parameters.values())[1:]
+                defaults = {parameter.name: parameter.default for parameter in parameters
+                            if not parameter.default is inspect.Parameter.empty}
+                for key, value in EXECUTE_DEFAULTS.get(name, {}).items():
+                    if value is inspect.Parameter.empty:
+                        defaults.pop(key, None)
+                    else:
+                        defaults[key] = value
+                actions[name] = {'params': tuple(parameter.name for parameter in parameters),
+                                 'required': tuple(parameter.name for parameter in parameters
+                                                   if not parameter.name in defaults),
+                                 'defaults': defaults,
+                                 'version': version}
+            ACTIONS.update(actions)
+        return ACTIONS
+
+    def get_action_params(self, method: str, params=None):
+        """ get_action_params
+
+            Merge execute() parameters with the defaults for the function.
+            Unknown parameters are ignored and a missing required parameter returns False.
+
+            INPUTS
+            * method = (string) API function name
+            * params = (dict) execute() parameters //optional
+        """
+        action = self.get_actions().get(method)
+        if not action:
+            return False
+        arguments = dict(action['defaults'])
+        if params:
+            arguments.update(params)
+        # every parameter is known when nothing is missing and nothing was added
+        if len(arguments) == len(action['params']):
+            for key in action['required']:
+                if not key in arguments:
+                    break
+            else:
+                return arguments
+        aliases = EXECUTE_ALIASES.get(method, {})
+        arguments = dict(action['defaults'])
+        for key, value in (params or {}).items():
+            if key in aliases and not aliases[key] in params:
+                key = aliases[key]
+            if key in action['params']:
+                arguments[key] = value
+            elif self.AMPACHE_DEBUG:
+                print(method + ': ignored unknown parameter ' + key)
+        for key in action['required']:
+            if not key in arguments:
+                if self.AMPACHE_DEBUG:
+                    print(method + ': missing required parameter ' + key)
+                return False
+        return arguments
 
-            Inform the server about the state of your client. (Song you are playing, Play/Pause state, etc.)
+    def execute(self, method: str, params=None):
+        """ execute
 
-            filter_str  = (integer) $object_id
-            object_type = (string)  $object_type ('song', 'podcast_episode', 'video'), DEFAULT 'song'//optional
-            state       = (string)  'play', 'stop', DEFAULT 'play' //optional
-            play_time   = (integer) current song time in whole seconds, DEFAULT 0 //optional
-            client      = (string)  $agent, DEFAULT 'python3-ampache' //optional
+            Run an API function by name with a dict of parameters.
+            Functions are looked up in get_actions() and missing parameters use the function defaults.
+
+            INPUTS
+            * method = (string) API function name
+            * params = (dict) function parameters //optional
         """
-        action = self.player.__name__
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        data = {'action': action,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'type': object_type,
-                'state': state,
-                'time': play_time,
-                'client': client}
-        headers = {}
-        if hasattr(self, 'AMPACHE_BEARER_TOKEN') and self.AMPACHE_BEARER_TOKEN:
-            headers['Authorization'] = f'Bearer {self.AMPACHE_BEARER_TOKEN}'
-            data.pop('auth', None)
-        data = urllib.parse.urlencode(data)
-        full_url = ampache_url + '?' + data
-        ampache_response = self.fetch_url(full_url, self.AMPACHE_API, action)
-        if isinstance(ampache_response, bool):
+        if params is None:
+            params = {}
+        match method:
+            case 'handshake':
+                if not "version" in params:
+                    params["version"] = self.AMPACHE_VERSION
+                if not "ampache_url" in params:
+                    params["ampache_url"] = self.AMPACHE_URL
+                if not "ampache_api" in params:
+                    params["ampache_api"] = self.AMPACHE_KEY
+                if not "ampache_user" in params:
+                    params["ampache_user"] = self.AMPACHE_USER
+                if "timestamp" in params and not params["timestamp"] == 0:
+                    return self.handshake(params["ampache_url"],
+                                          self.encrypt_password(params["ampache_api"], int(params["timestamp"])),
+                                          params["ampache_user"], int(params["timestamp"]), params["version"])
+                return self.handshake(params["ampache_url"],
+                                      self.encrypt_string(params["ampache_api"], params["ampache_user"]),
+                                      False, False, params["version"])
+            case 'lost_password':
+                if "user" in params and "email" in params:
+                    params["auth"] = self.encrypt_string(params["email"], params["user"])
+                return self.lost_password(params["auth"])
+            case 'ping':
+                if not "ampache_url" in params:
+                    params["ampache_url"] = self.AMPACHE_URL
+                if not "ampache_api" in params:
+                    params["ampache_api"] = self.AMPACHE_SESSION
+                return self.ping(params["ampache_url"], params["ampache_api"])
+        if not method in self.get_actions():
+            return None
+        arguments = self.get_action_params(method, params)
+        if arguments is False:
             return False
-        return self.return_data(ampache_response)
+        return getattr(self, method)(**arguments)
 
-    def now_playing(self):
-        """  now_playing
-             MINIMUM_API_VERSION=6.3.1
 
-             Get what is currently being played by all users.
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'now_playing'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION}
-        return self.get_request(ampache_url, data, api_method)
+class AsyncAPI(API):
+    """ AsyncAPI
 
-    def rate(self, object_type, object_id, rating):
-        """ rate
-            MINIMUM_API_VERSION=380001
+        asyncio version of API with the same functions, inputs and return data.
+        Every API function returns an awaitable and all requests share one pooled AsyncTransport
+        so hundreds of calls can be in flight on a single event loop.
 
-            This rates a library item
+        async with ampache.AsyncAPI() as ampache_connection:
+            songs = await ampache_connection.execute('songs', {'limit': 10})
+    """
 
-            INPUTS
-            * object_type = (string) 'song'|'album'|'artist'
-            * object_id   = (integer) $object_id
-            * rating      = (integer) 0|1|2|3|4|5
-        """
-        if isinstance(rating, str):
-            if rating.isdigit():
-                rating = int(rating)
-            else:
-                rating = -1
-        if (rating < 0 or rating > 5) or not (
-                object_type == 'song' or object_type == 'album' or object_type == 'artist'):
-            return False
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'rate'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'id': object_id,
-                'rating': rating}
-        return self.get_request(ampache_url, data, api_method)
+    def __init__(self):
+        super().__init__()
+        self.AMPACHE_TRANSPORT = AsyncTransport()
+        self.session_lock = asyncio.Lock()
 
-    def flag(self, object_type, object_id, flagbool, date=False):
-        """ flag
-            MINIMUM_API_VERSION=400001
+    async def __aenter__(self):
+        return self
 
-            This flags a library item as a favorite
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
 
-            Setting flagbool to true (1) will set the flag
-            Setting flagbool to false (0) will remove the flag
+    async def close(self):
+        """ close
 
-            INPUTS
-            * object_type = (string) 'song'|'album'|'artist'
-            * object_id   = (integer) $object_id
-            * flagbool    = (boolean|integer) (True,False | 0|1)
-            * date        = (integer) UNIXTIME() //optional
+            Close the pooled connections of the transport
         """
-        if bool(flagbool):
-            flag_state = 1
-        else:
-            flag_state = 0
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'flag'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'id': object_id,
-                'flag': flag_state,
-                'date': date}
-        if not date:
-            data.pop('date')
-        return self.get_request(ampache_url, data, api_method)
+        await self.AMPACHE_TRANSPORT.close()
 
-    def record_play(self, object_id, user_id=False, client=CLIENT_NAME, date=False):
-        """ record_play
-            MINIMUM_API_VERSION=400001
+    async def fetch_url(self, full_url: str, api_format: str, method: str, headers: dict = None):
+        """ fetch_url
 
-            Take a song_id and update the object_count and user_activity table with a play.
-            This allows other sources to record play history to ampache
+            Same as API.fetch_url but using the AsyncTransport, a retry waits with asyncio.sleep
+            Returns False when the request fails and keeps the error for get_last_error()
 
             INPUTS
-            * object_id   = (integer) $object_id
-            * user_id     = (integer) $user_id //optional
-            * client      = (string) $agent //optional
-            * date        = (integer) UNIXTIME() //optional
+            * full_url   = (string) url to fetch
+            * api_format = (string) 'xml'|'json'
+            * method     = (string)
+            * headers    = (dict) optional HTTP headers
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'record_play'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'id': object_id,
-                'user': user_id,
-                'client': client,
-                'date': date}
-        if not user_id:
-            data.pop('user')
-        if not date:
-            data.pop('date')
-        return self.get_request(ampache_url, data, api_method)
+        attempt = 0
+        while True:
+            if self.AMPACHE_CIRCUIT_BREAKER and not self.AMPACHE_CIRCUIT_BREAKER.allow():
+                return self.set_error(CircuitOpenError('Too many failed requests to the server', method))
+            try:
+                async with self.limit_request(method):
+                    ampache_response = await self.AMPACHE_TRANSPORT.fetch(full_url, headers)
+            except self.AMPACHE_TRANSPORT.errors + (ValueError,) as exception:
+                error = self.get_transport_error(exception, method)
+            else:
+                self.transport_state.error = None
+                if self.AMPACHE_CIRCUIT_BREAKER:
+                    self.AMPACHE_CIRCUIT_BREAKER.success()
+                if self.AMPACHE_DEBUG:
+                    self.debug_response(full_url, api_format, method, ampache_response)
+                return ampache_response
+            if not self.is_retry(method, error, attempt):
+                return self.set_error(error)
+            await asyncio.sleep(self.get_retry_delay(attempt))
+            attempt += 1
+
+    def limit_request(self, action: str):
+        """ limit_request
+
+            Return the AMPACHE_RATE_LIMITER async context manager that wraps each request
+
+            INPUTS
+            * action = (string) API function name
+        """
+        if self.AMPACHE_RATE_LIMITER:
+            return self.AMPACHE_RATE_LIMITER.async_limit(action)
+        return contextlib.nullcontext()
+
+    async def get_request(self, ampache_url, data, api_method):
+        """ get_request
+
+            Send an API request or return the cached response.
+            A rejected session (4701) is refreshed and the request is sent once more with the new session
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * api_method  = (string) API function name
+        """
+        api_format = self.get_format(ampache_url)
+        self.transport_state.error = None
+        cache_key = False
+        if self.AMPACHE_CACHE:
+            cache_key = self.AMPACHE_CACHE.get_key(ampache_url, data, self.get_cache_user())
+        if cache_key:
+            cached_response = self.AMPACHE_CACHE.get(cache_key)
+            if cached_response is not None:
+                return self.return_data(cached_response, api_format)
+        data = await self.check_session(data, api_method)
+        full_url, headers = self.request_url(ampache_url, data)
+        request_response = await self.fetch_url(full_url, api_format, api_method, headers)
+        if isinstance(request_response, bool):
+            return False
+        result = self.cache_response(cache_key, api_method, request_response, api_format)
+        if self.is_session_error(data, api_method, result) and await self.refresh_session(data['auth']):
+            full_url, headers = self.request_url(ampache_url, dict(data, auth=self.AMPACHE_SESSION))
+            request_response = await self.fetch_url(full_url, api_format, api_method, headers)
+            if isinstance(request_response, bool):
+                return False
+            result = self.cache_response(cache_key, api_method, request_response, api_format)
+        return self.check_result(result, api_method, api_format)
+
+    async def check_session(self, data: dict, api_method: str):
+        """ check_session
+
+            Same as API.check_session, the session is refreshed without blocking the event loop
+
+            INPUTS
+            * data       = (dict) url parameters
+            * api_method = (string) API function name
+        """
+        if not self.uses_session(data, api_method):
+            return data
+        if self.is_session_expiring():
+            await self.refresh_session(data['auth'], True)
+        if self.AMPACHE_SESSION and not data['auth'] == self.AMPACHE_SESSION:
+            return dict(data, auth=self.AMPACHE_SESSION)
+        return data
+
+    async def refresh_session(self, auth, check_ping=False):
+        """ refresh_session
+
+            Same as API.refresh_session, only one task sends the handshake and the others wait for it
+
+            INPUTS
+            * auth       = (string) session auth that was used
+            * check_ping = (boolean) ping first as the server may have extended the session //optional
+        """
+        async with self.session_lock:
+            if self.AMPACHE_SESSION and not auth == self.AMPACHE_SESSION:
+                return self.AMPACHE_SESSION
+            if check_ping and self.AMPACHE_SESSION and not self.is_session_expiring():
+                return self.AMPACHE_SESSION
+            if check_ping and self.AMPACHE_SESSION and await self.ping(self.AMPACHE_URL, self.AMPACHE_SESSION):
+                if not self.is_session_expiring():
+                    return self.AMPACHE_SESSION
+            result = self.renew_session()
+            if inspect.isawaitable(result):
+                return await result
+            return result
+
+    async def revalidate_request(self, ampache_url, data, api_method, playlist_id):
+        """ revalidate_request
+
+            Same as API.revalidate_request, playlist_hash and the song list are awaited
+
+            INPUTS
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * api_method  = (string) 'playlist_songs'|'smartlist_songs'
+            * playlist_id = (string) playlist_hash filter e.g. '4' or 'smart_5'
+        """
+        if not self.AMPACHE_REVALIDATE or 'random' in data:
+            return await self.get_request(ampache_url, data, api_method)
+        md5 = self.get_hash(await self.playlist_hash(playlist_id))
+        if not md5:
+            return await self.get_request(ampache_url, data, api_method)
+        api_format = self.get_format(ampache_url)
+        store_key = self.get_store_key(ampache_url, data, api_method)
+        stored = self.get_stored_playlist(store_key)
+        if stored and stored[0] == md5:
+            return self.return_data(stored[1], api_format)
+        data = await self.check_session(data, api_method)
+        full_url, headers = self.request_url(ampache_url, data)
+        request_response = await self.fetch_url(full_url, api_format, api_method, headers)
+        if isinstance(request_response, bool):
+            return False
+        result = self.store_playlist(store_key, md5, request_response, api_format)
+        if self.is_session_error(data, api_method, result) and await self.refresh_session(data['auth']):
+            full_url, headers = self.request_url(ampache_url, dict(data, auth=self.AMPACHE_SESSION))
+            request_response = await self.fetch_url(full_url, api_format, api_method, headers)
+            if isinstance(request_response, bool):
+                return False
+            result = self.store_playlist(store_key, md5, request_response, api_format)
+        return self.check_result(result, api_method, api_format)
 
-    def scrobble(self, title, artist_name, album_name,
-                 mbtitle=False, mbartist=False, mbalbum=False, stime=False,
-                 client=CLIENT_NAME):
-        """ scrobble
-            MINIMUM_API_VERSION=400001
+    async def get_file(self, ampache_url, data, destination, make_dirs=False, resume=False, progress=None):
+        """ get_file
 
-            Search for a song using text info and then record a play if found.
-            This allows other sources to record play history to ampache
+            Same as API.get_file, the AsyncTransport writes the body to 'destination.part'
 
             INPUTS
-            * title       = (string) song title
-            * artist_name = (string) artist name
-            * album_name  = (string) album name
-            * mbtitle     = (string) song mbid //optional
-            * mbartist    = (string) artist mbid //optional
-            * mbalbum     = (string) album mbid //optional
-            * stime       = (integer) UNIXTIME() //optional
-            * client      = (string) //optional
+            * ampache_url = (string) server url e.g. 'https://music.com.au/server/xml.server.php'
+            * data        = (dict) url parameters
+            * destination = (string) full file path
+            * make_dirs   = (boolean) create the destination folder if missing //optional
+            * resume      = (boolean) continue 'destination.part' with an HTTP Range request //optional
+            * progress    = (function) called with (bytes_written, total_bytes) after each chunk //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'scrobble'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'client': client,
-                'date': str(stime),
-                'song': title,
-                'artist': artist_name,
-                'album': album_name,
-                'songmbid': mbtitle,
-                'albummbid': mbalbum,
-                'artistmbid': mbartist}
-        if not mbtitle:
-            data.pop('songmbid')
-        if not mbalbum:
-            data.pop('albummbid')
-        if not mbartist:
-            data.pop('artistmbid')
-        return self.get_request(ampache_url, data, api_method)
-
-    def timeline(self, username, limit=0, since=0):
-        """ timeline
-            MINIMUM_API_VERSION=380001
+        if make_dirs:
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+        elif not os.path.isdir(os.path.dirname(destination)):
+            return False
+        self.transport_state.error = None
+        data = await self.check_session(data, data['action'])
+        full_url, headers = self.request_url(ampache_url, data)
+        part_file = destination + '.part'
+        attempt = 0
+        while True:
+            if self.AMPACHE_CIRCUIT_BREAKER and not self.AMPACHE_CIRCUIT_BREAKER.allow():
+                return self.discard_file(part_file, resume,
+                                         CircuitOpenError('Too many failed requests to the server', data['action']))
+            try:
+                async with self.limit_request(data['action']):
+                    complete = await self.AMPACHE_TRANSPORT.save(full_url, headers, part_file,
+                                                                 self.AMPACHE_CHUNK_SIZE, resume, progress)
+            except self.AMPACHE_TRANSPORT.errors + (ValueError,) as exception:
+                error = self.get_transport_error(exception, data['action'])
+            except OSError as exception:
+                return self.discard_file(part_file, resume, AmpacheError(str(exception), data['action']))
+            else:
+                if complete:
+                    if self.AMPACHE_CIRCUIT_BREAKER:
+                        self.AMPACHE_CIRCUIT_BREAKER.success()
+                    os.replace(part_file, destination)
+                    return True
+                error = TransportError('The file is incomplete', data['action'])
+            if not self.is_retry(data['action'], error, attempt):
+                return self.discard_file(part_file, resume, error)
+            await asyncio.sleep(self.get_retry_delay(attempt))
+            attempt += 1
+
+    async def handshake(self, ampache_url: str, ampache_api: str, ampache_user=False,
+                        timestamp: int = 0, version: str = '6.6.0'):
+        """ handshake
 
-            This get a user timeline
+            Await a new handshake like API.handshake
 
             INPUTS
-            * username    = (string)
-            * limit       = (integer) //optional
-            * since       = (integer) UNIXTIME() //optional
+            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
+            * ampache_api = (string) encrypted apikey OR password if using password auth
+            * user        = (string) username //optional
+            * timestamp   = (integer) UNIXTIME() //optional
+            * version     = (string) //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'timeline'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username,
-                'limit': limit,
-                'since': since}
-        return self.get_request(ampache_url, data, api_method)
+        ampache_url, data, api_method = self.handshake_request(ampache_url, ampache_api, ampache_user,
+                                                               timestamp, version)
+        return self.handshake_response(await self.get_request(ampache_url, data, api_method))
 
-    def friends_timeline(self, limit=0, since=0):
-        """ friends_timeline
-            MINIMUM_API_VERSION=380001
+    async def ping(self, ampache_url: str, ampache_api=False, version: str = '6.6.0'):
+        """ ping
 
-            This get current user friends timeline
+            Await a ping like API.ping
 
             INPUTS
-            * limit       = (integer) //optional
-            * since       = (integer) UNIXTIME() //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'friends_timeline'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'limit': limit,
-                'since': since}
-        return self.get_request(ampache_url, data, api_method)
+            * ampache_url = (string) Full Ampache URL e.g. 'https://music.com.au'
+            * ampache_api = (string) encrypted apikey //optional
+        """
+        ampache_url, data, api_method = self.ping_request(ampache_url, ampache_api, version)
+        return self.ping_response(ampache_url, ampache_api, await self.get_request(ampache_url, data, api_method))
 
-    def update_from_tags(self, object_type, object_id):
-        """ update_from_tags
-            MINIMUM_API_VERSION=400001
+    async def execute(self, method: str, params=None):
+        """ execute
 
-            updates a single album,artist,song from the tag data
+            Run an API function by name with a dict of parameters and await the result
 
             INPUTS
-            * object_type = (string) 'artist'|'album'|'song'
-            * object_id   = (integer) $artist_id, $album_id, $song_id
+            * method = (string) API function name
+            * params = (dict) function parameters //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'update_from_tags'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'id': object_id}
-        return self.get_request(ampache_url, data, api_method)
+        result = super().execute(method, params)
+        if inspect.isawaitable(result):
+            return await result
+        return result
 
-    def update_art(self, object_type, object_id, overwrite=False):
-        """ update_art
-            MINIMUM_API_VERSION=400001
+    async def paginate(self, method: str, params=None, page_size: int = 100, object_tag=None):
+        """ paginate
 
-            updates a single album, artist, song looking for art files
-            Doesn't overwrite existing art by default.
+            Async generator like API.paginate, use it with async for
 
             INPUTS
-            * object_type = (string) 'artist'|'album'|'song'
-            * object_id   = (integer) $artist_id, $album_id, $song_id
-            * overwrite   = (boolean|integer) (True,False | 0|1) //optional
+            * method     = (string) API function name e.g. 'songs', 'playlist_songs', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'update_art'
-        if bool(overwrite):
-            overwrite = 1
-        else:
-            overwrite = 0
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'type': object_type,
-                'id': object_id,
-                'overwrite': overwrite}
-        return self.get_request(ampache_url, data, api_method)
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        offset = int(params.get('offset', 0))
+        remaining = int(params.get('limit', 0))
+        while True:
+            limit = min(page_size, remaining) if remaining else page_size
+            result, error = await self.fetch_page(method, dict(params, offset=offset, limit=limit))
+            if error is not None:
+                self.set_page_error(error)
+                return
+            page = self.get_page(result, object_tag)
+            for data_object in page:
+                yield data_object
+            if remaining:
+                remaining = remaining - len(page)
+                if remaining <= 0:
+                    return
+            if len(page) < limit:
+                return
+            offset = offset + limit
+
+    async def prefetch(self, method: str, params=None, page_size: int = 100, workers: int = 4, object_tag=None):
+        """ prefetch
+
+            Async generator like API.prefetch that keeps the next pages downloading as tasks on the event loop
+
+            INPUTS
+            * method     = (string) API function name e.g. 'songs', 'index', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * workers    = (integer) number of pages in flight //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
+        """
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        offset = int(params.get('offset', 0))
+        remaining = int(params.get('limit', 0))
+        end = offset + remaining if remaining else 0
+        pending = collections.deque()
+
+        def submit(page_offset):
+            limit = min(page_size, end - page_offset) if end else page_size
+            if limit <= 0:
+                return False
+            page_params = dict(params, offset=page_offset, limit=limit)
+            pending.append((limit, asyncio.ensure_future(self.fetch_page(method, page_params))))
+            return True
 
-    def update_artist_info(self, filter_id):
-        """ update_artist_info
-            MINIMUM_API_VERSION=400001
+        next_offset = offset
+        try:
+            while len(pending) < workers and submit(next_offset):
+                next_offset = next_offset + page_size
+            while pending:
+                limit, task = pending.popleft()
+                result, error = await task
+                if error is not None:
+                    self.set_page_error(error)
+                    return
+                page = self.get_page(result, object_tag)
+                if len(page) < limit:
+                    for data_object in page:
+                        yield data_object
+                    return
+                if submit(next_offset):
+                    next_offset = next_offset + page_size
+                for data_object in page:
+                    yield data_object
+                page = None
+        finally:
+            for limit, task in pending:
+                task.cancel()
+
+    async def fetch_page(self, method: str, params: dict):
+        """ fetch_page
+
+            Run one page for paginate or prefetch and return (response, error) like API.fetch_page
+
+            INPUTS
+            * method = (string) API function name
+            * params = (dict) execute() parameters with offset and limit
+        """
+        self.transport_state.error = None
+        result = await self.execute(method, params)
+        error = self.get_page_error(result, method)
+        if error is None:
+            self.transport_state.error = None
+        return result, error
+
+    async def iter_response(self, method: str, params=None, object_tag=None):
+        """ iter_response
+
+            Async generator that yields each object of an API function.
+            The streamed parse is only available on API, here the response is parsed once it has arrived
+
+            INPUTS
+            * method     = (string) API function name e.g. 'songs', 'index', 'advanced_search'
+            * params     = (dict) execute() parameters //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
+        """
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        for data_object in self.get_page(await self.execute(method, params), object_tag):
+            yield data_object
 
-            Update artist information and fetch similar artists from last.fm
-            Make sure lastfm_api_key is set in your configuration file
+    async def iter_models(self, method: str, params=None, page_size: int = 100, object_tag=None):
+        """ iter_models
+
+            Async generator like paginate that yields typed objects instead of XML elements or JSON dicts
 
             INPUTS
-            * filter_id = (integer) $artist_id
+            * method     = (string) API function name e.g. 'songs', 'playlist_songs', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'update_artist_info'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'id': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        model = MODELS[object_tag]
+        async for data_object in self.paginate(method, params, page_size, object_tag):
+            yield model.from_data(data_object)
 
-    def stream(self, object_id, object_type, destination, stats=1):
-        """ stream
-            MINIMUM_API_VERSION=400001
+    async def export_columns(self, method: str, params=None, columns=EXPORT_COLUMNS, page_size: int = 100,
+                             object_tag=None):
+        """ export_columns
 
-            stream a song or podcast episode
+            Same as API.export_columns, the pages are read with paginate
 
             INPUTS
-            * object_id   = (string) $song_id / $podcast_episode_id
-            * object_type = (string) 'song'|'podcast'
-            * destination = (string) full file path
+            * method     = (string) API function name e.g. 'songs', 'stats', 'advanced_search'
+            * params     = (dict) execute() parameters, a limit stops after that many objects //optional
+            * columns    = (tuple) numeric model attributes e.g. ('time', 'bitrate', 'year', 'artist_id') //optional
+            * page_size  = (integer) number of objects requested per call //optional
+            * object_tag = (string) object name in the response, found from the method by default //optional
         """
-        if not os.path.isdir(os.path.dirname(destination)):
+        if params is None:
+            params = {}
+        if not object_tag:
+            object_tag = self.page_tag(method, params)
+        readers = self.get_column_readers(object_tag, columns)
+        if readers is False:
             return False
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'stream'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'id': object_id,
-                'type': object_type,
-                'stats': stats}
-        headers = {}
-        if hasattr(self, 'AMPACHE_BEARER_TOKEN') and self.AMPACHE_BEARER_TOKEN:
-            headers['Authorization'] = f'Bearer {self.AMPACHE_BEARER_TOKEN}'
-            data.pop('auth', None)
-        data = urllib.parse.urlencode(data)
-        full_url = ampache_url + '?' + data
-        result = requests.get(full_url, allow_redirects=True)
-        open(destination, 'wb').write(result.content)
-        return True
+        arrays = {column: array.array(typecode) for column, typecode, reader in readers}
+        async for data_object in self.paginate(method, params, page_size, object_tag):
+            for column, typecode, reader in readers:
+                arrays[column].append(reader(data_object))
+        if self.get_last_error() is not None:
+            return False
+        return self.get_column_arrays(arrays)
 
-    def download(self, object_id, object_type, destination,
-                 transcode='raw', bitrate=False, stats=1):
-        """ download
-            MINIMUM_API_VERSION=400001
+    async def get_by_ids(self, object_type: str, object_ids, workers: int = 8, batch_size: int = 50):
+        """ get_by_ids
 
-            download a song or podcast episode
+            Same as API.get_by_ids, the requests from plan_ids() run as tasks with at most `workers` at once
 
             INPUTS
-            * object_id   = (string) $song_id / $podcast_episode_id / $search_id / $playlist_id
-            * object_type = (string) 'song'|'podcast'|'search'|'playlist'
-            * destination = (string) full file path
-            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional SONG ONLY
-            * bitrate     = (integer) max bitrate for transcoding, '128', '256' //optional SONG ONLY
+            * object_type = (string) 'song'|'album'|'artist'
+            * object_ids  = (list) $object_id list
+            * workers     = (integer) number of requests running at once //optional
+            * batch_size  = (integer) number of ids for each advanced_search //optional
+        """
+        results = dict()
+        missing = list()
+        for object_id in dict.fromkeys(str(object_id) for object_id in object_ids):
+            cached_object = self.get_cached_object(object_type, object_id)
+            if cached_object is None:
+                missing.append(object_id)
+            else:
+                results[object_id] = cached_object
+        wanted = set(missing)
+        model = MODELS[object_type]
+        semaphore = asyncio.Semaphore(workers)
+
+        async def fetch(request):
+            method, params = request
+            async with semaphore:
+                if method is None:
+                    result = await self.execute(object_type, params)
+                    return self.get_page_error(result, object_type) or list(self.get_models(result, object_type))
+                # pages are read here as the coroutines share the thread's get_last_error()
+                objects = list()
+                offset = 0
+                while True:
+                    result, error = await self.fetch_page(method, dict(params, object_type=object_type,
+                                                                       offset=offset, limit=500))
+                    if error is not None:
+                        return error
+                    page = self.get_page(result, object_type)
+                    objects.extend(model.from_data(data_object) for data_object in page)
+                    if len(page) < 500:
+                        return objects
+                    offset = offset + 500
+
+        for objects in await asyncio.gather(*[fetch(request) for request in self.plan_ids(missing, batch_size)]):
+            if isinstance(objects, AmpacheError):
+                return self.set_page_error(objects)
+            for data_object in objects:
+                if data_object.id in wanted:
+                    results[data_object.id] = data_object
+        return results
+
+
+class BulkDownloader(object):
+    """ BulkDownloader
+
+        Download many songs at once using a pool of worker threads.
+        Songs that already exist in the destination with the same size are skipped
+        and interrupted downloads are resumed on the next run.
+        Each song is downloaded once and songs with the same file name get their id added ('name (id).mp3')
+
+        INPUTS
+        * ampache_connection = (API) connected API object
+        * workers            = (integer) number of worker threads //optional
+        * per_host           = (integer) maximum downloads running against one server //optional
+    """
+
+    def __init__(self, ampache_connection, workers: int = 8, per_host: int = 4):
+        self.ampache_connection = ampache_connection
+        self.workers = workers
+        self.per_host = per_host
+        self.host_limits = {}
+        self.lock = threading.Lock()
+        # file paths being written, a second writer waits for the first (see get_file_path)
+        self.writing = set()
+        self.writing_done = threading.Condition()
+
+    def get_host_limit(self):
+        """ get_host_limit
+
+            Return the semaphore limiting downloads for the current AMPACHE_URL host
         """
-        os.makedirs(os.path.dirname(destination), exist_ok=True)
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'download'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'id': object_id,
-                'type': object_type,
-                'format': transcode,
-                'bitrate': bitrate,
-                'stats': stats}
-        if not bitrate:
-            data.pop('bitrate')
-        headers = {}
-        if hasattr(self, 'AMPACHE_BEARER_TOKEN') and self.AMPACHE_BEARER_TOKEN:
-            headers['Authorization'] = f'Bearer {self.AMPACHE_BEARER_TOKEN}'
-            data.pop('auth', None)
-        data = urllib.parse.urlencode(data)
-        full_url = ampache_url + '?' + data
-        result = requests.get(full_url, allow_redirects=True)
-        open(destination, 'wb').write(result.content)
-        return True
+        host = urllib.parse.urlparse(self.ampache_connection.AMPACHE_URL).netloc
+        with self.lock:
+            if host not in self.host_limits:
+                self.host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self.host_limits[host]
 
-    def get_external_metadata(self, filter_id, object_type):
-        """ get_external_metadata
-            MINIMUM_API_VERSION=400001
+    @staticmethod
+    def get_song_file(song):
+        """ get_song_file
 
-            get data from metadata plugins
+            Return the id, file name and size of a song object
 
             INPUTS
-            * filter_id   = (string) $song_id / $album_id / $artist_id
-            * object_type = (string) 'song', 'artist', 'album'
+            * song = (mixed) XML or JSON song object from the API
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'get_external_metadata'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'type': object_type}
-        return self.get_request(ampache_url, data, api_method)
+        if isinstance(song, ElementTree.Element):
+            filename = song.findtext('filename') or ''
+            size = song.findtext('size')
+            return song.attrib['id'], os.path.basename(filename), int(size) if size else 0
+        filename = song.get('filename') or ''
+        return str(song['id']), os.path.basename(filename), int(song.get('size') or 0)
 
-    def get_lyrics(self, filter_id, plugins=False):
-        """ get_lyrics
-            MINIMUM_API_VERSION=6.9.0
+    @staticmethod
+    def get_download_file(song, transcode='raw'):
+        """ get_download_file
+
+            Return the id, file name and size (0 when unknown) a song is saved with
+
+            INPUTS
+            * song      = (mixed) XML or JSON song object from the API
+            * transcode = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional
+        """
+        song_id, filename, size = BulkDownloader.get_song_file(song)
+        if not filename:
+            filename = song_id
+        if not transcode == 'raw':
+            filename = os.path.splitext(filename)[0] + '.' + transcode
+            size = 0
+        return song_id, filename, size
+
+    def get_file_path(self, names: dict, song_id: str, filename: str, destination: str):
+        """ get_file_path
+
+            Return the file path of a song, the id is added when another song already uses the file name
+
+            INPUTS
+            * names       = (dict) file paths used by this download and the song id of each
+            * song_id     = (string) $song_id
+            * filename    = (string) file name from get_download_file
+            * destination = (string) folder to save files in
+        """
+        file_path = os.path.join(destination, filename)
+        with self.lock:
+            if names.setdefault(file_path, song_id) == song_id:
+                return file_path
+            name, extension = os.path.splitext(filename)
+            file_path = os.path.join(destination, name + ' (' + song_id + ')' + extension)
+            names[file_path] = song_id
+            return file_path
+
+    def download_song(self, song, destination: str, transcode='raw', bitrate=False, names=None):
+        """ download_song
+
+            Download one song into the destination folder and return ('downloaded'|'skipped'|'failed', bytes)
+            Only one thread writes a file path at a time, the others wait and skip the finished file
+
+            INPUTS
+            * song        = (mixed) song id or XML/JSON song object from the API
+            * destination = (string) folder to save files in
+            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional
+            * bitrate     = (integer) max bitrate for transcoding //optional
+            * names       = (dict) file paths used by the same download_songs() call //optional
+        """
+        if isinstance(song, (int, str)):
+            song = self.ampache_connection.song(song)
+            if isinstance(song, ElementTree.Element):
+                song = song.find('song')
+            elif not isinstance(song, dict) or 'id' not in song:
+                song = None
+            if song is None:
+                return 'failed', 0
+        song_id, filename, size = self.get_download_file(song, transcode)
+        file_path = self.get_file_path({} if names is None else names, song_id, filename, destination)
+        with self.writing_done:
+            while file_path in self.writing:
+                self.writing_done.wait()
+            self.writing.add(file_path)
+        try:
+            if os.path.isfile(file_path) and (not size or os.path.getsize(file_path) == size):
+                return 'skipped', 0
+            with self.get_host_limit():
+                if not self.ampache_connection.download(song_id, 'song', file_path, transcode, bitrate, resume=True):
+                    return 'failed', 0
+            return 'downloaded', os.path.getsize(file_path)
+        finally:
+            with self.writing_done:
+                self.writing.discard(file_path)
+                self.writing_done.notify_all()
+
+    def download_songs(self, songs, destination: str, transcode='raw', bitrate=False):
+        """ download_songs
+
+            Download a list of songs concurrently and return a summary
+            {'downloaded', 'skipped', 'failed', 'bytes', 'seconds', 'bytes_per_second'}
+            Repeated song ids are downloaded once
+
+            INPUTS
+            * songs       = (list) song ids or XML/JSON song objects (any iterable)
+            * destination = (string) folder to save files in
+            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional
+            * bitrate     = (integer) max bitrate for transcoding //optional
+        """
+        os.makedirs(destination, exist_ok=True)
+        summary = {'downloaded': 0, 'skipped': 0, 'failed': [], 'bytes': 0}
+        start = time.time()
+        names = {}
+        song_ids = set()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+            for song in songs:
+                song_id = str(song) if isinstance(song, (int, str)) else self.get_song_file(song)[0]
+                if song_id in song_ids:
+                    continue
+                song_ids.add(song_id)
+                if not isinstance(song, (int, str)):
+                    # file names of listed songs are taken in list order so a new run picks the same names
+                    self.get_file_path(names, song_id, self.get_download_file(song, transcode)[1], destination)
+                futures[executor.submit(self.download_song, song, destination, transcode, bitrate, names)] = song_id
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    status, size = future.result()
+                except (AmpacheError, OSError):
+                    status, size = 'failed', 0
+                if status == 'failed':
+                    summary['failed'].append(futures[future])
+                else:
+                    summary[status] = summary[status] + 1
+                    summary['bytes'] = summary['bytes'] + size
+        summary['seconds'] = time.time() - start
+        summary['bytes_per_second'] = summary['bytes'] / summary['seconds'] if summary['seconds'] else 0
+        return summary
 
-            Return Database lyrics or search with plugins by Song id
+    def download_playlist(self, filter_id, destination: str, transcode='raw', bitrate=False):
+        """ download_playlist
+
+            Download every song in a playlist
 
             INPUTS
-            * filter_id = (string) $song_id / $album_id / $artist_id
-            * plugins   = (int) 0,1, if false disable plugin lookup (Default: 1)
+            * filter_id   = (integer) $playlist_id
+            * destination = (string) folder to save files in
+            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional
+            * bitrate     = (integer) max bitrate for transcoding //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'get_lyrics'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'plugins': plugins}
-        if not plugins:
-            data.pop('plugins')
-        return self.get_request(ampache_url, data, api_method)
+        songs = self.ampache_connection.paginate('playlist_songs', {'filter_id': filter_id})
+        return self.download_list(songs, destination, transcode, bitrate)
 
-    def get_art(self, object_id, object_type, destination):
-        """ get_art
-            MINIMUM_API_VERSION=400001
+    def download_smartlist(self, filter_id, destination: str, transcode='raw', bitrate=False):
+        """ download_smartlist
 
-            get the binary art for an item
+            Download every song in a smartlist
 
             INPUTS
-            * object_id   = (string) $song_id / $podcast_episode_id
-            * object_type = (string) 'song', 'artist', 'album', 'playlist', 'search', 'podcast'
-            * destination = (string) output file path
+            * filter_id   = (integer) $smartlist_id
+            * destination = (string) folder to save files in
+            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional
+            * bitrate     = (integer) max bitrate for transcoding //optional
         """
-        if not os.path.isdir(os.path.dirname(destination)):
-            return False
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'get_art'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'id': object_id,
-                'type': object_type}
-        headers = {}
-        if hasattr(self, 'AMPACHE_BEARER_TOKEN') and self.AMPACHE_BEARER_TOKEN:
-            headers['Authorization'] = f'Bearer {self.AMPACHE_BEARER_TOKEN}'
-            data.pop('auth', None)
-        data = urllib.parse.urlencode(data)
-        full_url = ampache_url + '?' + data
-        result = requests.get(full_url, allow_redirects=True)
-        open(destination, 'wb').write(result.content)
-        return True
+        songs = self.ampache_connection.paginate('smartlist_songs', {'filter_id': filter_id})
+        return self.download_list(songs, destination, transcode, bitrate)
 
-    def user_create(self, username: str, password: str, email: str,
-                    fullname=False, disable=False):
-        """ user_create
-            MINIMUM_API_VERSION=400001
+    def download_search(self, rules, destination: str, operator='and', transcode='raw', bitrate=False):
+        """ download_search
 
-            Create a new user. (Requires the username, password and email.) @param array $input
+            Download every song matching advanced_search rules
 
             INPUTS
-            * username    = (string) $username
-            * password    = (string) hash('sha256', $password))
-            * email       = (string) 'user@gmail.com'
-            * fullname    = (string) //optional
-            * disable     = (boolean|integer) (True,False | 0|1) //optional
+            * rules       = (array) = [[rule_1,rule_1_operator,rule_1_input],[rule_2,rule_2_operator,rule_2_input],[etc]]
+            * destination = (string) folder to save files in
+            * operator    = (string) 'and'|'or' (whether to match one rule or all) //optional
+            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional
+            * bitrate     = (integer) max bitrate for transcoding //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user_create'
-        if bool(disable):
-            disable = 1
-        else:
-            disable = 0
-        if hashlib.sha256(password.encode()).hexdigest() != password:
-            password = hashlib.sha256(password.encode()).hexdigest()
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username,
-                'password': password,
-                'email': email,
-                'fullname': fullname,
-                'disable': disable}
-        if not fullname:
-            data.pop('fullname')
-        return self.get_request(ampache_url, data, api_method)
+        songs = self.ampache_connection.paginate('advanced_search', {'rules': rules,
+                                                                    'operator': operator,
+                                                                    'object_type': 'song'})
+        return self.download_list(songs, destination, transcode, bitrate)
 
-    def user_edit(self, username, password=False, fullname=False, email=False,
-                  website=False, state=False, city=False, disable=False, maxbitrate=False,
-                  fullname_public=False, reset_apikey=False, reset_streamtoken=False, clear_stats=False):
-        """ user_edit
-            MINIMUM_API_VERSION=6.0.0
+    def download_list(self, songs, destination: str, transcode='raw', bitrate=False):
+        """ download_list
 
-            Update an existing user. @param array $input
+            download_songs for a paginate() song list.
+            The summary 'error' is the AmpacheError that stopped the list early or None
 
             INPUTS
-            * username          = (string) $username
-            * password          = (string) hash('sha256', $password)) //optional
-            * fullname          = (string) $fullname //optional
-            * email             = (string) $email //optional
-            * website           = (string) $website //optional
-            * state             = (string) $state //optional
-            * city              = (string) $city //optional
-            * disable           = (integer) 0,1 true to disable the user (if enabled) //optional
-            * group             = (integer) Catalog filter group for the new user //optional, default = 0
-            * maxbitrate        = (integer) $maxbitrate //optional
-            * fullname_public   = (integer) 0,1 true to enable, false to disable using fullname in public display //optional
-            * reset_apikey      = (integer) 0,1 true to reset a user Api Key //optional
-            * reset_streamtoken = (integer) 0,1 true to reset a user Stream Token //optional
-            * clear_stats       = (integer) 0,1 true reset all stats for this user //optional
+            * songs       = (generator) paginate() of song objects
+            * destination = (string) folder to save files in
+            * transcode   = (string) 'mp3', 'ogg', etc. ('raw' / original by default) //optional
+            * bitrate     = (integer) max bitrate for transcoding //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user_edit'
-        if bool(disable):
-            disable = 1
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username,
-                'password': password,
-                'fullname': fullname,
-                'email': email,
-                'website': website,
-                'state': state,
-                'city': city,
-                'disable': disable,
-                'maxbitrate': maxbitrate,
-                'fullname_public': fullname_public,
-                'reset_apikey': reset_apikey,
-                'reset_streamtoken': reset_streamtoken,
-                'clear_stats': clear_stats}
-        if not password:
-            data.pop('password')
-        if not fullname:
-            data.pop('fullname')
-        if not email:
-            data.pop('email')
-        if not website:
-            data.pop('website')
-        if not state:
-            data.pop('state')
-        if not city:
-            data.pop('city')
-        if not disable:
-            data.pop('disable')
-        if not maxbitrate:
-            data.pop('maxbitrate')
-        if not fullname_public:
-            data.pop('fullname_public')
-        if not reset_apikey:
-            data.pop('reset_apikey')
-        if not reset_streamtoken:
-            data.pop('reset_streamtoken')
-        if not clear_stats:
-            data.pop('clear_stats')
-        return self.get_request(ampache_url, data, api_method)
+        summary = self.download_songs(songs, destination, transcode, bitrate)
+        # the list is read on this thread so its last error is the paginate() error
+        summary['error'] = self.ampache_connection.get_last_error()
+        return summary
 
-    def user_delete(self, username: str):
-        """ user_delete
-            MINIMUM_API_VERSION=400001
 
-            Delete an existing user. @param array $input
+class ClientPool(object):
+    """ ClientPool
+
+        Spread API calls across several Ampache servers that share the same catalog.
+        Read functions go to the next healthy server (round robin) or the fastest one (latency)
+        and are sent to another server when one fails with a TransportError (timeout, refused connection, 5xx).
+        Functions that change data use the first healthy server and are never sent twice.
+        Failed servers are skipped until a background ping finds them again.
+        Use set_timeout() on each API so a hung server is skipped quickly.
+
+        Any API function can be called on the pool (e.g. pool.songs(limit=10) or pool.execute('songs'))
+
+        INPUTS
+        * connections    = (list) API objects with their own AMPACHE_URL and session
+        * strategy       = (string) 'round_robin'|'latency' //optional
+        * check_interval = (integer) seconds between pings of failed servers, 0 disables the checks //optional
+    """
+
+    def __init__(self, connections, strategy: str = 'round_robin', check_interval: int = 30):
+        self.connections = list(connections)
+        self.strategy = strategy
+        self.healthy = [True] * len(self.connections)
+        self.latency = [0.0] * len(self.connections)
+        self.counter = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.checker = None
+        if check_interval:
+            self.checker = threading.Thread(target=self.run_checks, args=(check_interval,), daemon=True)
+            self.checker.start()
+
+    def __getattr__(self, name):
+        if name in API.get_actions():
+            return lambda *args, **kwargs: self.run(name, lambda connection: getattr(connection, name)(*args, **kwargs))
+        if name.startswith('__') or not self.__dict__.get('connections'):
+            raise AttributeError(name)
+        index = self.get_node()
+        return getattr(self.connections[index if index is not None else 0], name)
+
+    def get_node(self, skip=(), write: bool = False):
+        """ get_node
+
+            Return the index of the server for the next call or None when every server has been tried.
+            Failed servers are only used when none of the others are left
+
+            INPUTS
+            * skip  = (list) indexes that already failed for this call //optional
+            * write = (boolean) the function changes data //optional
+        """
+        with self.lock:
+            nodes = [index for index in range(len(self.connections)) if not index in skip]
+            healthy = [index for index in nodes if self.healthy[index]]
+            if healthy:
+                nodes = healthy
+            if not nodes:
+                return None
+            if write:
+                return nodes[0]
+            if self.strategy == 'latency':
+                return min(nodes, key=lambda index: self.latency[index])
+            self.counter += 1
+            return nodes[self.counter % len(nodes)]
+
+    def run(self, method: str, function):
+        """ run
+
+            Call function(connection) on a server and fail over to the next one when it doesn't respond
+
+            INPUTS
+            * method   = (string) API function name
+            * function = (function) takes an API object and returns the result
+        """
+        write = ResponseCache.is_write(method)
+        failed = []
+        error = None
+        while True:
+            index = self.get_node(failed, write)
+            if index is None:
+                break
+            connection = self.connections[index]
+            connection.transport_state.error = None
+            started = time.time()
+            try:
+                result = function(connection)
+                error = None
+            except TransportError as exception:
+                result = False
+                error = exception
+            # False without a TransportError is the server's answer
+            if error is None and (not result is False or not isinstance(connection.get_last_error(), TransportError)):
+                self.set_latency(index, time.time() - started)
+                return result
+            with self.lock:
+                self.healthy[index] = False
+            failed.append(index)
+            if write:
+                break
+        if error is not None:
+            raise error
+        return False
+
+    def execute(self, method: str, params=None):
+        """ execute
+
+            Run an API function by name on the next server (see API.execute)
 
             INPUTS
-            * username    = (string) $username
+            * method = (string) API function name
+            * params = (dict) function parameters //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'username': username}
-        return self.get_request(ampache_url, data, api_method)
+        return self.run(method, lambda connection: connection.execute(method, params))
 
-    def user_preferences(self):
-        """ user_preferences
-            MINIMUM_API_VERSION=5.0.0
+    def check_node(self, index: int):
+        """ check_node
 
-            Returns user_preferences
+            Ping a server without a session and mark it healthy or failed
 
             INPUTS
+            * index = (integer) position of the server in connections
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user_preferences'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION}
-        return self.get_request(ampache_url, data, api_method)
+        connection = self.connections[index]
+        started = time.time()
+        ampache_url, data, api_method = connection.ping_request(connection.AMPACHE_URL)
+        try:
+            healthy = not connection.get_request(ampache_url, data, api_method) is False
+        except AmpacheError:
+            healthy = False
+        with self.lock:
+            if healthy and not self.healthy[index]:
+                self.latency[index] = time.time() - started
+            self.healthy[index] = healthy
+        return healthy
 
-    def user_preference(self, filter_str):
-        """ user_preference
-            MINIMUM_API_VERSION=5.0.0
+    def set_latency(self, index: int, seconds: float):
+        """ set_latency
 
-            Returns preference based on the specified filter_str
+            Add a response time to the moving average used by the latency strategy
 
             INPUTS
-            * filter_str  = (string) search the name of a preference
+            * index   = (integer) position of the server in connections
+            * seconds = (float) time taken by the call
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'user_preference'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str}
-        return self.get_request(ampache_url, data, api_method)
+        with self.lock:
+            self.latency[index] = seconds if not self.latency[index] else self.latency[index] * 0.8 + seconds * 0.2
 
-    def system_preferences(self):
-        """ system_preferences
-            MINIMUM_API_VERSION=5.0.0
+    def get_status(self):
+        """ get_status
 
-            Returns system_preferences
+            Return the url, health and average response time of each server
+        """
+        with self.lock:
+            return [{'url': connection.AMPACHE_URL, 'healthy': self.healthy[index], 'latency': self.latency[index]}
+                    for index, connection in enumerate(self.connections)]
+
+    def run_checks(self, interval: int):
+        """ run_checks
+
+            Background thread that pings the failed servers every interval seconds until close()
 
             INPUTS
+            * interval = (integer) seconds between checks
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'system_preferences'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION}
-        return self.get_request(ampache_url, data, api_method)
+        while not self.stopped.wait(interval):
+            for index in range(len(self.connections)):
+                if not self.healthy[index]:
+                    self.check_node(index)
 
-    def system_preference(self, filter_str):
-        """ system_preference
-            MINIMUM_API_VERSION=5.0.0
+    def close(self):
+        """ close
 
-            Returns preference based on the specified filter_str
+            Stop the background checks
+        """
+        self.stopped.set()
+        if self.checker is not None:
+            self.checker.join()
+
+
+# list function, whether it has add/update filters and the deleted function for each object LibrarySync can mirror
+# functions without add/update filters are downloaded in full every run, which also drops deleted objects,
+# so deleted_podcast_episodes and deleted_videos aren't needed
+SYNC_TYPES = {
+    'song': ('songs', True, 'deleted_songs'),
+    'album': ('albums', True, False),
+    'artist': ('artists', True, False),
+    'genre': ('genres', False, False),
+    'playlist': ('playlists', False, False),
+    'podcast_episode': ('podcast_episodes', False, False),
+    'video': ('videos', False, False),
+}
+# list function and object name of the parents for SYNC_TYPES that are listed one parent at a time
+SYNC_PARENTS = {
+    'podcast_episode': ('podcasts', 'podcast'),
+}
+
+
+class MemoryStore(object):
+    """ MemoryStore
+
+        Local mirror used by LibrarySync that keeps objects as dicts (see AmpacheObject.to_dict) in memory
+    """
 
-            INPUTS
-            * filter_str  = (string) search the name of a preference
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'system_preference'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str}
-        return self.get_request(ampache_url, data, api_method)
+    def __init__(self):
+        self.watermarks = {}
+        self.objects = {}
 
-    def system_update(self):
-        """ system_update
-            MINIMUM_API_VERSION=5.0.0
+    def get_watermark(self, object_type: str):
+        """ get_watermark
 
-            update ampache
+            Return the UNIXTIME of the last completed sync of an object type (0 when it hasn't synced)
 
             INPUTS
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'system_update'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION}
-        return self.get_request(ampache_url, data, api_method)
+        return self.watermarks.get(object_type, 0)
 
-    def preference_create(self, filter_str, type_str, default, category,
-                          description=False, subcategory=False, level=100):
-        """ preference_create
-            MINIMUM_API_VERSION=5.0.0
+    def set_watermark(self, object_type: str, watermark: int):
+        """ set_watermark
 
-            Returns preference based on the specified filter_str
+            Set the UNIXTIME of the last completed sync of an object type
 
             INPUTS
-            * filter_str  = (string) search the name of a preference
-            * type_str    = (string) 'boolean', 'integer', 'string', 'special'
-            * default     = (string|integer) default value
-            * category    = (string) 'interface', 'internal', 'options', 'playlist', 'plugins', 'streaming', 'system'
-            * description = (string) description of preference //optional
-            * subcategory = (string) $subcategory //optional
-            * level       = (integer) access level required to change the value (default 100) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * watermark   = (integer) UNIXTIME()
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'preference_create'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'type': type_str,
-                'default': default,
-                'category': category,
-                'description': description,
-                'subcategory': subcategory,
-                'level': level}
-        if not description:
-            data.pop('description')
-        if not subcategory:
-            data.pop('subcategory')
-        return self.get_request(ampache_url, data, api_method)
+        self.watermarks[object_type] = watermark
 
-    def preference_edit(self, filter_str, value, apply_all=0, default=0):
-        """ preference_edit
-            MINIMUM_API_VERSION=5.0.0
+    def upsert(self, object_type: str, objects):
+        """ upsert
 
-            Returns preference based on the specified filter_str
+            Add or replace objects
 
             INPUTS
-            * filter_str = (string) search the name of a preference
-            * value      = (string|integer) Preference value
-            * apply_all  = (boolean) apply to all users //optional
-            * default    = (boolean) if true set as system default (New and public users) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * objects     = (list) dicts from AmpacheObject.to_dict()
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'preference_edit'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'value': value,
-                'all': apply_all,
-                'default': default}
-        return self.get_request(ampache_url, data, api_method)
+        table = self.objects.setdefault(object_type, {})
+        for data in objects:
+            table[str(data['id'])] = data
 
-    def preference_delete(self, filter_str):
-        """ preference_delete
-            MINIMUM_API_VERSION=5.0.0
+    def replace(self, object_type: str, objects):
+        """ replace
 
-            Returns preference based on the specified filter_str
+            Replace every object of this type
 
             INPUTS
-            * filter_str  = (string) search the name of a preference
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * objects     = (list) dicts from AmpacheObject.to_dict()
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'preference_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str}
-        return self.get_request(ampache_url, data, api_method)
+        self.objects[object_type] = {}
+        self.upsert(object_type, objects)
 
-    def licenses(self, filter_str=False, exact=False, add=False, update=False,
-                 offset=0, limit=0, sort=False, cond=False):
-        """ licenses
-            MINIMUM_API_VERSION=420000
+    def delete(self, object_type: str, object_ids):
+        """ delete
 
-            Returns licenses based on the specified filter_str
+            Remove objects by id
 
             INPUTS
-            * filter_str = (string) search the name of a license //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * add        = (integer) UNIXTIME() //optional
-            * update     = (integer) UNIXTIME() //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * object_ids  = (list) object ids
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'licenses'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'exact': exact,
-                'add': add,
-                'update': update,
-                'filter': filter_str,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not add:
-            data.pop('add')
-        if not update:
-            data.pop('update')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        table = self.objects.get(object_type, {})
+        for object_id in object_ids:
+            table.pop(str(object_id), None)
 
-    def license(self, filter_id: int):
-        """ license
-            MINIMUM_API_VERSION=420000
+    def get(self, object_type: str, object_id):
+        """ get
 
-            returns a single license
+            Return one object dict or None
 
             INPUTS
-            * filter_id   = (integer) $license_id
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * object_id   = (string) object id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'license'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        return self.objects.get(object_type, {}).get(str(object_id))
 
-    def license_songs(self, filter_id: int, sort=False, cond=False):
-        """ license_songs
-            MINIMUM_API_VERSION=420000
+    def get_all(self, object_type: str):
+        """ get_all
 
-            returns a songs for a single license ID
+            Return a list of every object dict of this type
 
             INPUTS
-            * filter_id = (integer) $license_id
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'license_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        return list(self.objects.get(object_type, {}).values())
 
-    def live_streams(self, filter_str=False,
-                     exact=False, offset=0, limit=0, sort=False, cond=False):
-        """ live_streams
-            MINIMUM_API_VERSION=5.1.0
+    def count(self, object_type: str):
+        """ count
 
-            Returns live_streams based on the specified filter_str
+            Return the number of objects of this type
 
             INPUTS
-            * filter_str = (string) search the name of a live_stream //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'live_streams'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'exact': exact,
-                'filter': filter_str,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
-
-    def live_stream(self, filter_id: int):
-        """ live_stream
-            MINIMUM_API_VERSION=5.1.0
+        return len(self.objects.get(object_type, {}))
 
-            Returns a single live_stream based on UID
+    def save(self):
+        """ save
 
-            INPUTS
-            * filter_id   = (integer) $live_stream_id
+            Write pending changes (nothing to do for memory)
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'live_stream'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        return True
 
-    def live_stream_create(self, name: str, stream_url: str, codec: str, catalog_id: int, site_url: str = ''):
-        """ live_stream_create
-            MINIMUM_API_VERSION=6.0.0
 
-            Create a live_stream (radio station) object.
+class JSONStore(MemoryStore):
+    """ JSONStore
 
-            INPUTS
-            * name     = (string) Stream title
-            * url      = (string) URL of the http/s stream
-            * codec    = (string) stream codec ('mp3', 'flac', 'ogg', 'vorbis', 'opus', 'aac', 'alac')
-            * catalog  = (int) Catalog ID to associate with this stream
-            * site_url = (string) Homepage URL of the stream //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'live_stream_create'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'name': name,
-                'url': stream_url,
-                'codec': codec,
-                'catalog': catalog_id,
-                'site_url': site_url}
-        if not site_url:
-            data.pop('site_url')
-        return self.get_request(ampache_url, data, api_method)
+        MemoryStore that is loaded from and saved to a json file
 
-    def live_stream_edit(self, filter_id, name: str = '', stream_url: str = '', codec: str = '', catalog_id: int = 0,
-                         site_url: str = ''):
-        """ live_stream_edit
-            MINIMUM_API_VERSION=6.0.0
+        INPUTS
+        * path = (string) json file e.g. os.path.join(ampache_connection.CONFIG_PATH, 'ampache_library.json')
+    """
 
-            Edit a live_stream (radio station) object.
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        if os.path.isfile(path):
+            with open(path, 'r') as file:
+                data = json.load(file)
+            self.watermarks = data.get('watermarks', {})
+            self.objects = data.get('objects', {})
+
+    def save(self):
+        """ save
+
+            Write the mirror to the json file
+        """
+        if os.path.dirname(self.path) and not os.path.isdir(os.path.dirname(self.path)):
+            os.makedirs(os.path.dirname(self.path))
+        # write a new file and swap it in so an interrupted save keeps the old mirror
+        with open(self.path + '.part', 'w') as file:
+            json.dump({'watermarks': self.watermarks, 'objects': self.objects}, file)
+        os.replace(self.path + '.part', self.path)
+        return True
 
-            INPUTS
-            * filter   = (string) object_id
-            * name     = (string) Stream title //optional
-            * url      = (string) URL of the http/s stream //optional
-            * codec    = (string) stream codec ('mp3', 'flac', 'ogg', 'vorbis', 'opus', 'aac', 'alac') //optional
-            * catalog  = (int) Catalog ID to associate with this stream //optional
-            * site_url = (string) Homepage URL of the stream //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'live_stream_edit'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'name': name,
-                'url': stream_url,
-                'codec': codec,
-                'catalog': catalog_id,
-                'site_url': site_url}
-        if not name:
-            data.pop('name')
-        if not stream_url:
-            data.pop('url')
-        if not codec:
-            data.pop('codec')
-        if not catalog_id:
-            data.pop('catalog')
-        if not site_url:
-            data.pop('site_url')
-        return self.get_request(ampache_url, data, api_method)
 
-    def live_stream_delete(self, filter_id: int):
-        """ live_stream_delete
-            MINIMUM_API_VERSION=6.0.0
+class SQLiteStore(object):
+    """ SQLiteStore
 
-            Delete an existing live_stream (radio station). (if it exists)
+        Local mirror used by LibrarySync stored in a SQLite database with one table per object type.
+        Lookup columns (artist, album, year, name, ...) are indexed and genres are kept in a separate
+        indexed table so find() can answer queries offline with the same objects as the API.
 
-            INPUTS
-            * filter_id = (integer) object_id
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'live_stream_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        INPUTS
+        * path = (string) database file e.g. os.path.join(ampache_connection.CONFIG_PATH, 'ampache_library.sqlite')
+    """
 
-    def labels(self, filter_str=False,
-               exact=False, offset=0, limit=0, sort=False, cond=False):
-        """ labels
-            MINIMUM_API_VERSION=420000
+    # indexed columns for each object type
+    INDEXES = {
+        'song': ('title', 'artist_id', 'artist_name', 'album_id', 'albumartist_id', 'year', 'catalog'),
+        'album': ('name', 'artist_id', 'artist_name', 'year'),
+        'artist': ('name',),
+        'genre': ('name',),
+        'playlist': ('name', 'owner'),
+    }
+    OPERATORS = ('=', '!=', '<', '<=', '>', '>=', 'like', 'not like')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.RLock()
+        if os.path.dirname(path) and not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        with self.lock, self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS `sync` (`name` TEXT PRIMARY KEY, `value` INTEGER)')
+            self.connection.execute('CREATE TABLE IF NOT EXISTS `object_genre` (`object_type` TEXT NOT NULL, '
+                                    '`object_id` TEXT NOT NULL, `genre_id` TEXT, `genre_name` TEXT)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS `object_genre_object` '
+                                    'ON `object_genre` (`object_type`, `object_id`)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS `object_genre_name` '
+                                    'ON `object_genre` (`genre_name` COLLATE NOCASE, `object_type`)')
+            for object_type in SYNC_TYPES:
+                columns = ', '.join('`' + name + '` ' + self.get_sql_type(kind)
+                                    for name, kind in self.get_columns(object_type)[1:])
+                self.connection.execute('CREATE TABLE IF NOT EXISTS `' + object_type + '` '
+                                        '(`id` TEXT PRIMARY KEY, ' + columns + ')')
+                for name in self.INDEXES.get(object_type, ()):
+                    self.connection.execute('CREATE INDEX IF NOT EXISTS `' + object_type + '_' + name + '` '
+                                            'ON `' + object_type + '` (`' + name + '`)')
 
-            Returns labels based on the specified filter_str
+    @staticmethod
+    def get_columns(object_type: str):
+        """ get_columns
+
+            Return ((column, kind), ...) for an object type in the order of the model __slots__
 
             INPUTS
-            * filter_str = (string) search the name of a label //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'labels'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_str,
-                'exact': exact,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        columns = [('id', str)]
+        for name, kind in MODELS[object_type].FIELDS:
+            if kind == 'ref':
+                columns.append((name + '_id', str))
+                columns.append((name + '_name', str))
+            else:
+                columns.append((name, kind))
+        return columns
 
-    def label(self, filter_id: int):
-        """ label
-            MINIMUM_API_VERSION=420000
+    @staticmethod
+    def get_sql_type(kind):
+        """ get_sql_type
 
-            returns a single label
+            Return the SQLite column type for a model field kind
 
             INPUTS
-            * filter_id   = (integer) $label_id
+            * kind = (mixed) str|int|float|bool|'genres'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'label'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        if kind is int or kind is bool:
+            return 'INTEGER'
+        if kind is float:
+            return 'REAL'
+        return 'TEXT'
 
-    def label_artists(self, filter_id: int, sort=False, cond=False):
-        """ label_artists
-            MINIMUM_API_VERSION=420000
+    def get_watermark(self, object_type: str):
+        """ get_watermark
 
-            returns a artists for a single label ID
+            Return the UNIXTIME of the last completed sync of an object type (0 when it hasn't synced)
 
             INPUTS
-            * filter_id = (integer) $label_id
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'label_artists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        with self.lock:
+            row = self.connection.execute('SELECT `value` FROM `sync` WHERE `name` = ?',
+                                          ('watermark_' + object_type,)).fetchone()
+        return row[0] if row else 0
 
-    def get_bookmark(self, filter_id: str, object_type: str, include=False, show_all=False):
-        """ get_bookmark
-            MINIMUM_API_VERSION=5.0.0
+    def set_watermark(self, object_type: str, watermark: int):
+        """ set_watermark
 
-            Get the bookmark from it's object_id and object_type.
+            Set the UNIXTIME of the last completed sync of an object type
 
             INPUTS
-            * filter_id   = (integer) object_id
-            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
-            * include     = (integer) 0,1, if true include the object in the bookmark //optional
-            * all         = (integer) 0,1, if true every bookmark related to the object //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * watermark   = (integer) UNIXTIME()
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'get_bookmark'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'type': object_type,
-                'include': include,
-                'all': show_all}
-        if not include:
-            data.pop('include')
-        if not show_all:
-            data.pop('all')
-        return self.get_request(ampache_url, data, api_method)
+        with self.lock, self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO `sync` (`name`, `value`) VALUES (?, ?)',
+                                    ('watermark_' + object_type, watermark))
 
-    def bookmarks(self, client=False, include=False):
-        """ bookmarks
-            MINIMUM_API_VERSION=5.0.0
+    def upsert(self, object_type: str, objects):
+        """ upsert
 
-            Get information about bookmarked media this user is allowed to manage.
+            Add or replace objects and their genres
 
             INPUTS
-            * client  = (string) filter by bookmark_id //optional
-            * include = (integer) 0,1, if true include the object in the bookmark //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * objects     = (list) dicts from AmpacheObject.to_dict()
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'bookmarks'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'client': client,
-                'include': include}
-        if not client:
-            data.pop('client')
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+        columns = self.get_columns(object_type)
+        names = [name for name, kind in columns]
+        genre_columns = [name for name, kind in columns if kind == 'genres']
+        rows = list()
+        genres = list()
+        for data in objects:
+            object_id = str(data['id'])
+            rows.append([object_id] + [json.dumps(data.get(name) or []) if kind == 'genres' else data.get(name)
+                                       for name, kind in columns[1:]])
+            for name in genre_columns:
+                genres.extend((object_type, object_id, genre_id, genre_name)
+                              for genre_id, genre_name in data.get(name) or ())
+        with self.lock, self.connection:
+            self.connection.executemany('DELETE FROM `object_genre` WHERE `object_type` = ? AND `object_id` = ?',
+                                        [(object_type, row[0]) for row in rows])
+            self.connection.executemany('INSERT OR REPLACE INTO `' + object_type + '` (`' + '`, `'.join(names) +
+                                        '`) VALUES (' + ', '.join('?' * len(names)) + ')', rows)
+            self.connection.executemany('INSERT INTO `object_genre` (`object_type`, `object_id`, `genre_id`, '
+                                        '`genre_name`) VALUES (?, ?, ?, ?)', genres)
 
-    def bookmark(self, filter_id: str, include=False):
-        """ bookmark
-            MINIMUM_API_VERSION=6.1.0
+    def replace(self, object_type: str, objects):
+        """ replace
 
-            Get information about bookmarked media this user is allowed to manage.
+            Replace every object of this type in one transaction
 
             INPUTS
-            * filter  = (string) bookmark_id
-            * include = (integer) 0,1, if true include the object in the bookmark //optional
-        """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'bookmark'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'include': include}
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * objects     = (list) dicts from AmpacheObject.to_dict()
+        """
+        with self.lock, self.connection:
+            self.connection.execute('DELETE FROM `' + object_type + '`')
+            self.connection.execute('DELETE FROM `object_genre` WHERE `object_type` = ?', (object_type,))
+            self.upsert(object_type, objects)
 
-    def bookmark_create(self, filter_id, object_type,
-                        position: int = 0, client: str = CLIENT_NAME, date=False, include=False):
-        """ bookmark_create
-            MINIMUM_API_VERSION=5.0.0
+    def delete(self, object_type: str, object_ids):
+        """ delete
 
-            Create a placeholder for the current media that you can return to later.
+            Remove objects and their genres by id
 
             INPUTS
-            * filter_id   = (integer) object_id
-            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
-            * position    = (integer) current track time in seconds
-            * client      = (string) Agent string. (Default: 'python3-ampache') //optional
-            * date        = (integer) update time (Default: UNIXTIME()) //optional
-            * include     = (integer) 0,1, if true include the object in the bookmark //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * object_ids  = (list) object ids
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'bookmark_create'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'type': object_type,
-                'position': position,
-                'client': client,
-                'date': date,
-                'include': include}
-        if not client:
-            data.pop('client')
-        if not date:
-            data.pop('date')
-        return self.get_request(ampache_url, data, api_method)
+        object_ids = [(str(object_id),) for object_id in object_ids]
+        with self.lock, self.connection:
+            self.connection.executemany('DELETE FROM `' + object_type + '` WHERE `id` = ?', object_ids)
+            self.connection.executemany('DELETE FROM `object_genre` WHERE `object_type` = ? AND `object_id` = ?',
+                                        [(object_type,) + object_id for object_id in object_ids])
 
-    def bookmark_edit(self, filter_id, object_type,
-                      position: int = 0, client: str = CLIENT_NAME, date=False, include=False):
-        """ bookmark_edit
-            MINIMUM_API_VERSION=5.0.0
+    def get_dict(self, object_type: str, row):
+        """ get_dict
 
-            Edit a placeholder for the current media that you can return to later.
+            Return a database row as a dict from AmpacheObject.to_dict()
 
             INPUTS
-            * filter_id   = (integer) object_id
-            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
-            * position    = (integer) current track time in seconds
-            * client      = (string) Agent string. (Default: 'python3-ampache') //optional
-            * date        = (integer) update time (Default: UNIXTIME()) //optional
-            * include     = (integer) 0,1, if true include the object in the bookmark //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * row         = (tuple) row in get_columns() order
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'bookmark_edit'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'type': object_type,
-                'position': position,
-                'client': client,
-                'date': date,
-                'include': include}
-        if not client:
-            data.pop('client')
-        if not date:
-            data.pop('date')
-        if not include:
-            data.pop('include')
-        return self.get_request(ampache_url, data, api_method)
+        data = dict()
+        for (name, kind), value in zip(self.get_columns(object_type), row):
+            if kind == 'genres':
+                value = tuple(tuple(genre) for genre in json.loads(value or '[]'))
+            elif kind is bool and value is not None:
+                value = bool(value)
+            data[name] = value
+        return data
 
-    def bookmark_delete(self, filter_id: int, object_type=False):
-        """ bookmark_delete
-            MINIMUM_API_VERSION=5.0.0
+    def select(self, object_type: str, where: str = '', params=(), sort: str = '', limit: int = 0):
+        """ select
 
-            Delete an existing bookmark. (if it exists)
+            Return a list of dicts from an SQL where clause
 
             INPUTS
-            * filter_id   = (integer) object_id
-            * object_type = (string) object_type ('bookmark', 'song', 'video', 'podcast_episode')
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * where       = (string) SQL condition using ? placeholders //optional
+            * params      = (tuple) values for the placeholders //optional
+            * sort        = (string) column to sort by //optional
+            * limit       = (integer) maximum number of objects //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'bookmark_delete'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'type': object_type}
-        return self.get_request(ampache_url, data, api_method)
+        names = [name for name, kind in self.get_columns(object_type)]
+        sql = 'SELECT `' + '`, `'.join(names) + '` FROM `' + object_type + '`'
+        if where:
+            sql = sql + ' WHERE ' + where
+        if sort:
+            sql = sql + ' ORDER BY `' + sort + '`'
+        if limit:
+            sql = sql + ' LIMIT ' + str(int(limit))
+        with self.lock:
+            rows = self.connection.execute(sql, tuple(params)).fetchall()
+        return [self.get_dict(object_type, row) for row in rows]
 
-    def deleted_songs(self, offset=0, limit=0):
-        """ deleted_songs
-            MINIMUM_API_VERSION=500000
+    def get(self, object_type: str, object_id):
+        """ get
 
-            Returns deleted_song
+            Return one object dict or None
 
             INPUTS
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * object_id   = (string) object id
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'deleted_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'offset': str(offset),
-                'limit': str(limit)}
-        return self.get_request(ampache_url, data, api_method)
+        objects = self.select(object_type, '`id` = ?', (str(object_id),))
+        return objects[0] if objects else None
 
-    def deleted_podcast_episodes(self, offset=0, limit=0):
-        """ deleted_podcast_episodes
-            MINIMUM_API_VERSION=500000
+    def get_all(self, object_type: str):
+        """ get_all
 
-            Returns deleted_podcast_episode
+            Return a list of every object dict of this type
 
             INPUTS
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'deleted_podcast_episodes'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'offset': str(offset),
-                'limit': str(limit)}
-        return self.get_request(ampache_url, data, api_method)
+        return self.select(object_type)
 
-    def deleted_videos(self, offset=0, limit=0):
-        """ deleted_videos
-            MINIMUM_API_VERSION=500000
+    def count(self, object_type: str):
+        """ count
 
-            Returns deleted_video
+            Return the number of objects of this type
 
             INPUTS
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'deleted_videos'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'offset': str(offset),
-                'limit': str(limit)}
-        return self.get_request(ampache_url, data, api_method)
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM `' + object_type + '`').fetchone()[0]
 
-    """
-    --------------------
-    BACKCOMPAT FUNCTIONS
-    --------------------
-    """
+    def save(self):
+        """ save
 
-    def advanced_search(self, rules,
-                        operator='and', object_type='song', offset=0, limit=0, random=0):
-        """ advanced_search
-            MINIMUM_API_VERSION=380001
+            Commit pending changes
+        """
+        with self.lock:
+            self.connection.commit()
+        return True
 
-            Perform an advanced search given passed rules
-            the rules can occur multiple times and are joined by the operator item.
+    def find(self, object_type: str, rules=None, operator: str = 'and', sort: str = '', limit: int = 0):
+        """ find
 
-            Refer to the wiki for further information
-            https://ampache.org/api/api-advanced-search
+            Search the mirror and return typed objects (Song, Album, ...) like advanced_search
+            Rules use model attributes e.g. artist_name, album_id, year and 'genre' matches a genre name
 
             INPUTS
-            * rules       = (array) = [[rule_1,rule_1_operator,rule_1_input],[rule_2,rule_2_operator,rule_2_input],[etc]]
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * rules       = (array) [[attribute, operator, value], ...] e.g. [['year', '>', 1999], ['genre', '=', 'Rock']] //optional
             * operator    = (string) 'and'|'or' (whether to match one rule or all) //optional
-            * object_type = (string)  //optional
-            * offset      = (integer) //optional
-            * limit       = (integer) //optional
-            * random      = (integer) 0|1' //optional
+            * sort        = (string) attribute to sort by //optional
+            * limit       = (integer) maximum number of objects //optional
+        """
+        names = [name for name, kind in self.get_columns(object_type)]
+        conditions = list()
+        params = list()
+        for name, rule_operator, value in rules or ():
+            rule_operator = rule_operator.lower()
+            if rule_operator not in self.OPERATORS or (name not in names and not name == 'genre'):
+                return False
+            if name == 'genre':
+                conditions.append(('NOT ' if rule_operator in ('!=', 'not like') else '') +
+                                  'EXISTS (SELECT 1 FROM `object_genre` WHERE `object_genre`.`object_type` = ? '
+                                  'AND `object_genre`.`object_id` = `' + object_type + '`.`id` '
+                                  'AND `genre_name` ' + ('LIKE' if 'like' in rule_operator else '=') +
+                                  ' ? COLLATE NOCASE)')
+                params.extend((object_type, value))
+            else:
+                conditions.append('`' + name + '` ' + rule_operator.upper() + ' ?')
+                params.append(value)
+        if sort and sort not in names:
+            return False
+        where = (' OR ' if operator.lower() == 'or' else ' AND ').join(conditions)
+        model = MODELS[object_type]
+        return [model.from_dict(data) for data in self.select(object_type, where, params, sort, limit)]
+
+    def close(self):
+        """ close
+
+            Close the database connection
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'advanced_search'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'operator': operator,
-                'type': object_type,
-                'offset': offset,
-                'limit': limit,
-                'random': random}
-        count = 0
-        # inputs  [rule_1, rule_1_operator, rule_1_input]
-        # example ['year', 2, 1999]
-        for item in rules:
-            count = count + 1
-            data['rule_' + str(count)] = item[0]
-            data['rule_' + str(count) + '_operator'] = item[1]
-            data['rule_' + str(count) + '_input'] = item[2]
-            if item[0] == 'metadata':
-                data['rule_' + str(count) + '_subtype'] = item[3]
-        return self.get_request(ampache_url, data, api_method)
+        with self.lock:
+            self.connection.close()
 
-    def tags(self, filter_str=False,
-             exact=False, offset=0, limit=0, sort=False, cond=False):
-        """ tags
-            MINIMUM_API_VERSION=380001
 
-            This returns the tags (Tags) based on the specified filter
+class LibrarySync(object):
+    """ LibrarySync
+
+        Keep a local mirror of the library up to date.
+        The first run downloads everything, later runs only request objects added or updated
+        since the last sync (add/update filters) and remove objects from deleted_songs.
+        Each object type has its own watermark that is only moved forward when that type has synced.
+
+        INPUTS
+        * ampache_connection = (API) connected API object
+        * store              = (MemoryStore|JSONStore|SQLiteStore) local mirror //optional
+        * object_types       = (tuple) objects to mirror from SYNC_TYPES //optional
+        * page_size          = (integer) number of objects requested per call //optional
+        * overlap            = (integer) seconds subtracted from the watermark to allow for clock differences //optional
+    """
+
+    def __init__(self, ampache_connection, store=None, object_types=('song', 'album', 'artist'),
+                 page_size: int = 500, overlap: int = 300):
+        self.ampache_connection = ampache_connection
+        self.store = store if store is not None else MemoryStore()
+        self.object_types = object_types
+        self.page_size = page_size
+        self.overlap = overlap
+
+    def fetch_all(self, method: str, params: dict, object_tag: str):
+        """ fetch_all
+
+            Return every object from an offset/limit function or False if any page fails
 
             INPUTS
-            * filter_str = (string) search the name of a tag //optional
-            * exact      = (integer) 0,1, if true filter is exact rather then fuzzy //optional
-            * offset     = (integer) //optional
-            * limit      = (integer) //optional
-            * cond       = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort       = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * method     = (string) API function name e.g. 'songs', 'deleted_songs'
+            * params     = (dict) execute() parameters
+            * object_tag = (string) object name in the response e.g. 'song'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'tags'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'exact': exact,
-                'filter': filter_str,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not filter_str:
-            data.pop('filter')
-        if not exact:
-            data.pop('exact')
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        objects = []
+        offset = 0
+        while True:
+            result = self.ampache_connection.execute(method, dict(params, offset=offset, limit=self.page_size))
+            error_code = self.ampache_connection.get_error_code(result)
+            if result is False or (error_code and not error_code == '4704'):
+                return False
+            page = self.ampache_connection.get_page(result, object_tag) if not error_code else []
+            objects.extend(page)
+            if len(page) < self.page_size:
+                return objects
+            offset = offset + self.page_size
 
-    def tag(self, filter_id: int):
-        """ tag
-            MINIMUM_API_VERSION=380001
+    def fetch_children(self, method: str, object_type: str):
+        """ fetch_children
 
-            This returns a single tag based on UID
+            Return every object of a function filtered by a parent (e.g. podcast_episodes of each podcast)
+            or False if any page fails
 
             INPUTS
-            * filter_id = (integer) $tag_id
+            * method      = (string) API function name e.g. 'podcast_episodes'
+            * object_type = (string) object name in the response e.g. 'podcast_episode'
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'tag'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id}
-        return self.get_request(ampache_url, data, api_method)
+        parent_method, parent_tag = SYNC_PARENTS[object_type]
+        parents = self.fetch_all(parent_method, {}, parent_tag)
+        if parents is False:
+            return False
+        objects = []
+        for parent in parents:
+            parent_id = parent.attrib.get('id') if isinstance(parent, ElementTree.Element) else parent.get('id')
+            children = self.fetch_all(method, {'filter_id': parent_id}, object_type)
+            if children is False:
+                return False
+            objects.extend(children)
+        return objects
 
-    def tag_artists(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ tag_artists
-            MINIMUM_API_VERSION=380001
+    @staticmethod
+    def get_deleted_id(data_object, since: int):
+        """ get_deleted_id
 
-            This returns the artists associated with the tag in question as defined by the UID
+            Return the id of a deleted_* object removed at or after since, otherwise False
 
             INPUTS
-            * filter_id = (integer) $tag_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * data_object = (mixed) XML or JSON object from a deleted_* function
+            * since       = (integer) UNIXTIME()
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'tag_artists'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        if isinstance(data_object, ElementTree.Element):
+            object_id = data_object.attrib.get('id')
+            delete_time = data_object.findtext('delete_time')
+        else:
+            object_id = data_object.get('id')
+            delete_time = data_object.get('delete_time')
+        if object_id is None or int(delete_time or 0) < since:
+            return False
+        return str(object_id)
 
-    def tag_albums(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ tag_albums
-            MINIMUM_API_VERSION=380001
+    def sync_type(self, object_type: str, since: int):
+        """ sync_type
 
-            This returns the albums associated with the tag in question
+            Update one object type in the store and return (changed, deleted) or False on failure
 
             INPUTS
-            * filter_id = (integer) $tag_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+            * since       = (integer) UNIXTIME() of the last sync, 0 for everything
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'tag_albums'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        method, has_filters, deleted_method = SYNC_TYPES[object_type]
+        model = MODELS[object_type]
+        if not since or not has_filters:
+            if object_type in SYNC_PARENTS:
+                objects = self.fetch_children(method, object_type)
+            else:
+                objects = self.fetch_all(method, {}, object_type)
+            if objects is False:
+                return False
+            self.store.replace(object_type, [model.from_data(data_object).to_dict() for data_object in objects])
+            return len(objects), 0
+        changed = {}
+        for params in ({'add': since}, {'update': since}):
+            objects = self.fetch_all(method, params, object_type)
+            if objects is False:
+                return False
+            for data_object in objects:
+                data = model.from_data(data_object).to_dict()
+                changed[data['id']] = data
+        deleted = []
+        if deleted_method:
+            objects = self.fetch_all(deleted_method, {}, PAGE_TAGS[deleted_method])
+            if objects is False:
+                return False
+            deleted = [object_id for object_id in (self.get_deleted_id(data_object, since) for data_object in objects)
+                       if object_id]
+        self.store.upsert(object_type, changed.values())
+        self.store.delete(object_type, deleted)
+        return len(changed), len(deleted)
 
-    def tag_songs(self, filter_id: int, offset=0, limit=0, sort=False, cond=False):
-        """ tag_songs
-            MINIMUM_API_VERSION=380001
+    def sync(self, full: bool = False):
+        """ sync
 
-            returns the songs for this tag
+            Bring the store up to date and return a summary
+            {'full': [types], 'changed': {type: count}, 'deleted': {type: count}, 'failed': [types], 'seconds': float}
+            Types without a watermark (e.g. added to object_types after the first sync) are downloaded in full
 
             INPUTS
-            * filter_id = (integer) $tag_id
-            * offset    = (integer) //optional
-            * limit     = (integer) //optional
-            * cond      = (string) Filter the browse using ';' separated comma string pairs (e.g. 'filter1,value1;filter2,value2') //optional
-            * sort      = (string) sort name / comma separated key pair. Default 'ASC' (e.g. 'name,ASC' and 'name' are the same) //optional
+            * full = (boolean) download everything again instead of the changes since the last sync //optional
         """
-        ampache_url = self.AMPACHE_URL + '/server/' + self.AMPACHE_API + '.server.php'
-        api_method = 'tag_songs'
-        data = {'action': api_method,
-                'auth': self.AMPACHE_SESSION,
-                'filter': filter_id,
-                'offset': str(offset),
-                'limit': str(limit),
-                'sort': sort,
-                'cond': cond}
-        if not sort:
-            data.pop('sort')
-        if not cond:
-            data.pop('cond')
-        return self.get_request(ampache_url, data, api_method)
+        started = time.time()
+        summary = {'full': [], 'changed': {}, 'deleted': {}, 'failed': []}
+        for object_type in self.object_types:
+            since = 0 if full else self.store.get_watermark(object_type)
+            if not since:
+                summary['full'].append(object_type)
+            try:
+                result = self.sync_type(object_type, since)
+            except AmpacheError:
+                result = False
+            if result is False:
+                summary['failed'].append(object_type)
+                continue
+            summary['changed'][object_type], summary['deleted'][object_type] = result
+            self.store.set_watermark(object_type, max(int(started) - self.overlap, 1))
+        self.store.save()
+        summary['seconds'] = time.time() - started
+        return summary
 
-    def user_update(self, username, password=False, fullname=False, email=False,
-                    website=False, state=False, city=False, disable=False, maxbitrate=False,
-                    fullname_public=False, reset_apikey=False, reset_streamtoken=False, clear_stats=False):
-        """ user_update
-            MINIMUM_API_VERSION=6.0.0
+    def get_models(self, object_type: str):
+        """ get_models
 
-            Update an existing user. Backcompat function for api6 (Use user_edit)
-        """
-        return self.user_edit(username, password, fullname, email,
-                              website, state, city, disable, maxbitrate,
-                              fullname_public, reset_apikey, reset_streamtoken, clear_stats)
+            Generator that yields typed objects (Song, Album, ...) from the store
 
-    def execute(self, method: str, params=None):
-        if params is None:
-            params = {}
-        match method:
-            case 'handshake':
-                if not "version" in params:
-                    params["version"] = self.AMPACHE_VERSION
-                if not "ampache_url" in params:
-                    params["ampache_url"] = self.AMPACHE_URL
-                if not "ampache_api" in params:
-                    params["ampache_api"] = self.AMPACHE_KEY
-                if not "ampache_user" in params:
-                    params["ampache_user"] = self.AMPACHE_USER
-                if "timestamp" in params and not params["timestamp"] == 0:
-                    return self.handshake(params["ampache_url"],
-                                          self.encrypt_password(params["ampache_api"], int(params["timestamp"])),
-                                          params["ampache_user"], int(params["timestamp"]), params["version"])
-                return self.handshake(params["ampache_url"],
-                                      self.encrypt_string(params["ampache_api"], params["ampache_user"]),
-                                      False, False, params["version"])
-            case 'goodbye':
-                return self.goodbye()
-            case 'lost_password':
-                if "user" in params and "email" in params:
-                    params["auth"] = self.encrypt_string(params["email"], params["user"])
-                return self.lost_password(params["auth"])
-            case 'ping':
-                if not "ampache_url" in params:
-                    params["ampache_url"] = self.AMPACHE_URL
-                if not "ampache_api" in params:
-                    params["ampache_api"] = self.AMPACHE_SESSION
-                return self.ping(params["ampache_url"], params["ampache_api"])
-            case 'search_rules':
-                if not "filter_str" in params:
-                    return False
-                return self.search_rules(params["filter_str"])
-            case 'advanced_search':
-                if not "rules" in params:
-                    params["rules"] = list()
-                if not "operator" in params:
-                    params["operator"] = 'and'
-                if not "object_type" in params:
-                    params["object_type"] = 'song'
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "random" in params:
-                    params["random"] = 0
-                return self.advanced_search(params["rules"], params["operator"], params["object_type"],
-                                            params["offset"], params["limit"], params["random"])
-            case 'search':
-                if not "rules" in params:
-                    params["rules"] = list()
-                if not "operator" in params:
-                    params["operator"] = 'and'
-                if not "object_type" in params:
-                    params["object_type"] = 'song'
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "random" in params:
-                    params["random"] = 0
-                return self.search(params["rules"], params["operator"], params["object_type"], params["offset"],
-                                   params["limit"], params["random"])
-            case 'search_group':
-                if not "rules" in params:
-                    params["rules"] = list()
-                if not "operator" in params:
-                    params["operator"] = 'and'
-                if not "object_type" in params:
-                    params["object_type"] = 'all'
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "random" in params:
-                    params["random"] = 0
-                return self.search_group(params["filter_id"], params["operator"], params["object_type"],
-                                         params["offset"], params["limit"], params["random"])
-            case 'album':
-                if not "include" in params:
-                    params["include"] = False
-                return self.album(params["filter_id"], params["include"])
-            case 'albums':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "include" in params:
-                    params["include"] = False
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.albums(params["filter_str"], params["exact"], params["add"], params["update"],
-                                   params["offset"], params["limit"], params["include"], params["sort"], params["cond"])
-            case 'album_songs':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.album_songs(params["filter_id"], params["offset"], params["limit"], params["exact"],
-                                        params["sort"], params["cond"])
-            case 'artist':
-                if not "include" in params:
-                    params["include"] = False
-                return self.artist(params["filter_id"], params["include"])
-            case 'artist_albums':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "album_artist" in params:
-                    params["album_artist"] = False
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.artist_albums(params["filter_id"], params["offset"], params["limit"],
-                                          params["album_artist"], params["sort"], params["cond"])
-            case 'artists':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "include" in params:
-                    params["include"] = False
-                if not "album_artist" in params:
-                    params["album_artist"] = False
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.artists(params["filter_str"], params["add"], params["update"], params["offset"],
-                                    params["limit"], params["include"], params["album_artist"],
-                                    params["sort"], params["cond"])
-            case 'artist_songs':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.artist_songs(params["filter_id"], params["offset"], params["limit"],
-                                         params["sort"], params["cond"])
-            case 'bookmark':
-                if not "include" in params:
-                    params["include"] = False
-                return self.bookmark(params["filter_id"], params["include"])
-            case 'bookmark_create':
-                if not "position" in params:
-                    params["position"] = 0
-                if not "client" in params:
-                    params["client"] = CLIENT_NAME
-                if not "date" in params:
-                    params["date"] = False
-                if not "include" in params:
-                    params["include"] = False
-                return self.bookmark_create(params["filter_id"], params["object_type"], params["position"],
-                                            params["client"], params["date"], params["include"])
-            case 'bookmark_delete':
-                if not "filter_id" in params or not "object_type" in params:
-                    return False
-                return self.bookmark_delete(params["filter_id"], params["object_type"])
-            case 'bookmark_edit':
-                if not "position" in params:
-                    params["position"] = 0
-                if not "client" in params:
-                    params["client"] = CLIENT_NAME
-                if not "date" in params:
-                    params["date"] = False
-                if not "include" in params:
-                    params["include"] = False
-                return self.bookmark_edit(params["filter_id"], params["object_type"], params["position"],
-                                          params["client"], params["date"], params["include"])
-            case 'bookmarks':
-                if not "client" in params or not "include" in params:
-                    return False
-                return self.bookmarks(params["client"], params["include"])
-            case 'browse':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "object_type" in params:
-                    params["object_type"] = False
-                if not "catalog" in params:
-                    params["catalog"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.browse(params["filter_str"], params["object_type"], params["catalog"], params["add"],
-                                   params["update"], params["offset"], params["limit"], params["sort"], params["cond"])
-            case 'catalog':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.catalog(params["filter_id"], params["offset"], params["limit"])
-            case 'catalog_action':
-                if not "task" in params or not "catalog_id" in params:
-                    return False
-                return self.catalog_action(params["task"], params["catalog_id"])
-            case 'catalog_add':
-                if not "cat_type" in params:
-                    params["cat_type"] = False
-                if not "media_type" in params:
-                    params["media_type"] = False
-                if not "file_pattern" in params:
-                    params["file_pattern"] = False
-                if not "folder_pattern" in params:
-                    params["folder_pattern"] = False
-                if not "username" in params:
-                    params["username"] = False
-                if not "password" in params:
-                    params["password"] = False
-                return self.catalog_add(params["cat_name"], params["cat_path"], params["cat_type"],
-                                        params["media_type"], params["file_pattern"], params["folder_pattern"],
-                                        params["username"], params["password"])
-            case 'catalog_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.catalog_delete(params["filter_id"])
-            case 'catalog_file':
-                if not "file" in params or not "task" in params or not "catalog_id" in params:
-                    return False
-                return self.catalog_file(params["file"], params["task"], params["catalog_id"])
-            case 'catalog_folder':
-                if not "folder" in params or not "task" in params or not "catalog_id" in params:
-                    return False
-                return self.catalog_folder(params["folder"], params["task"], params["catalog_id"])
-            case 'catalogs':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.catalogs(params["filter_str"], params["offset"], params["limit"],
-                                     params["sort"], params["cond"])
-            case 'deleted_podcast_episodes':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.deleted_podcast_episodes(params["offset"], params["limit"])
-            case 'deleted_songs':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.deleted_songs(params["offset"], params["limit"])
-            case 'deleted_videos':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.deleted_videos(params["offset"], params["limit"])
-            case 'democratic':
-                if not "method" in params or not "oid" in params:
-                    return False
-                return self.democratic(params["method"], params["oid"])
-            case 'download':
-                if not "transcode" in params:
-                    params["transcode"] = 'raw'
-                if not "bitrate" in params:
-                    params["bitrate"] = False
-                if not "stats" in params:
-                    params["stats"] = 1
-                return self.download(params["object_id"], params["object_type"], params["destination"], params["stats"])
-            case 'flag':
-                if not "date" in params:
-                    params["date"] = False
-                return self.flag(params["object_type"], params["object_id"], params["flagbool"], params["date"])
-            case 'followers':
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.followers(params["username"], params["sort"], params["cond"])
-            case 'following':
-                if not "username" in params:
-                    return False
-                return self.following(params["username"])
-            case 'friends_timeline':
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "since" in params:
-                    params["since"] = 0
-                return self.friends_timeline(params["limit"], params["since"])
-            case 'genre':
-                if not "filter_id" in params:
-                    return False
-                return self.genre(params["filter_id"])
-            case 'genre_albums':
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.genre_albums(params["filter_id"], params["sort"], params["cond"])
-            case 'genre_artists':
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.genre_artists(params["username"], params["sort"], params["cond"])
-            case 'genres':
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.genres(params["username"], params["sort"], params["cond"])
-            case 'genre_songs':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.genre_songs(params["filter_id"], params["offset"], params["limit"],
-                                        params["sort"], params["cond"])
-            case 'get_art':
-                if not "object_id" in params or not "object_type" in params or not "destination" in params:
-                    return False
-                return self.get_art(params["object_id"], params["object_type"], params["destination"])
-            case 'get_bookmark':
-                if not "include" in params:
-                    params["include"] = False
-                if not "show_all" in params:
-                    params["show_all"] = False
-                return self.get_bookmark(params["filter_id"], params["object_type"], params["include"],
-                                         params["show_all"])
-            case 'get_external_metadata':
-                if not "filter_id" in params or not "object_type" in params:
-                    return False
-                return self.get_external_metadata(params["filter_id"], params["object_type"])
-            case 'get_lyrics':
-                if not "filter_id" in params:
-                    return False
-                if not "plugins" in params:
-                    params["plugins"] = False
-                return self.get_lyrics(params["filter_id"], params["plugins"])
-            case 'get_indexes':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "include" in params:
-                    params["include"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.get_indexes(params["object_type"], params["filter_str"], params["exact"], params["add"],
-                                        params["update"], params["include"], params["offset"], params["limit"],
-                                        params["sort"], params["cond"])
-            case 'get_similar':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.get_similar(params["object_type"], params["filter_id"], params["offset"], params["limit"])
-            case 'index':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "include" in params:
-                    params["include"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "hide_search" in params:
-                    params["hide_search"] = False
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.index(params["object_type"], params["filter_str"], params["exact"], params["add"],
-                                  params["update"], params["include"], params["offset"], params["limit"],
-                                  params["hide_search"], params["sort"], params["cond"])
-            case 'label':
-                if not "filter_id" in params:
-                    return False
-                return self.label(params["filter_id"])
-            case 'label_artists':
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.label_artists(params["filter_id"], params["sort"], params["cond"])
-            case 'labels':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.labels(params["filter_str"], params["exact"], params["offset"], params["limit"],
-                                   params["sort"], params["cond"])
-            case 'last_shouts':
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.last_shouts(params["username"], params["limit"])
-            case 'license':
-                if not "filter_id" in params:
-                    return False
-                return self.license(params["filter_id"])
-            case 'licenses':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.licenses(params["filter_str"], params["exact"], params["add"], params["update"],
-                                     params["offset"], params["limit"], params["sort"], params["cond"])
-            case 'license_songs':
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.license_songs(params["filter_id"], params["sort"], params["cond"])
-            case 'list':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.list(params["object_type"], params["filter_str"], params["exact"], params["add"],
-                                 params["update"], params["offset"], params["limit"], params["sort"], params["cond"])
-            case 'live_stream':
-                if not "filter_id" in params:
-                    return False
-                return self.live_stream(params["filter_id"])
-            case 'live_stream_create':
-                if not "site_url" in params:
-                    params["site_url"] = ''
-                return self.live_stream_create(params["name"], params["stream_url"], params["codec"],
-                                               params["catalog_id"], params["site_url"])
-            case 'live_stream_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.live_stream_delete(params["filter_id"])
-            case 'live_stream_edit':
-                if not "name" in params:
-                    params["name"] = ''
-                if not "stream_url" in params:
-                    params["stream_url"] = ''
-                if not "codec" in params:
-                    params["codec"] = ''
-                if not "catalog_id" in params:
-                    params["catalog_id"] = 0
-                if not "site_url" in params:
-                    params["site_url"] = ''
-                return self.live_stream_edit(params["filter_id"], params["name"], params["stream_url"],
-                                             params["codec"], params["catalog_id"], params["site_url"])
-            case 'live_streams':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.live_streams(params["filter_str"], params["exact"], params["offset"], params["limit"],
-                                         params["sort"], params["cond"])
-            case 'localplay':
-                if not "oid" in params:
-                    params["oid"] = False
-                if not "otype" in params:
-                    params["otype"] = False
-                if not "clear" in params:
-                    params["clear"] = False
-                return self.localplay(params["command"])
-            case 'localplay_songs':
-                return self.localplay_songs()
-            case 'now_playing':
-                return self.now_playing()
-            case 'player':
-                if not "object_type" in params:
-                    params["object_type"] = 'song'
-                if not "state" in params:
-                    params["state"] = 'play'
-                if not "play_time" in params:
-                    params["play_time"] = 0
-                if not "client" in params:
-                    params["client"] = CLIENT_NAME
-                return self.player(params["filter_str"], params["object_type"], params["state"],
-                                   params["play_time"], params["client"])
-            case 'playlists':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "hide_search" in params:
-                    params["hide_search"] = False
-                if not "show_dupes" in params:
-                    params["show_dupes"] = False
-                if not "include" in params:
-                    params["include"] = False
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.playlists(params["filter_str"], params["exact"], params["offset"], params["limit"],
-                                      params["hide_search"], params["show_dupes"], params["include"],
-                                      params["sort"], params["cond"])
-            case 'playlist':
-                if not "filter_id" in params:
-                    return False
-                return self.playlist(params["filter_id"])
-            case 'playlist_songs':
-                if not "random" in params:
-                    params["random"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.playlist_songs(params["filter_id"], params["random"], params["offset"], params["limit"])
-            case 'playlist_add':
-                if not "filter_id" in params or not "object_id" in params or not "object_type" in params:
-                    return False
-                return self.playlist_add(params["filter_id"], params["object_id"], params["object_type"])
-            case 'playlist_add_song':
-                if not "check" in params:
-                    params["check"] = False
-                return self.playlist_add_song(params["filter_id"], params["song_id"], params["check"])
-            case 'playlist_create':
-                if not "playlist_name" in params or not "playlist_type" in params:
-                    return False
-                return self.playlist_create(params["playlist_name"], params["playlist_type"])
-            case 'playlist_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.playlist_delete(params["filter_id"])
-            case 'playlist_edit':
-                if not "playlist_name" in params:
-                    params["playlist_name"] = False
-                if not "playlist_type" in params:
-                    params["playlist_type"] = False
-                if not "owner" in params:
-                    params["owner"] = False
-                if not "items" in params:
-                    params["items"] = False
-                if not "tracks" in params:
-                    params["tracks"] = False
-                return self.playlist_edit(params["filter_id"], params["playlist_name"], params["playlist_type"],
-                                          params["owner"], params["items"], params["tracks"])
-            case 'playlist_generate':
-                if not "mode" in params:
-                    params["mode"] = 'random'
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "album_id" in params:
-                    params["album_id"] = False
-                if not "artist_id" in params:
-                    params["artist_id"] = False
-                if not "flagged" in params:
-                    params["flagged"] = False
-                if not "list_format" in params:
-                    params["list_format"] = 'song'
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.playlist_generate(params["mode"], params["filter_str"], params["album_id"],
-                                              params["artist_id"], params["flagged"], params["list_format"],
-                                              params["offset"], params["limit"])
-            case 'playlist_hash':
-                if not "filter_id" in params:
-                    return False
-                return self.playlist_hash(params["filter_id"])
-            case 'playlist_remove_song':
-                if not "song_id" in params:
-                    params["song_id"] = False
-                if not "track" in params:
-                    params["track"] = False
-                return self.playlist_remove_song(params["filter_id"])
-            case 'podcast':
-                if not "include" in params:
-                    params["include"] = False
-                return self.podcast(params["filter_id"], params["include"])
-            case 'podcast_create':
-                if not "url" in params or not "catalog_id" in params:
-                    return False
-                return self.podcast_create(params["url"], params["catalog_id"])
-            case 'podcast_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.podcast_delete(params["filter_id"])
-            case 'podcast_edit':
-                if not "feed" in params:
-                    params["feed"] = False
-                if not "title" in params:
-                    params["title"] = False
-                if not "website" in params:
-                    params["website"] = False
-                if not "description" in params:
-                    params["description"] = False
-                if not "generator" in params:
-                    params["generator"] = False
-                if not "copyright_str" in params:
-                    params["copyright_str"] = False
-                return self.podcast_edit(params["filter_id"], params["feed"], params["title"], params["website"],
-                                         params["description"], params["generator"], params["copyright_str"])
-            case 'podcast_episode':
-                if not "filter_id" in params:
-                    return False
-                return self.podcast_episode(params["filter_id"])
-            case 'podcast_episode_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.podcast_episode_delete(params["filter_id"])
-            case 'podcast_episodes':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.podcast_episodes(params["filter_id"], params["offset"], params["limit"],
-                                             params["sort"], params["cond"])
-            case 'podcasts':
-                if not "exact" in params:
-                    params["exact"] = 0
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.podcasts(params["filter_id"], params["exact"], params["offset"], params["limit"],
-                                     params["sort"], params["cond"])
-            case 'preference_create':
-                if not "description" in params:
-                    params["description"] = False
-                if not "subcategory" in params:
-                    params["subcategory"] = False
-                if not "level" in params:
-                    params["level"] = 100
-                return self.preference_create(params["filter_str"], params["type_str"], params["category"],
-                                              params["description"], params["subcategory"], params["level"])
-            case 'preference_delete':
-                if not "filter_str" in params:
-                    return False
-                return self.preference_delete(params["filter_str"])
-            case 'preference_edit':
-                if not "apply_all" in params:
-                    params["apply_all"] = 0
-                return self.preference_edit(params["filter_str"], params["value"], params["apply_all"])
-            case 'rate':
-                if not "object_type" in params or not "object_id" in params or not "rating" in params:
-                    return False
-                return self.rate(params["object_type"], params["object_id"], params["rating"])
-            case 'record_play':
-                if not "user_id" in params:
-                    params["user_id"] = False
-                if not "client" in params:
-                    params["client"] = CLIENT_NAME
-                if not "date" in params:
-                    params["date"] = False
-                return self.record_play(params["object_id"], params["user_id"], params["client"], params["date"])
-            case 'register':
-                if not "username" in params or not "fullname" in params or not "password" in params or not "email" in params:
-                    return False
-                return self.register(params["username"], params["fullname"], params["password"], params["email"])
-            case 'scrobble':
-                if not "mbtitle" in params:
-                    params["mbtitle"] = False
-                if not "mbartist" in params:
-                    params["mbartist"] = False
-                if not "mbalbum" in params:
-                    params["mbalbum"] = False
-                if not "stime" in params:
-                    params["stime"] = False
-                if not "client" in params:
-                    params["client"] = CLIENT_NAME
-                return self.scrobble(params["title"], params["artist_name"], params["album_name"],
-                                     params["mbtitle"], params["mbartist"], params["mbalbum"],
-                                     params["stime"], params["client"])
-            case 'search_songs':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.search_songs(params["filter_str"], params["offset"], params["limit"])
-            case 'share':
-                if not "filter_id" in params:
-                    return False
-                return self.share(params["filter_id"])
-            case 'share_create':
-                if not "description" in params:
-                    params["description"] = False
-                if not "expires" in params:
-                    params["expires"] = False
-                return self.share_create(params["filter_id"], params["object_type"],
-                                         params["description"], params["expires"])
-            case 'share_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.share_delete(params["filter_id"])
-            case 'share_edit':
-                if not "can_stream" in params:
-                    params["can_stream"] = False
-                if not "can_download" in params:
-                    params["can_download"] = False
-                if not "expires" in params:
-                    params["expires"] = False
-                if not "description" in params:
-                    params["description"] = False
-                return self.share_edit(params["filter_id"], params["can_stream"], params["can_download"],
-                                       params["expires"], params["description"])
-            case 'shares':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.shares(params["filter_str"], params["exact"], params["offset"], params["limit"],
-                                   params["sort"], params["cond"])
-            case 'smartlists':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "hide_search" in params:
-                    params["hide_search"] = False
-                if not "show_dupes" in params:
-                    params["show_dupes"] = False
-                if not "include" in params:
-                    params["include"] = False
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.smartlists(params["filter_str"], params["exact"], params["offset"], params["limit"],
-                                      params["include"], params["sort"], params["cond"])
-            case 'smartlist':
-                if not "filter_id" in params:
-                    return False
-                return self.smartlist(params["filter_id"])
-            case 'smartlist_songs':
-                if not "random" in params:
-                    params["random"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                return self.smartlist_songs(params["filter_id"], params["random"], params["offset"], params["limit"])
-            case 'smartlist_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.smartlist_delete(params["filter_id"])
-            case 'song':
-                if not "filter_id" in params:
-                    return False
-                return self.song(params["filter_id"])
-            case 'song_delete':
-                if not "filter_id" in params:
-                    return False
-                return self.song_delete(params["filter_id"])
-            case 'song_tags':
-                if not "filter_id" in params:
-                    return False
-                return self.song_tags(params["filter_id"])
-            case 'songs':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "add" in params:
-                    params["add"] = False
-                if not "update" in params:
-                    params["update"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.songs(params["filter_str"], params["exact"], params["add"], params["update"],
-                                  params["offset"], params["limit"], params["sort"], params["cond"])
-            case 'stats':
-                if not "filter_str" in params:
-                    params["filter_str"] = 'random'
-                if not "username" in params:
-                    params["username"] = False
-                if not "user_id" in params:
-                    params["user_id"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.stats(params["object_type"], params["filter_str"], params["username"],
-                                  params["user_id"], params["offset"], params["limit"],
-                                  params["sort"], params["cond"])
-            case 'stream':
-                if not "stats" in params:
-                    params["stats"] = 1
-                return self.stream(params["object_id"], params["object_type"], params["destination"], params["stats"])
-            case 'system_preference':
-                if not "filter_str" in params:
-                    return False
-                return self.system_preference(params["filter_str"])
-            case 'system_preferences':
-                return self.system_preferences()
-            case 'system_update':
-                return self.system_update()
-            case 'tag':
-                if not "filter_id" in params:
-                    return False
-                return self.tag(params["filter_id"])
-            case 'tag_albums':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.tag_albums(params["filter_id"], params["offset"], params["limit"],
-                                       params["sort"], params["cond"])
-            case 'tag_artists':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.tag_artists(params["filter_id"], params["offset"], params["limit"],
-                                        params["sort"], params["cond"])
-            case 'tags':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.tags(params["filter_str"], params["exact"], params["offset"], params["limit"],
-                                 params["sort"], params["cond"])
-            case 'tag_songs':
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.tag_songs(params["filter_id"], params["offset"], params["limit"],
-                                      params["sort"], params["cond"])
-            case 'timeline':
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "since" in params:
-                    params["since"] = 0
-                return self.timeline(params["username"], params["limit"], params["since"])
-            case 'toggle_follow':
-                if not "username" in params:
-                    return False
-                return self.toggle_follow(params["username"])
-            case 'update_art':
-                if not "overwrite" in params:
-                    params["overwrite"] = False
-                return self.update_art(params["object_type"], params["object_id"], params["overwrite"])
-            case 'update_artist_info':
-                if not "filter_id" in params:
-                    return False
-                return self.update_artist_info(params["filter_id"])
-            case 'update_from_tags':
-                if not "object_type" in params or not "object_id" in params:
-                    return False
-                return self.update_from_tags(params["object_type"], params["object_id"], )
-            case 'update_podcast':
-                if not "filter_id" in params:
-                    return False
-                return self.update_podcast(params["filter_id"])
-            case 'url_to_song':
-                if not "url" in params:
-                    return False
-                return self.url_to_song(params["url"])
-            case 'user':
-                if not "username" in params:
-                    return False
-                return self.user(params["username"])
-            case 'user_create':
-                if not "fullname" in params:
-                    params["fullname"] = False
-                if not "disable" in params:
-                    params["disable"] = False
-                return self.user_create(params["username"], params["password"], params["email"],
-                                        params["fullname"], params["disable"])
-            case 'user_delete':
-                if not "username" in params:
-                    return False
-                return self.user_delete(params["username"])
-            case 'user_edit':
-                if not "password" in params:
-                    params["password"] = False
-                if not "fullname" in params:
-                    params["fullname"] = False
-                if not "email" in params:
-                    params["email"] = False
-                if not "website" in params:
-                    params["website"] = False
-                if not "state" in params:
-                    params["state"] = False
-                if not "city" in params:
-                    params["city"] = False
-                if not "disable" in params:
-                    params["disable"] = False
-                if not "maxbitrate" in params:
-                    params["maxbitrate"] = False
-                if not "fullname_public" in params:
-                    params["fullname_public"] = False
-                if not "reset_apikey" in params:
-                    params["reset_apikey"] = False
-                if not "reset_streamtoken" in params:
-                    params["reset_streamtoken"] = False
-                if not "clear_stats" in params:
-                    params["clear_stats"] = False
-                return self.user_edit(params["username"], params["password"], params["fullname"], params["email"],
-                                      params["website"], params["state"], params["city"], params["disable"],
-                                      params["maxbitrate"], params["fullname_public"], params["reset_apikey"],
-                                      params["reset_streamtoken"], params["clear_stats"])
-            case 'user_playlists':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.user_playlists(params["filter_str"], params["exact"],
-                                           params["offset"], params["limit"],
-                                           params["sort"], params["cond"])
-            case 'user_preference':
-                if not "filter_str" in params:
-                    return False
-                return self.user_preference(params["filter_str"])
-            case 'user_preferences':
-                return self.user_preferences()
-            case 'users':
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.users(params["sort"], params["cond"])
-            case 'user_smartlists':
-                if not "filter_str" in params:
-                    params["filter_str"] = False
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.user_smartlists(params["filter_str"], params["exact"],
-                                            params["offset"], params["limit"],
-                                            params["sort"], params["cond"])
-            case 'user_update':
-                if not "password" in params:
-                    params["password"] = False
-                if not "fullname" in params:
-                    params["fullname"] = False
-                if not "email" in params:
-                    params["email"] = False
-                if not "website" in params:
-                    params["website"] = False
-                if not "state" in params:
-                    params["state"] = False
-                if not "city" in params:
-                    params["city"] = False
-                if not "disable" in params:
-                    params["disable"] = False
-                if not "maxbitrate" in params:
-                    params["maxbitrate"] = False
-                if not "fullname_public" in params:
-                    params["fullname_public"] = False
-                if not "reset_apikey" in params:
-                    params["reset_apikey"] = False
-                if not "reset_streamtoken" in params:
-                    params["reset_streamtoken"] = False
-                if not "clear_stats" in params:
-                    params["clear_stats"] = False
-                return self.user_update(params["username"], params["password"], params["fullname"], params["email"],
-                                        params["website"], params["state"], params["city"], params["disable"],
-                                        params["maxbitrate"], params["fullname_public"], params["reset_apikey"],
-                                        params["reset_streamtoken"], params["clear_stats"])
-            case 'video':
-                if not "filter_id" in params:
-                    return False
-                return self.video(params["filter_id"])
-            case 'videos':
-                if not "exact" in params:
-                    params["exact"] = False
-                if not "offset" in params:
-                    params["offset"] = 0
-                if not "limit" in params:
-                    params["limit"] = 0
-                if not "sort" in params:
-                    params["sort"] = False
-                if not "cond" in params:
-                    params["cond"] = False
-                return self.videos(params["filter_str"], params["exact"], params["offset"], params["limit"],
-                                   params["sort"], params["cond"])
-        return None
+            INPUTS
+            * object_type = (string) 'song'|'album'|'artist'|'genre'|'playlist'|'podcast_episode'|'video'
+        """
+        model = MODELS[object_type]
+        for data in self.store.get_all(object_type):
+            yield model.from_dict(data)